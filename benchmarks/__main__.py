@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""\
+Command line interface of the benchmark suite.
+"""
+
+__author__ = "Simone Campagna"
+__copyright__ = 'Copyright (c) 2015 Simone Campagna'
+__license__ = 'Apache License Version 2.0'
+
+import argparse
+import sys
+
+from zirkon.toolbox.serializer import Serializer
+
+from .generators import SHAPES
+from .runner import run_benchmarks, compare_results, save_results, load_results
+
+
+def _format_result(result):
+    """Formats a result line.
+
+       Parameters
+       ----------
+       result: Result
+           the result
+
+       Returns
+       -------
+       str
+           the formatted line
+    """
+    line = "{:16s} {:10s} {:12s}".format(result.shape, result.protocol or '-', result.operation)
+    if result.error:
+        return line + " ERROR {}".format(result.error)
+    return line + " {:12.3f} ms {:12.1f} KiB".format(result.time * 1000.0, result.peak_memory / 1024.0)
+
+
+def main(argv=None):
+    """Runs the benchmarks.
+
+       Parameters
+       ----------
+       argv: list, optional
+           the command line arguments (defaults to sys.argv[1:])
+
+       Returns
+       -------
+       int
+           the exit code (1 if regressions have been found)
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Zirkon serializer benchmarks")
+    parser.add_argument("-s", "--shape",
+                        dest="shapes", action="append", choices=tuple(SHAPES), default=None,
+                        help="shape to be benchmarked (can be repeated; defaults to all)")
+    parser.add_argument("-p", "--protocol",
+                        dest="protocols", action="append",
+                        choices=tuple(Serializer.get_class_tags()), default=None,
+                        help="protocol to be benchmarked (can be repeated; defaults to all)")
+    parser.add_argument("-r", "--repeat",
+                        type=int, default=3,
+                        help="number of timed runs (defaults to 3)")
+    parser.add_argument("-o", "--output",
+                        default=None,
+                        help="json output file")
+    parser.add_argument("-b", "--baseline",
+                        default=None,
+                        help="json baseline file to compare with")
+    parser.add_argument("-t", "--threshold",
+                        type=float, default=0.25,
+                        help="relative tolerance for regressions (defaults to 0.25)")
+    parser.add_argument("-q", "--quiet",
+                        action="store_true", default=False,
+                        help="do not show results while running")
+    args = parser.parse_args(argv)
+
+    if args.quiet:
+        callback = None
+    else:
+        def callback(result):
+            """Shows a result"""
+            print(_format_result(result), flush=True)
+
+    results = run_benchmarks(shapes=args.shapes, protocols=args.protocols,
+                             repeat=args.repeat, callback=callback)
+    if args.output:
+        save_results(args.output, results)
+
+    if args.baseline:
+        comparisons = compare_results(results, load_results(args.baseline), threshold=args.threshold)
+        regressions = [comparison for comparison in comparisons if comparison.regression]
+        print("compared {} results with baseline {}: {} regressions".format(
+            len(comparisons), args.baseline, len(regressions)))
+        for comparison in regressions:
+            print("REGRESSION {} time x{:.2f} memory x{:.2f}".format(
+                _format_result(comparison.result), comparison.time_ratio, comparison.memory_ratio))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
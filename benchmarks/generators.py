@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""\
+Generators of synthetic configs and schemas, whose shape is described
+by a Shape:
+
+>>> shape = Shape(width=3, depth=1, branching=2, value_types=('int', 'str'),
+...               list_length=2, macro_density=0.0, schema_size=1.0)
+>>> config = generate_config(shape)
+>>> config.dump()
+base = 1
+int1 = 2
+str2 = 's2'
+[sub0]
+    base = 4
+    int1 = 5
+    str2 = 's2'
+[sub1]
+    base = 7
+    int1 = 8
+    str2 = 's2'
+>>> bool(generate_schema(shape).validate(config))
+False
+>>>
+"""
+
+__author__ = "Simone Campagna"
+__copyright__ = 'Copyright (c) 2015 Simone Campagna'
+__license__ = 'Apache License Version 2.0'
+__all__ = [
+    'Shape',
+    'SHAPES',
+    'VALUE_TYPES',
+    'generate_content',
+    'generate_config',
+    'generate_schema',
+]
+
+import collections
+import itertools
+
+from zirkon import macros
+from zirkon.config import Config
+from zirkon.schema import Schema
+from zirkon.validator import Int, Float, Str, Bool, IntList, Ignore
+
+
+Shape = collections.namedtuple(
+    "Shape",
+    ("width", "depth", "branching", "value_types", "list_length", "macro_density", "schema_size"))
+Shape.__doc__ = """\
+Shape of a synthetic config.
+
+   Parameters
+   ----------
+   width: int
+       number of options in each section
+   depth: int
+       number of nested section levels (0 means only the root section)
+   branching: int
+       number of subsections in each non-leaf section
+   value_types: tuple
+       option value types, cycled over the options ('int', 'float', 'str',
+       'bool', 'list')
+   list_length: int
+       length of 'list' values
+   macro_density: float
+       fraction of options (in [0, 1]) whose value is a macro
+   schema_size: float
+       fraction of options (in [0, 1]) having a validator in the schema
+"""
+
+VALUE_TYPES = ('int', 'float', 'str', 'bool', 'list')
+
+SHAPES = collections.OrderedDict((
+    ('small', Shape(width=10, depth=1, branching=2, value_types=VALUE_TYPES,
+                    list_length=5, macro_density=0.0, schema_size=1.0)),
+    ('wide', Shape(width=1000, depth=1, branching=4, value_types=VALUE_TYPES,
+                   list_length=5, macro_density=0.0, schema_size=1.0)),
+    ('deep', Shape(width=5, depth=8, branching=2, value_types=VALUE_TYPES,
+                   list_length=5, macro_density=0.0, schema_size=1.0)),
+    ('lists', Shape(width=20, depth=2, branching=3, value_types=('list',),
+                    list_length=200, macro_density=0.0, schema_size=1.0)),
+    ('strings', Shape(width=50, depth=2, branching=3, value_types=('str',),
+                      list_length=0, macro_density=0.0, schema_size=1.0)),
+    ('macros', Shape(width=20, depth=2, branching=3, value_types=VALUE_TYPES,
+                     list_length=5, macro_density=0.5, schema_size=1.0)),
+    ('sparse-schema', Shape(width=50, depth=2, branching=3, value_types=VALUE_TYPES,
+                            list_length=5, macro_density=0.0, schema_size=0.1)),
+    ('large', Shape(width=50, depth=3, branching=5, value_types=VALUE_TYPES,
+                    list_length=10, macro_density=0.1, schema_size=1.0)),
+))
+
+
+def _option_names(shape):
+    """Returns the option names and types for each section of a shape: the
+       first option is always an int named 'base', referenced by macros.
+
+       Parameters
+       ----------
+       shape: Shape
+           the config shape
+
+       Returns
+       -------
+       list
+           a list of (option_name, value_type, is_macro) tuples
+    """
+    options = [('base', 'int', False)]
+    num_macros = 0
+    value_types = itertools.cycle(shape.value_types)
+    for index in range(1, shape.width):
+        value_type = next(value_types)
+        # macros are spread evenly over the options:
+        is_macro = int(index * shape.macro_density) > num_macros
+        if is_macro:
+            num_macros += 1
+            option_name = "macro{}".format(index)
+        else:
+            option_name = "{}{}".format(value_type, index)
+        options.append((option_name, value_type, is_macro))
+    return options[:shape.width]
+
+
+def _value(value_type, index, counter, list_length):
+    """Returns a value.
+
+       Parameters
+       ----------
+       value_type: str
+           the value type
+       index: int
+           the option index
+       counter: int
+           a global counter, making values differ among sections
+       list_length: int
+           the list length
+
+       Returns
+       -------
+       |any|
+           the value
+    """
+    if value_type == 'int':
+        return counter
+    elif value_type == 'float':
+        return counter * 0.5
+    elif value_type == 'str':
+        return "s{}".format(index)
+    elif value_type == 'bool':
+        return counter % 2 == 0
+    elif value_type == 'list':
+        return list(range(counter, counter + list_length))
+    else:
+        raise ValueError("invalid value type {!r}".format(value_type))
+
+
+def generate_content(shape):
+    """Generates the content of a synthetic config, as nested OrderedDicts.
+
+       Parameters
+       ----------
+       shape: Shape
+           the config shape
+
+       Returns
+       -------
+       OrderedDict
+           the config content
+    """
+    options = _option_names(shape)
+    counter = itertools.count(1)
+
+    def make_section(level):
+        """Makes a section"""
+        section = collections.OrderedDict()
+        for index, (option_name, value_type, is_macro) in enumerate(options):
+            if is_macro:
+                section[option_name] = macros.SECTION['base'] + index
+            else:
+                section[option_name] = _value(value_type, index, next(counter), shape.list_length)
+        if level < shape.depth:
+            for sub_index in range(shape.branching):
+                section["sub{}".format(sub_index)] = make_section(level + 1)
+        return section
+
+    return make_section(0)
+
+
+def generate_config(shape):
+    """Generates a synthetic config.
+
+       Parameters
+       ----------
+       shape: Shape
+           the config shape
+
+       Returns
+       -------
+       |Config|
+           the config
+    """
+    return Config(generate_content(shape))
+
+
+_VALIDATORS = {
+    'int': Int,
+    'float': Float,
+    'str': Str,
+    'bool': Bool,
+    'list': IntList,
+}
+
+
+def generate_schema(shape):
+    """Generates the schema for a synthetic config. Options without a
+       validator are ignored.
+
+       Parameters
+       ----------
+       shape: Shape
+           the config shape
+
+       Returns
+       -------
+       |Schema|
+           the schema
+    """
+    options = _option_names(shape)
+    num_validators = int(round(len(options) * shape.schema_size))
+
+    def make_section(level):
+        """Makes a schema section"""
+        section = collections.OrderedDict()
+        for option_name, value_type, is_macro in options[:num_validators]:
+            if is_macro:
+                section[option_name] = Int()
+            else:
+                section[option_name] = _VALIDATORS[value_type]()
+        if level < shape.depth:
+            for sub_index in range(shape.branching):
+                section["sub{}".format(sub_index)] = make_section(level + 1)
+        return section
+
+    return Schema(make_section(0), unexpected_option_validator=Ignore())
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""\
+Benchmark runner: times the serialization, validation and as_dict operations
+on synthetic configs, records the peak memory with tracemalloc, and compares
+the results with a baseline.
+"""
+
+__author__ = "Simone Campagna"
+__copyright__ = 'Copyright (c) 2015 Simone Campagna'
+__license__ = 'Apache License Version 2.0'
+__all__ = [
+    'Result',
+    'Comparison',
+    'PROTOCOL_OPERATIONS',
+    'CONFIG_OPERATIONS',
+    'run_benchmarks',
+    'compare_results',
+    'save_results',
+    'load_results',
+]
+
+import collections
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+from zirkon.config import Config
+from zirkon.toolbox.serializer import Serializer
+from zirkon.version import VERSION
+
+from .generators import SHAPES, generate_config, generate_schema
+
+
+Result = collections.namedtuple(
+    "Result",
+    ("shape", "protocol", "operation", "time", "peak_memory", "size", "error"))
+Result.__doc__ = """\
+Benchmark result.
+
+   Parameters
+   ----------
+   shape: str
+       the shape name
+   protocol: str
+       the protocol name (None for protocol-independent operations)
+   operation: str
+       the operation name
+   time: float
+       the best time in seconds (None on error)
+   peak_memory: int
+       the peak memory allocated during the operation, in bytes (None on error)
+   size: int
+       the serialization size (only for 'to_string')
+   error: str
+       the error message, or None
+"""
+
+Comparison = collections.namedtuple(
+    "Comparison",
+    ("result", "baseline", "time_ratio", "memory_ratio", "regression"))
+Comparison.__doc__ = """\
+Comparison of a result with its baseline.
+
+   Parameters
+   ----------
+   result: Result
+       the result
+   baseline: Result
+       the baseline result
+   time_ratio: float
+       result time / baseline time
+   memory_ratio: float
+       result peak memory / baseline peak memory
+   regression: bool
+       True if the result is a regression
+"""
+
+PROTOCOL_OPERATIONS = ('to_string', 'from_string', 'to_file', 'from_file')
+CONFIG_OPERATIONS = ('as_dict', 'validate')
+
+
+def _measure(function, repeat):
+    """Measures the best time over 'repeat' runs, and the peak memory of a
+       further run.
+
+       Parameters
+       ----------
+       function: callable
+           the function to be measured
+       repeat: int
+           the number of timed runs
+
+       Returns
+       -------
+       tuple
+           a 2-tuple (time, peak_memory)
+    """
+    times = []
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - t_start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), peak_memory
+
+
+def _run(shape_name, protocol, operation, function, repeat, size=None):
+    """Runs a single benchmark.
+
+       Parameters
+       ----------
+       shape_name: str
+           the shape name
+       protocol: str
+           the protocol name
+       operation: str
+           the operation name
+       function: callable
+           the function to be measured
+       repeat: int
+           the number of timed runs
+       size: int, optional
+           the serialization size
+
+       Returns
+       -------
+       Result
+           the result
+    """
+    try:
+        elapsed, peak_memory = _measure(function, repeat)
+    except Exception as err:  # pylint: disable=broad-except
+        return Result(shape=shape_name, protocol=protocol, operation=operation,
+                      time=None, peak_memory=None, size=None,
+                      error="{}: {}".format(type(err).__name__, err))
+    return Result(shape=shape_name, protocol=protocol, operation=operation,
+                  time=elapsed, peak_memory=peak_memory, size=size, error=None)
+
+
+def run_benchmarks(*, shapes=None, protocols=None, repeat=3, callback=None):
+    """Runs the benchmarks.
+
+       Parameters
+       ----------
+       shapes: list, optional
+           the shape names (defaults to all the shapes in SHAPES)
+       protocols: list, optional
+           the protocol names (defaults to all the registered serializers)
+       repeat: int, optional
+           the number of timed runs for each benchmark (defaults to 3)
+       callback: callable, optional
+           a function called with each Result as soon as it is available
+
+       Returns
+       -------
+       list
+           the list of Results
+    """
+    if shapes is None:
+        shapes = list(SHAPES)
+    if protocols is None:
+        protocols = list(Serializer.get_class_tags())
+    results = []
+
+    def add_result(result):
+        """Adds a result"""
+        results.append(result)
+        if callback is not None:
+            callback(result)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for shape_name in shapes:
+            shape = SHAPES[shape_name]
+            config = generate_config(shape)
+            schema = generate_schema(shape)
+            add_result(_run(shape_name, None, 'as_dict', config.as_dict, repeat))
+            add_result(_run(shape_name, None, 'validate', lambda: schema.validate(config), repeat))
+            for protocol in protocols:
+                filename = os.path.join(tmpdir, "{}.{}".format(shape_name, protocol))
+                try:
+                    serialization = config.to_string(protocol)
+                except Exception as err:  # pylint: disable=broad-except
+                    error = "{}: {}".format(type(err).__name__, err)
+                    for operation in PROTOCOL_OPERATIONS:
+                        add_result(Result(shape=shape_name, protocol=protocol, operation=operation,
+                                          time=None, peak_memory=None, size=None, error=error))
+                    continue
+                functions = collections.OrderedDict((
+                    ('to_string', lambda: config.to_string(protocol)),
+                    ('from_string', lambda: Config.from_string(serialization, protocol)),
+                    ('to_file', lambda: config.to_file(filename, protocol)),
+                    ('from_file', lambda: Config.from_file(filename, protocol, parse_cache=False)),
+                ))
+                for operation, function in functions.items():
+                    size = len(serialization) if operation == 'to_string' else None
+                    add_result(_run(shape_name, protocol, operation, function, repeat, size=size))
+    return results
+
+
+def _result_key(result):
+    """Returns the key identifying a benchmark.
+
+       Parameters
+       ----------
+       result: Result
+           the result
+
+       Returns
+       -------
+       tuple
+           the key (shape, protocol, operation)
+    """
+    return (result.shape, result.protocol, result.operation)
+
+
+def compare_results(results, baseline, *, threshold=0.25, min_time=0.001):
+    """Compares results with a baseline. A result is a regression if its time
+       or its peak memory exceeds the baseline by more than 'threshold'
+       (time differences below 'min_time' are ignored). Results with errors
+       or without baseline are not compared.
+
+       Parameters
+       ----------
+       results: list
+           the list of Results
+       baseline: list
+           the list of baseline Results
+       threshold: float, optional
+           the relative tolerance (defaults to 0.25)
+       min_time: float, optional
+           the minimum significant time difference in seconds (defaults to 0.001)
+
+       Returns
+       -------
+       list
+           the list of Comparisons
+    """
+    baseline_d = {_result_key(result): result for result in baseline}
+    comparisons = []
+    for result in results:
+        base = baseline_d.get(_result_key(result), None)
+        if base is None or result.error or base.error:
+            continue
+        time_ratio = result.time / base.time if base.time else float('inf')
+        memory_ratio = result.peak_memory / base.peak_memory if base.peak_memory else float('inf')
+        regression = (time_ratio > 1.0 + threshold and result.time - base.time > min_time) or \
+            (memory_ratio > 1.0 + threshold and result.peak_memory > base.peak_memory)
+        comparisons.append(Comparison(result=result, baseline=base, time_ratio=time_ratio,
+                                      memory_ratio=memory_ratio, regression=regression))
+    return comparisons
+
+
+def save_results(filename, results):
+    """Saves results to a json file.
+
+       Parameters
+       ----------
+       filename: str
+           the file name
+       results: list
+           the list of Results
+    """
+    data = collections.OrderedDict((
+        ('zirkon_version', VERSION),
+        ('python_version', platform.python_version()),
+        ('platform', platform.platform()),
+        ('results', [result._asdict() for result in results]),
+    ))
+    with open(filename, 'w') as f_stream:
+        json.dump(data, f_stream, indent=4)
+        f_stream.write('\n')
+
+
+def load_results(filename):
+    """Loads results from a json file.
+
+       Parameters
+       ----------
+       filename: str
+           the file name
+
+       Returns
+       -------
+       list
+           the list of Results
+    """
+    with open(filename, 'r') as f_stream:
+        data = json.load(f_stream)
+    return [Result(**result) for result in data['results']]
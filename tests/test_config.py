@@ -35,12 +35,13 @@ from common.fixtures import dictionary, \
     SIMPLE_CONFIG_CONFIGOBJ_SERIALIZATION, \
     SIMPLE_CONFIG_ZIRKON_SERIALIZATION
 
-from zirkon.toolbox.macro import Macro
+from zirkon.toolbox.macro import Macro, MCall
 from zirkon.toolbox.dictutils import compare_dicts, as_dict
+from zirkon.flatmap import FlatMap
 from zirkon.section import Section
 from zirkon.defaults_section import DefaultsSection
 from zirkon.config_section import ConfigSection
-from zirkon.config import Config, ROOT, SECTION
+from zirkon.config import Config, ROOT, SECTION, MacroCycleError
 from zirkon.toolbox.serializer import JSONSerializer, \
     ConfigObjSerializer, PickleSerializer
 
@@ -624,3 +625,288 @@ def test_Config_change_defaults():
     assert config1.has_section('s')
     assert config1['s']['a'] == 10
     assert config2['s']['a'] == 1
+
+def test_Config_subsection_cached():
+    config = Config(defaults={'sub': {'a': 100}})
+    config['x'] = {'y': {'z': 1}}
+    assert config['x'] is config['x']
+    assert config['x']['y'] is config['x']['y']
+    assert config['sub'] is config['sub']
+    assert config['sub']['a'] == 100
+
+def test_Config_subsection_cached_flatmap():
+    config = Config(dictionary=FlatMap(collections.OrderedDict()))
+    config['x'] = {'y': {'z': 1}}
+    assert config['x'] is config['x']
+    assert config['x']['y'] is config['x']['y']
+    config['x']['y']['z'] = 2
+    assert config['x']['y']['z'] == 2
+
+def test_Config_batch_flatmap():
+    dictionary = collections.OrderedDict()
+    config = Config(dictionary=FlatMap(dictionary))
+    with config.batch():
+        config['x'] = {'y': {'z': 1}}
+        config['a'] = 2
+        config['b'] = ROOT['a'] + config['x']['y']['z']
+        assert not dictionary
+        assert config['b'] == 3
+    assert list(dictionary.keys()) == ['x.', 'x.y.', 'x.y.z', 'a', 'b']
+    assert config['b'] == 3
+
+def test_Config_read_flatmap(tmpdir):
+    filename = tmpdir.join('x.zirkon').strpath
+    Config({'x': {'y': 1}, 'a': ROOT['x']['y'] + 1}).write(filename, protocol='zirkon')
+    config = Config(dictionary=FlatMap(collections.OrderedDict()), init={'old': 0})
+    config.read(filename, protocol='zirkon')
+    assert config.as_dict() == {'x': {'y': 1}, 'a': 2}
+
+def test_Config_trusted_reads():
+    config = Config(trusted_reads=True)
+    config['l'] = [1.0, 2.0]
+    config['n'] = 3
+    config['m'] = ROOT['n'] * 2
+    config['sub'] = {'x': 1}
+    config.set_defaults(d=ROOT['n'] + 1)
+    assert config['l'] == [1.0, 2.0]
+    assert config['m'] == 6
+    assert config['d'] == 4
+    assert config['sub'].trusted_reads
+    config['f'] = SECTION['l'].append
+    with pytest.raises(TypeError):
+        config['f']
+
+def test_Config_cache_macros():
+    config = Config(cache_macros=True)
+    assert config.cache_macros
+    config['grid'] = {'nx': 10, 'ny': 20}
+    config['n'] = ROOT['grid']['nx'] * ROOT['grid']['ny']
+    config['m'] = ROOT['n'] + 1
+    config['sub'] = {'x': 3, 'y': SECTION['x'] * ROOT['m']}
+    assert config['sub']['y'] == 603
+    macro_cache = config._macro_cache
+    assert ('n',) in macro_cache
+    assert ('m',) in macro_cache
+    assert ('sub', 'y') in macro_cache
+    assert config['sub']['y'] == 603
+    config['grid']['nx'] = 1
+    assert ('n',) not in macro_cache
+    assert ('m',) not in macro_cache
+    assert ('sub', 'y') not in macro_cache
+    assert config['sub']['y'] == 63
+    config['sub']['x'] = 1
+    assert ('n',) in macro_cache
+    assert ('sub', 'y') not in macro_cache
+    assert config['sub']['y'] == 21
+    config['n'] = 7
+    assert config['m'] == 8
+    assert config['sub']['y'] == 8
+    del config['grid']
+    assert config['m'] == 8
+
+def test_Config_cache_macros_replace_section():
+    config = Config(cache_macros=True)
+    config['a'] = {'x': 1}
+    config['y'] = ROOT['a']['x'] + 1
+    assert config['y'] == 2
+    config['a'] = {'x': 5}
+    assert config['y'] == 6
+    config.clear()
+    config['a'] = {'x': 7}
+    config['y'] = ROOT['a']['x'] + 1
+    assert config['y'] == 8
+
+def test_Config_cache_macros_defaults():
+    defaults = DefaultsSection()
+    defaults['sub'] = {'x': ROOT['n'] * 3}
+    defaults['x'] = 1000 + ROOT['n']
+    config1 = Config(defaults=defaults, cache_macros=True)
+    config1['n'] = 10
+    config2 = Config(defaults=defaults, cache_macros=True)
+    config2['n'] = 20
+    assert config1['x'] == 1010
+    assert config1['sub']['x'] == 30
+    assert config2['x'] == 1020
+    assert config2['sub']['x'] == 60
+    config1['n'] = 11
+    assert config1['x'] == 1011
+    assert config2['x'] == 1020
+    defaults['x'] = 2000 + ROOT['n']
+    assert config1['x'] == 2011
+    assert config2['x'] == 2020
+    config1['x'] = ROOT['n']
+    assert config1['x'] == 11
+    del config1['x']
+    assert config1['x'] == 2011
+
+def test_Config_cache_macros_list_copy():
+    config = Config(cache_macros=True)
+    config['l'] = [1, 2]
+    config['m'] = ROOT['l'] + [3]
+    value = config['m']
+    value.append(4)
+    assert config['m'] == [1, 2, 3]
+
+def test_Config_deep_section_macros():
+    config = Config()
+    config['a'] = {'b': {'c': {'x': 1}}}
+    config['a']['b']['c']['y'] = SECTION['x'] + 1
+    config['a']['b']['c']['z'] = ROOT['a']['b']['c']['x'] + 2
+    assert config['a']['b']['c'].root is config
+    assert config['a']['b']['c']['y'] == 2
+    assert config['a']['b']['c']['z'] == 3
+
+def test_Config_get_path_value():
+    config = Config()
+    config['a'] = {'b': {'x': 1, 'y': ROOT['a']['b']['x'] + 1}}
+    config['n'] = 3
+    assert config.get_path_value(('n',)) == 3
+    assert config.get_path_value(('a', 'b', 'x')) == 1
+    assert config.get_path_value(('a', 'b', 'y')) == 2
+    assert config.get_path_value(('a', 'b')) is config['a']['b']
+    assert config.get_path_value(()) is config
+    with pytest.raises(KeyError):
+        config.get_path_value(('a', 'c', 'x'))
+    with pytest.raises(KeyError):
+        config.get_path_value(('a', 'b', 'z'))
+
+def test_Config_get_path_value_defaults():
+    config = Config(defaults=True)
+    config['a'] = {'x': 1}
+    config.set_defaults(a={'y': 2, 'z': SECTION['x'] + 10}, b={'w': 5})
+    assert config.get_path_value(('a', 'x')) == 1
+    assert config.get_path_value(('a', 'y')) == 2
+    assert config.get_path_value(('a', 'z')) == 11
+    assert config.get_path_value(('b', 'w')) == 5
+
+def test_Config_macro_path_no_subsections():
+    config = Config()
+    config['a'] = {'b': {'x': 1}}
+    config['c'] = {'d': {'y': SECTION['z'] * 2, 'z': 4}}
+    config['x'] = ROOT['a']['b']['x'] + 1
+    config._clear_subsection_cache()
+    assert config['x'] == 2
+    assert not config._subsection_cache
+    assert config['c']['d']['y'] == 8
+
+def test_Config_macro_cycle():
+    config = Config()
+    config['a'] = ROOT['sub']['b'] + 1
+    config['sub'] = {'b': ROOT['c'] * 2}
+    config['c'] = ROOT['a']
+    with pytest.raises(MacroCycleError) as exc_info:
+        config['a']
+    assert exc_info.value.cycle == (('a',), ('sub', 'b'), ('c',), ('a',))
+    assert str(exc_info.value) == "macro cycle: a -> sub.b -> c -> a"
+    with pytest.raises(MacroCycleError):
+        config.as_dict()
+    config['c'] = 3
+    assert config['a'] == 7
+
+def test_Config_macro_self_cycle():
+    config = Config()
+    config['sub'] = {'x': SECTION['x'] + 1}
+    with pytest.raises(MacroCycleError) as exc_info:
+        config['sub']['x']
+    assert exc_info.value.cycle == (('sub', 'x'), ('sub', 'x'))
+
+def test_Config_as_dict_evaluates_once():
+    calls = []
+    def fun(value):
+        calls.append(value)
+        return value * 2
+    config = Config()
+    config['a'] = 1
+    config['b'] = MCall(fun, (ROOT['a'],))
+    config['sub'] = {'c': ROOT['b'] + ROOT['b'], 'd': SECTION['c'] + ROOT['b']}
+    config['e'] = ROOT['sub']['d'] + ROOT['sub']['c']
+    assert config.as_dict() == {'a': 1, 'b': 2, 'sub': {'c': 4, 'd': 6}, 'e': 10}
+    assert calls == [1]
+    assert not config.cache_macros
+    del calls[:]
+    config['e']
+    assert len(calls) == 5
+
+def test_Config_as_dict_long_chain():
+    config = Config()
+    config['x0'] = 0
+    for index in range(1, 2000):
+        config['x{}'.format(index)] = ROOT['x{}'.format(index - 1)] + 1
+    dct = config.as_dict()
+    assert dct['x1999'] == 1999
+
+def _view_items(mapping):
+    return [(key, _view_items(value) if isinstance(value, collections.Mapping) else value)
+            for key, value in mapping.items()]
+
+@pytest.fixture(params=[None, 'flatmap'], ids=['dict', 'flatmap'])
+def serialization_config(request):
+    if request.param is None:
+        config = Config()
+    else:
+        config = Config(dictionary=FlatMap(collections.OrderedDict()))
+    config['a'] = 1
+    config['sub'] = {'x': 1, 'y': ROOT['a'] + 1}
+    config.set_defaults(z=3, a=10, sub={'w': 5, 'x': 9}, dsub={'q': 1})
+    config['b'] = [1, 2]
+    config['sub']['deep'] = {'k': SECTION['x']}
+    config['other'] = {}
+    return config
+
+@pytest.mark.parametrize("defaults", [False, True])
+def test_Config_serialization_view(serialization_config, defaults):
+    view = serialization_config.serialization_view(defaults=defaults)
+    expected = serialization_config.as_dict(defaults=defaults, evaluate=False)
+    assert repr(_view_items(view)) == repr(_view_items(expected))
+    assert list(view) == list(expected)
+    assert len(view) == len(expected)
+    assert view['a'] == expected['a']
+
+@pytest.mark.parametrize("defaults", [False, True])
+def test_Config_to_stream_no_copy(serialization_config, defaults, monkeypatch):
+    expected = serialization_config.to_string(protocol='zirkon', defaults=defaults)
+
+    def as_dict(*args, **kwargs):
+        raise AssertionError("as_dict() called")
+
+    monkeypatch.setattr(Config, 'as_dict', as_dict)
+    monkeypatch.setattr(ConfigSection, 'as_dict', as_dict)
+    stream = io.StringIO()
+    serialization_config.to_stream(stream, protocol='zirkon', defaults=defaults)
+    assert stream.getvalue() == expected
+
+def test_Config_from_file_lazy(simple_config, tmp_text_file):
+    tmp_text_file.write(SIMPLE_CONFIG_ZIRKON_SERIALIZATION)
+    tmp_text_file.flush()
+    config = Config.from_file(filename=tmp_text_file.name, protocol="zirkon", lazy=True)
+    assert not config.dictionary.is_loaded()
+    options = config['options']
+    assert config.dictionary.is_loaded()
+    assert not options.dictionary.is_loaded()
+    assert not config.dictionary['miscellanea'].is_loaded()
+    assert options['epsilon']['epsilon_y'] == 20
+    assert not config.dictionary['miscellanea'].is_loaded()
+    assert config == simple_config
+    assert config.to_string(protocol="zirkon") == SIMPLE_CONFIG_ZIRKON_SERIALIZATION
+
+def test_Config_from_file_lazy_update(tmp_text_file):
+    tmp_text_file.write("a = 1\n[sub]\n    x = 2\n[other]\n    y = 3\n")
+    tmp_text_file.flush()
+    config = Config.from_file(filename=tmp_text_file.name, protocol="zirkon", lazy=True)
+    config['sub']['z'] = 4
+    del config['other']
+    config['new'] = {'w': 5}
+    assert config.to_string(protocol="zirkon") == "a = 1\n[sub]\n    x = 2\n    z = 4\n[new]\n    w = 5\n"
+
+def test_Config_from_file_lazy_not_supported(simple_config, tmp_text_file):
+    tmp_text_file.write(SIMPLE_CONFIG_JSON_SERIALIZATION)
+    tmp_text_file.flush()
+    config = Config.from_file(filename=tmp_text_file.name, protocol="json", lazy=True)
+    assert config == simple_config
+
+def test_Config_from_file_lazy_dictionary(tmp_text_file):
+    tmp_text_file.write(SIMPLE_CONFIG_ZIRKON_SERIALIZATION)
+    tmp_text_file.flush()
+    with pytest.raises(ValueError):
+        Config.from_file(filename=tmp_text_file.name, protocol="zirkon", lazy=True,
+                         dictionary=collections.OrderedDict())
@@ -25,7 +25,7 @@ import pytest
 from common.fixtures import string_io
 
 from zirkon.toolbox.dictutils import compare_dicts
-from zirkon.config import Config, ConfigValidationError
+from zirkon.config import Config, ConfigValidationError, ROOT
 from zirkon.schema import Schema
 from zirkon.validator import Str, StrChoice, Float, Int, FloatList
 
@@ -166,3 +166,62 @@ x = 10
     [sub]
         z = 30
 """
+
+def test_Config_validate_incremental(schema, config):
+    assert not schema.validate(config, incremental=True)
+    assert config.get_changes() == frozenset()
+    config['values']['x'] = 30.0
+    assert config.get_changes() == {('values', 'x')}
+    validation = schema.validate(config, incremental=True)
+    assert list(validation.keys()) == ['values']
+    assert list(validation['values'].keys()) == ['x']
+    # after an error, the next incremental validation is complete:
+    config['values']['x'] = 15.0
+    config['values']['y'] = 35.0
+    validation = schema.validate(config, incremental=True)
+    assert list(validation['values'].keys()) == ['y']
+
+def test_Config_validate_incremental_dependencies():
+    schema = Schema()
+    schema['n'] = Int(default=2)
+    schema['sub'] = {'m': Int(default=ROOT['n'] * 10), 'l': FloatList(min_len=ROOT['n'])}
+    config = Config({'sub': {'l': [1.0, 2.0]}})
+    assert not schema.validate(config, incremental=True)
+    assert config['sub']['m'] == 20
+    config['n'] = 3
+    validation = schema.validate(config, incremental=True)
+    assert config['sub']['m'] == 30
+    assert list(validation['sub'].keys()) == ['l']
+
+def test_Config_validate_incremental_macro_value():
+    schema = Schema()
+    schema['x'] = Int(max=10)
+    schema['y'] = Int(max=10)
+    config = Config({'x': 1})
+    config['y'] = ROOT['x'] + 1
+    assert not schema.validate(config, incremental=True)
+    config['x'] = 10
+    validation = schema.validate(config, incremental=True)
+    assert list(validation.keys()) == ['y']
+
+def test_Config_validate_incremental_schema_changed(schema, config):
+    assert not schema.validate(config, incremental=True)
+    schema['values']['x'] = Float(max=10.0)
+    validation = schema.validate(config, incremental=True)
+    assert list(validation['values'].keys()) == ['x']
+
+def test_Config_validate_incremental_new_option(schema, config):
+    assert not schema.validate(config, incremental=True)
+    config['values']['w'] = 1.0
+    validation = schema.validate(config, incremental=True)
+    assert list(validation['values'].keys()) == ['w']
+
+def test_Config_incremental_validation(schema, config_content):
+    config = Config(config_content, schema=schema, incremental_validation=True)
+    assert config.incremental_validation
+    config['parameters']['max_iterations'] = 10
+    config.to_string(protocol="zirkon")
+    config['values']['z'] = 1.0
+    with pytest.raises(ConfigValidationError) as exc_info:
+        config.to_string(protocol="zirkon")
+    assert list(exc_info.value.validation['values'].keys()) == ['z']
@@ -54,3 +54,29 @@ def test_ConfigObjSerializer_from_file(simple_config_content, serializer, tmp_te
     obj = serializer.from_file(filename=tmp_text_file.name)
     assert compare_dicts(obj, simple_config_content)
 
+
+class LineStream(object):
+    def __init__(self, serialization):
+        self.name = 'line_stream'
+        self.serialization = serialization
+        self.consumed = 0
+
+    def __iter__(self):
+        for line in self.serialization.splitlines(True):
+            self.consumed += 1
+            yield line
+
+    def read(self):
+        raise AssertionError("stream.read() called")
+
+def test_ConfigObjSerializer_from_stream_lines(simple_config_content, serializer):
+    stream = LineStream(SIMPLE_CONFIG_CONFIGOBJ_SERIALIZATION)
+    obj = serializer.from_stream(stream=stream)
+    assert compare_dicts(obj, simple_config_content)
+
+def test_ConfigObjSerializer_from_stream_lines_error(serializer):
+    stream = LineStream("a = 1\n[[b]]\nc = 3\nd = 4\n")
+    with pytest.raises(ValueError) as exc_info:
+        serializer.from_stream(stream=stream)
+    assert str(exc_info.value) == "invalid value at line 1@line_stream: invalid mapping level 2"
+    assert stream.consumed == 2
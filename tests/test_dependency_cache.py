@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from zirkon.toolbox.dependency_cache import DependencyCache
+
+
+@pytest.fixture
+def cache():
+    return DependencyCache()
+
+def test_DependencyCache_store_lookup(cache):
+    source = object()
+    cache.store('a', source, 10, ['b'])
+    assert 'a' in cache
+    assert len(cache) == 1
+    assert cache.lookup('a', source) == (True, 10)
+    assert cache.lookup('a', object()) == (False, None)
+    assert cache.lookup('x', source) == (False, None)
+
+def test_DependencyCache_invalidate(cache):
+    source = object()
+    cache.store('a', source, 10, ['b', 'c'])
+    cache.store('d', source, 20, ['c'])
+    cache.invalidate('b')
+    assert 'a' not in cache
+    assert 'd' in cache
+    cache.invalidate('d')
+    assert 'd' not in cache
+
+def test_DependencyCache_nested_recording(cache):
+    source = object()
+    with cache.recording() as outer:
+        cache.record('x')
+        with cache.recording() as inner:
+            cache.record('y')
+        cache.store('i', source, 1, inner)
+    cache.store('o', source, 2, outer)
+    assert inner == {'y'}
+    assert outer == {'x', 'y'}
+    assert not cache.is_recording
+    with cache.recording() as other:
+        assert cache.lookup('i', source) == (True, 1)
+    assert other == {'y'}
+    cache.invalidate('y')
+    assert len(cache) == 0
+
+def test_DependencyCache_validate(cache):
+    source = object()
+    cache.validate(1)
+    cache.store('a', source, 10, ())
+    cache.validate(1)
+    assert 'a' in cache
+    cache.validate(2)
+    assert 'a' not in cache
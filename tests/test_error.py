@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+__author__ = "Simone Campagna"
+
+import pickle
+
+import pytest
+
+from zirkon.validator import Int, IntChoice, IntList
+from zirkon.validator.check_range import CheckMin
+from zirkon.validator.error import OptionValidationError, \
+    MinValueError, MaxLengthError, InvalidChoiceError
+from zirkon.validator.option import Option
+
+
+def test_OptionValidationError_message():
+    error = MinValueError("x=1: value is lower than min 3")
+    assert error.option is None
+    assert error.check is None
+    assert error.parameters == {}
+    assert str(error) == "x=1: value is lower than min 3"
+    assert error.args == ("x=1: value is lower than min 3",)
+
+def test_OptionValidationError_build():
+    option = Option(name='x', value=1)
+    error = MinValueError.build(option, "value is lower than min {min!r}", min=3)
+    option.value = 2
+    assert error.option.value == 1
+    assert error.parameters == {'min': 3}
+    assert str(error) == "x=1: value is lower than min 3"
+    assert repr(error) == repr(MinValueError("x=1: value is lower than min 3"))
+    assert error.args == ("x=1: value is lower than min 3",)
+
+def test_OptionValidationError_build_no_parameters():
+    error = OptionValidationError.build(Option(name='x', value='{}'), "invalid {value}")
+    assert str(error) == "x='{}': invalid {value}"
+
+def test_OptionValidationError_lazy():
+    class Value(object):
+        def __repr__(self):
+            raise AssertionError("unexpected rendering")
+    error = MinValueError.build(Option(name='x', value=Value()), "value is lower than min {min!r}", min=3)
+    assert isinstance(error, OptionValidationError)
+    assert error.parameters['min'] == 3
+
+def test_OptionValidationError_pickle():
+    error = MinValueError.build(Option(name='x', value=1), "value is lower than min {min!r}", min=3)
+    error = pickle.loads(pickle.dumps(error))
+    assert type(error) is MinValueError
+    assert str(error) == "x=1: value is lower than min 3"
+    assert error.parameters == {'min': 3}
+
+def test_OptionValidationError_check():
+    with pytest.raises(MinValueError) as exc_info:
+        Int(min=3).validate(name='x', value=1, defined=True)
+    error = exc_info.value
+    assert isinstance(error.check, CheckMin)
+    assert error.option.name == 'x'
+    assert error.parameters == {'min': 3}
+    assert str(error) == "x=1: value is lower than min 3"
+
+def test_OptionValidationError_choice():
+    with pytest.raises(InvalidChoiceError) as exc_info:
+        IntChoice(choices=(1, 2)).validate(name='x', value=3, defined=True)
+    assert exc_info.value.parameters['choices'] == [1, 2]
+    assert str(exc_info.value) == "x=3: 3 is not a valid choice; valid choices are: (1, 2)"
+
+def test_OptionValidationError_length():
+    with pytest.raises(MaxLengthError) as exc_info:
+        IntList(max_len=2).validate(name='x', value=[1, 2, 3], defined=True)
+    assert exc_info.value.parameters == {'length': 3, 'max_len': 2}
+    assert str(exc_info.value) == "x=[1, 2, 3]: length 3 is greater than max_len 2"
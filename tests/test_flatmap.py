@@ -18,6 +18,7 @@
 __author__ = "Simone Campagna"
 
 import collections
+import contextlib
 import io
 
 import pytest
@@ -281,3 +282,139 @@ def test_FlatMap_bool(content):
     assert flatmap
     del flatmap['x']
     assert not flatmap
+
+def test_FlatMap_nested_clear(content):
+    flatmap = FlatMap(None, init=content)
+    flatmap['sub']['subsub'] = {'t': 1, 'deep': {'u': 2}}
+    flatmap['sub2'] = {'x': 3}
+    flatmap['sub'].clear()
+    assert len(flatmap['sub']) == 0
+    assert not flatmap['sub']
+    assert list(flatmap.dictionary.keys()) == ['a', 'b', 'sub.', 'c', 'sub2.', 'sub2.x']
+    del flatmap['sub2']
+    assert list(flatmap.dictionary.keys()) == ['a', 'b', 'sub.', 'c']
+    assert list(flatmap.keys()) == ['a', 'b', 'sub', 'c']
+
+def test_FlatMap_submap_len_order(content):
+    flatmap = FlatMap(None, init=content)
+    flatmap['sub']['subsub'] = {'t': 1}
+    flatmap['sub']['z'] = 3
+    assert len(flatmap) == 4
+    assert len(flatmap['sub']) == 4
+    assert list(flatmap['sub'].keys()) == ['x', 'y', 'subsub', 'z']
+    del flatmap['sub']['x']
+    flatmap['sub']['x'] = 5
+    assert list(flatmap['sub'].keys()) == ['y', 'subsub', 'z', 'x']
+    assert flatmap['sub']['subsub'].as_dict() == {'t': 1}
+
+def test_FlatMap_existing_dictionary(content):
+    dictionary = FlatMap(None, init=content).dictionary
+    flatmap = FlatMap(dictionary)
+    assert len(flatmap) == 4
+    assert len(flatmap['sub']) == 2
+    flatmap['sub']['w'] = 4
+    assert flatmap['sub'].as_dict() == {'x': 1, 'y': 2, 'w': 4}
+    assert flatmap.as_dict() == FlatMap(dictionary).as_dict()
+
+class CountingDict(collections.OrderedDict):
+    def __init__(self, *args, **kwargs):
+        self.writes = 0
+        self.syncs = 0
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        self.writes += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.writes += 1
+        super().__delitem__(key)
+
+    def sync(self):
+        self.syncs += 1
+
+def test_FlatMap_batch(content):
+    dictionary = CountingDict()
+    flatmap = FlatMap(dictionary, init=content)
+    writes = dictionary.writes
+    with flatmap.batch():
+        flatmap['sub']['z'] = 3
+        flatmap['sub']['x'] = 10
+        flatmap['sub']['x'] = 11
+        del flatmap['b']
+        flatmap['new'] = {'t': 4}
+        assert dictionary.writes == writes
+        assert dictionary.syncs == 0
+        assert flatmap['sub']['x'] == 11
+        assert 'b' not in flatmap
+        assert list(flatmap.keys()) == ['a', 'sub', 'c', 'new']
+        assert list(flatmap['sub'].keys()) == ['x', 'y', 'z']
+        assert flatmap['new'].as_dict() == {'t': 4}
+    assert dictionary.writes == writes + 5
+    assert dictionary.syncs == 1
+    assert list(flatmap.keys()) == ['a', 'sub', 'c', 'new']
+    assert flatmap.as_dict() == FlatMap(dictionary).as_dict()
+    assert flatmap['sub'].as_dict() == {'x': 11, 'y': 2, 'z': 3}
+
+def test_FlatMap_batch_nested(content):
+    dictionary = CountingDict()
+    flatmap = FlatMap(dictionary, init=content)
+    with flatmap.batch():
+        with flatmap['sub'].batch():
+            flatmap['sub']['z'] = 3
+        assert 'sub.z' not in dictionary
+        flatmap['sub']['z'] = 4
+    assert dictionary['sub.z'] == 4
+    assert dictionary.syncs == 1
+
+def test_FlatMap_batch_clear(content):
+    flatmap = FlatMap(None, init=content)
+    with flatmap.batch():
+        flatmap.clear()
+        assert not flatmap
+        flatmap['a'] = 5
+    assert list(flatmap.dictionary.keys()) == ['a']
+    assert flatmap.as_dict() == {'a': 5}
+
+def test_FlatMap_batch_error(content):
+    flatmap = FlatMap(None, init=content)
+    with pytest.raises(ZeroDivisionError):
+        with flatmap.batch():
+            flatmap['a'] = 100
+            flatmap['a'] = 1 // 0
+    assert flatmap.dictionary['a'] == 100
+    flatmap['d'] = 6
+    assert flatmap.dictionary['d'] == 6
+
+class BatchDict(collections.OrderedDict):
+    def __init__(self, *args, **kwargs):
+        self.batches = 0
+        super().__init__(*args, **kwargs)
+
+    @contextlib.contextmanager
+    def batch(self):
+        self.batches += 1
+        yield self
+
+def test_FlatMap_batch_dictionary_batch(content):
+    dictionary = BatchDict()
+    flatmap = FlatMap(dictionary, init=content)
+    with flatmap.batch():
+        flatmap['sub']['z'] = 3
+        assert dictionary['sub.z'] == 3
+        assert flatmap.dictionary is dictionary
+    assert dictionary.batches == 1
+
+def test_FlatMap_submap_cache_eviction():
+    flatmap = FlatMap(collections.OrderedDict())
+    for i in range(100):
+        flatmap['sub{}'.format(i)] = {'a': 1, 'subsub': {'b': 2}}
+        assert flatmap['sub{}'.format(i)]['subsub']['b'] == 2
+        del flatmap['sub{}'.format(i)]
+    assert not flatmap._submaps
+    flatmap['sub'] = {'subsub': {'b': 2}}
+    submap = flatmap['sub']
+    assert submap['subsub']['b'] == 2
+    submap.clear()
+    assert not submap._submaps
+    assert flatmap['sub'] is submap
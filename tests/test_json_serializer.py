@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import collections
 import inspect
+import io
+import json
 import os
 
 import pytest
@@ -12,7 +15,8 @@ from common.fixtures import defaultsvalue, \
                             tmp_text_file, \
                             SIMPLE_CONFIG_JSON_SERIALIZATION
 
-from zirkon.config import Config
+from zirkon.config import Config, ROOT
+from zirkon.toolbox.serializer import json_serializer
 from zirkon.toolbox.serializer.json_serializer import JSONSerializer
 
 @pytest.fixture
@@ -51,3 +55,62 @@ def test_JSONSerializer_from_file(simple_config_content, serializer, tmp_text_fi
     obj = serializer.from_file(filename=tmp_text_file.name)
     assert obj == simple_config_content
 
+
+def test_JSONSerializer_compact(simple_config_content):
+    serializer = JSONSerializer(compact=True)
+    assert serializer.compact
+    serialization = serializer.to_string(simple_config_content)
+    assert serialization == json.dumps(json.loads(SIMPLE_CONFIG_JSON_SERIALIZATION), separators=(',', ':')) + '\n'
+    assert serializer.from_string(serialization) == simple_config_content
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_JSONSerializer_to_stream_chunks(simple_config_content, compact):
+    serializer = JSONSerializer(compact=compact)
+    serializer.WRITE_BUFFER_SIZE = 20
+    stream = io.StringIO()
+    writes = []
+    def write(data):
+        writes.append(data)
+        return len(data)
+    stream.write = write
+    count = serializer.to_stream(obj=simple_config_content, stream=stream)
+    serialization = serializer.to_string(simple_config_content)
+    assert ''.join(writes) == serialization
+    assert count == len(serialization)
+    assert len(writes) > 1
+
+def test_JSONSerializer_unordered(simple_config_content):
+    serializer = JSONSerializer(ordered=False)
+    assert not serializer.ordered
+    obj = serializer.from_string(SIMPLE_CONFIG_JSON_SERIALIZATION)
+    assert type(obj) is dict
+    assert type(obj['options']) is dict
+    assert obj == simple_config_content
+
+def test_JSONSerializer_ordered():
+    obj = JSONSerializer().from_string('{"b": 1, "a": {"y": 2, "x": 3}}')
+    assert isinstance(obj, collections.OrderedDict)
+    assert list(obj) == ['b', 'a']
+    assert list(obj['a']) == ['y', 'x']
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_JSONSerializer_no_codec_fast_path(simple_config_content, ordered, monkeypatch):
+    def hook(*args):
+        raise AssertionError("hook called")
+    monkeypatch.setattr(json_serializer, '_object_pairs_hook', hook)
+    monkeypatch.setattr(json_serializer, '_object_hook', hook)
+    serializer = JSONSerializer(ordered=ordered)
+    assert serializer.from_string(SIMPLE_CONFIG_JSON_SERIALIZATION) == simple_config_content
+
+@pytest.mark.parametrize("ordered", [False, True])
+@pytest.mark.parametrize("compact", [False, True])
+def test_JSONSerializer_codecs(compact, ordered):
+    config = Config()
+    config['a'] = 10
+    config['b'] = ROOT['a'] + 1
+    serializer = JSONSerializer(compact=compact, ordered=ordered)
+    serialization = config.to_string(protocol=serializer)
+    assert '"__class_name__"' in serialization
+    config2 = Config.from_string(serialization, protocol=serializer)
+    assert config2['b'] == 11
+    assert config2 == config
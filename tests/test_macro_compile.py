@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import pickle
+
+import pytest
+
+from zirkon.toolbox.macro import \
+    Macro, MName, MConst, MCall, MContains, MGetattr, MLen, MStr, MRepr, \
+    MAbs, MDivMod, MAnd, MOr, MNot, MAdd
+from zirkon.macros import MNameCall
+
+Param = collections.namedtuple('Param', ('macro', 'globals_d'))
+
+X = MName('x')
+Y = MName('y')
+L = MName('l')
+
+_data = [
+    Param(macro=3 * X - 5, globals_d={'x': 5}),
+    Param(macro=X ** Y ** 2, globals_d={'x': 2, 'y': 3}),
+    Param(macro=(X ** Y) ** 2, globals_d={'x': 2, 'y': 3}),
+    Param(macro=-X // 3 + (+Y) % 4 / 2, globals_d={'x': 10, 'y': 7}),
+    Param(macro=MDivMod(X, Y), globals_d={'x': 10, 'y': 7}),
+    Param(macro=MAbs(X - Y), globals_d={'x': 1, 'y': 7}),
+    Param(macro=(X < Y) == (X <= Y), globals_d={'x': 1, 'y': 7}),
+    Param(macro=(X > Y) != (X >= Y), globals_d={'x': 1, 'y': 1}),
+    Param(macro=MAnd(X, Y), globals_d={'x': 0, 'y': 7}),
+    Param(macro=MOr(X, Y), globals_d={'x': 0, 'y': 7}),
+    Param(macro=MNot(X), globals_d={'x': 0}),
+    Param(macro=MContains(X, L), globals_d={'x': 3, 'l': [1, 2, 3]}),
+    Param(macro=MLen(L) + L[0], globals_d={'l': [1, 2, 3]}),
+    Param(macro=MStr(X) + MRepr(Y), globals_d={'x': 3, 'y': 'a'}),
+    Param(macro=L + [4, 5], globals_d={'l': [1, 2, 3]}),
+    Param(macro=MConst(10) + MConst(X), globals_d={'x': 3}),
+    Param(macro=MGetattr(X, 'real'), globals_d={'x': 3}),
+    Param(macro=X.imag + X.real, globals_d={'x': 3 + 2j}),
+    Param(macro=MName('f')(X, Y, z=X), globals_d={'x': 3, 'y': 4, 'f': lambda x, y, z: x * y - z}),
+    Param(macro=MCall(MName('f'), (), {'class': X}), globals_d={'x': 3, 'f': lambda **kw: kw}),
+    Param(macro=MName('z', {'z': 10}) + X, globals_d={'x': 3}),
+    Param(macro=MNameCall('f') * 2, globals_d={'f': lambda: 21}),
+    Param(macro=MNameCall('f', {'f': lambda: 21}) + X, globals_d={'x': 3, 'f': lambda: 0}),
+]
+
+@pytest.fixture(params=_data, ids=tuple(enumerate(_data)))
+def param(request):
+    return request.param
+
+def test_Macro_compile(param):
+    compiled = param.macro.compile()
+    assert compiled(param.globals_d) == param.macro.evaluate(param.globals_d)
+
+def test_Macro_compile_cached():
+    macro = X + 1
+    compiled = macro.compile()
+    assert macro.compile() is compiled
+    assert compiled({'x': 1}) == 2
+    assert compiled({'x': 2}) == 3
+
+def test_Macro_compile_pickle():
+    macro = X + 1
+    macro.compile()
+    macro2 = pickle.loads(pickle.dumps(macro))
+    assert macro2.compile()({'x': 4}) == 5
+
+def test_Macro_compile_name_error():
+    compiled = (X + Y).compile()
+    with pytest.raises(NameError) as exc_info:
+        compiled({'x': 1})
+    assert "'y'" in str(exc_info.value)
+    with pytest.raises(NameError):
+        compiled()
+
+def test_Macro_compile_const():
+    assert MConst(10).compile()() == 10
+    lst = [1, 2]
+    assert MConst(lst).compile()() is lst
+
+def test_Macro_compile_eager_and():
+    with pytest.raises(KeyError):
+        MAnd(X, L['a']).compile()({'x': 0, 'l': {}})
+
+class MyAdd(MAdd):
+    def _impl_binary_operation(self, left_value, right_value):
+        return left_value * 100 + right_value
+
+class MyNameCall(MNameCall):
+    def evaluate(self, globals_d=None):
+        return super().evaluate(globals_d) + 1
+
+def test_Macro_compile_subclass_fallback():
+    macro = MyAdd(X, 2) + MyNameCall('f')
+    globals_d = {'x': 3, 'f': lambda: 5}
+    assert macro.evaluate(globals_d) == 308
+    assert macro.compile()(globals_d) == 308
+
+class PathDict(dict):
+    def get_path_value(self, keys):
+        return ('path',) + keys
+
+def test_Macro_compile_getitem_path():
+    macro = MName('d')['a']['b'] + MName('d')['c']
+    globals_d = {'d': {'a': {'b': 1}, 'c': 2}}
+    assert macro.compile()(globals_d) == 3
+    globals_d = {'d': PathDict()}
+    assert macro.compile()(globals_d) == ('path', 'a', 'b', 'path', 'c')
+
+def test_Macro_compile_getitem_non_str():
+    macro = MName('l')[1]['a']
+    assert macro.compile()({'l': [None, {'a': 5}]}) == 5
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import pickle
+
+import pytest
+
+from zirkon.toolbox.macro import \
+    Macro, MName, MConst, MCall, MGetattr, MLen, MStr, MAdd
+from zirkon.macros import ROOT, SECTION
+
+Param = collections.namedtuple('Param', ('macro', 'expression', 'globals_d'))
+
+X = MName('x')
+
+_data = [
+    Param(macro=X * (MConst(2) ** 10), expression="x * 1024", globals_d={'x': 3}),
+    Param(macro=MConst(2) * 3 + X, expression="6 + x", globals_d={'x': 3}),
+    Param(macro=X + MConst(2) * 3, expression="x + 6", globals_d={'x': 3}),
+    Param(macro=MLen(MConst('abc')) + X, expression="3 + x", globals_d={'x': 3}),
+    Param(macro=MStr(MConst(1.5)) + X, expression="'1.5' + x", globals_d={'x': 'a'}),
+    Param(macro=MConst((1, 2)) + MConst((3,)), expression="(1, 2, 3)", globals_d={}),
+    Param(macro=-MConst(2) * X, expression="-2 * x", globals_d={'x': 3}),
+    Param(macro=MConst(10) // MConst(0) + X, expression="10 // 0 + x", globals_d={'x': 3}),
+    Param(macro=MConst([1, 2]) + X, expression="[1, 2] + x", globals_d={'x': [3]}),
+    Param(macro=MCall(MName('f'), (MConst(2) + 1,)), expression="f(3)", globals_d={'f': lambda x: x * 2}),
+    Param(macro=ROOT['a'][MConst('b') + 'c'], expression="ROOT['a']['bc']", globals_d={'ROOT': {'a': {'bc': 5}}}),
+]
+
+@pytest.fixture(params=_data, ids=tuple(enumerate(_data)))
+def param(request):
+    return request.param
+
+def test_Macro_optimize(param):
+    optimized = param.macro.optimize()
+    assert isinstance(optimized, Macro)
+    assert optimized.unparse() == param.expression
+    try:
+        value = param.macro.evaluate(param.globals_d)
+    except ZeroDivisionError:
+        with pytest.raises(ZeroDivisionError):
+            optimized.evaluate(param.globals_d)
+        with pytest.raises(ZeroDivisionError):
+            param.macro.compile()(param.globals_d)
+    else:
+        assert optimized.evaluate(param.globals_d) == value
+        assert param.macro.compile()(param.globals_d) == value
+
+def test_Macro_optimize_shared_subexpressions():
+    macro = (ROOT['a']['b'] + 1) * (ROOT['a']['b'] + 1)
+    optimized = macro.optimize()
+    assert optimized.unparse() == macro.unparse()
+    assert optimized.left_operand is optimized.right_operand
+
+def test_Macro_optimize_mutable_const():
+    lst = [1, 2]
+    optimized = (MConst(lst) + [3]).optimize()
+    assert optimized.evaluate() == [1, 2, 3]
+    lst.append(4)
+    assert optimized.evaluate() == [1, 2, 4, 3]
+
+def test_Macro_optimize_getattr():
+    optimized = (MGetattr(MConst(3 + 2j), 'imag') + 1).optimize()
+    assert optimized.unparse() == "(3+2j).imag + 1"
+    assert pickle.loads(pickle.dumps(optimized)).evaluate() == 3.0
+
+def test_Macro_optimize_section_macros():
+    optimized = (SECTION['x'] * (MConst(60) * 60)).optimize()
+    assert optimized.unparse() == "SECTION['x'] * 3600"
+    assert optimized.evaluate({'SECTION': lambda: {'x': 2}}) == 7200
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+__author__ = "Simone Campagna"
+
+import os
+
+import pytest
+
+from zirkon.config import Config
+from zirkon.parse_cache import ParseCache, \
+    get_default_parse_cache, set_default_parse_cache, load_file
+from zirkon.toolbox.serializer import Serializer
+
+
+@pytest.fixture
+def cache_dir(tmpdir):
+    return os.path.join(tmpdir.strpath, 'cache')
+
+
+@pytest.fixture
+def config_filename(tmpdir):
+    filename = os.path.join(tmpdir.strpath, 'x.zirkon')
+    config = Config()
+    config['a'] = 10
+    config['sub'] = {'b': [1, 2.5, 'x'], 'c': None}
+    config.to_file(filename, 'zirkon')
+    return filename
+
+
+@pytest.fixture
+def default_parse_cache(request):
+    parse_cache = get_default_parse_cache()
+    request.addfinalizer(lambda: set_default_parse_cache(parse_cache))
+
+
+def _images(cache_dir):
+    return [entry for entry in os.listdir(cache_dir) if entry.endswith(ParseCache.SUFFIX)]
+
+
+def test_ParseCache_miss_hit(cache_dir, config_filename):
+    parse_cache = ParseCache(cache_dir)
+    config0 = Config.from_file(config_filename, 'zirkon', parse_cache=parse_cache)
+    assert parse_cache.misses == 1
+    assert parse_cache.hits == 0
+    assert len(_images(cache_dir)) == 1
+    config1 = Config.from_file(config_filename, 'zirkon', parse_cache=parse_cache)
+    assert parse_cache.misses == 1
+    assert parse_cache.hits == 1
+    assert config1 == config0
+    assert config1.to_string('zirkon') == config0.to_string('zirkon')
+
+
+def test_ParseCache_directory(cache_dir, config_filename):
+    Config.from_file(config_filename, 'zirkon', parse_cache=cache_dir)
+    assert len(_images(cache_dir)) == 1
+    assert ParseCache(cache_dir).directory == os.path.abspath(cache_dir)
+
+
+def test_ParseCache_modified(cache_dir, config_filename):
+    parse_cache = ParseCache(cache_dir)
+    Config.from_file(config_filename, 'zirkon', parse_cache=parse_cache)
+    with open(config_filename, 'a') as f_stream:
+        f_stream.write("d = 'new'\n")
+    config = Config.from_file(config_filename, 'zirkon', parse_cache=parse_cache)
+    assert parse_cache.misses == 2
+    assert parse_cache.hits == 0
+    assert config['d'] == 'new'
+
+
+def test_ParseCache_mtime(cache_dir, config_filename):
+    parse_cache = ParseCache(cache_dir)
+    key0 = parse_cache.get_key(Serializer.get_class('zirkon')(), config_filename)
+    stat = os.stat(config_filename)
+    os.utime(config_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    key1 = parse_cache.get_key(Serializer.get_class('zirkon')(), config_filename)
+    assert key0 != key1
+    assert parse_cache.get_cache_filename(key0) != parse_cache.get_cache_filename(key1)
+
+
+def test_ParseCache_protocol(cache_dir, config_filename):
+    parse_cache = ParseCache(cache_dir)
+    key0 = parse_cache.get_key(Serializer.get_class('zirkon')(), config_filename)
+    key1 = parse_cache.get_key(Serializer.get_class('configobj')(), config_filename)
+    assert key0 != key1
+
+
+def test_ParseCache_serializer_options(cache_dir, tmpdir):
+    filename = os.path.join(tmpdir.strpath, 'x.json')
+    config = Config()
+    config['a'] = {'x': 1}
+    config.to_file(filename, 'json')
+    parse_cache = ParseCache(cache_dir)
+    json_class = Serializer.get_class('json')
+    assert type(parse_cache.load(json_class(), filename)['a']) is not dict
+    assert parse_cache.misses == 1
+    for _ in range(2):
+        assert type(parse_cache.load(json_class(ordered=False), filename)['a']) is dict
+    assert parse_cache.misses == 1
+    assert parse_cache.hits == 0
+    assert type(parse_cache.load(json_class(), filename)['a']) is not dict
+    assert parse_cache.hits == 1
+
+
+def test_ParseCache_serializer_class(cache_dir, config_filename):
+    zirkon_class = Serializer.get_class('zirkon')
+
+    class MyZirkonSerializer(zirkon_class):
+        @classmethod
+        def class_tag(cls):
+            return "test_parse_cache_zirkon"
+
+    parse_cache = ParseCache(cache_dir)
+    key0 = parse_cache.get_key(zirkon_class(), config_filename)
+    key1 = parse_cache.get_key(MyZirkonSerializer(), config_filename)
+    assert key0[-2] != key1[-2]
+
+
+def test_ParseCache_corrupted(cache_dir, config_filename):
+    parse_cache = ParseCache(cache_dir)
+    config0 = Config.from_file(config_filename, 'zirkon', parse_cache=parse_cache)
+    for entry in _images(cache_dir):
+        with open(os.path.join(cache_dir, entry), 'wb') as f_stream:
+            f_stream.write(b'ZBIN garbage')
+    config1 = Config.from_file(config_filename, 'zirkon', parse_cache=parse_cache)
+    assert parse_cache.misses == 2
+    assert config1 == config0
+    config2 = Config.from_file(config_filename, 'zirkon', parse_cache=parse_cache)
+    assert parse_cache.hits == 1
+    assert config2 == config0
+
+
+def test_ParseCache_clear(cache_dir, config_filename):
+    parse_cache = ParseCache(cache_dir)
+    Config.from_file(config_filename, 'zirkon', parse_cache=parse_cache)
+    assert _images(cache_dir)
+    parse_cache.clear()
+    assert not _images(cache_dir)
+
+
+def test_ParseCache_zbin(cache_dir, tmpdir):
+    filename = os.path.join(tmpdir.strpath, 'x.zbin')
+    config = Config()
+    config['a'] = 10
+    config.to_file(filename, 'zbin')
+    parse_cache = ParseCache(cache_dir)
+    assert Config.from_file(filename, 'zbin', parse_cache=parse_cache) == config
+    assert parse_cache.hits == parse_cache.misses == 0
+    assert not os.path.exists(cache_dir)
+
+
+def test_ParseCache_read(cache_dir, config_filename):
+    parse_cache = ParseCache(cache_dir)
+    config = Config()
+    config['z'] = 1
+    config.read(config_filename, 'zirkon', parse_cache=parse_cache)
+    config.read(config_filename, 'zirkon', parse_cache=parse_cache)
+    assert parse_cache.misses == 1
+    assert parse_cache.hits == 1
+    assert 'z' not in config
+    assert config['sub']['b'] == [1, 2.5, 'x']
+
+
+def test_ParseCache_default(cache_dir, config_filename, default_parse_cache):
+    set_default_parse_cache(cache_dir)
+    parse_cache = get_default_parse_cache()
+    assert isinstance(parse_cache, ParseCache)
+    Config.from_file(config_filename, 'zirkon')
+    Config.from_file(config_filename, 'zirkon')
+    assert parse_cache.misses == 1
+    assert parse_cache.hits == 1
+    Config.from_file(config_filename, 'zirkon', parse_cache=False)
+    assert parse_cache.misses == 1
+    assert parse_cache.hits == 1
+    set_default_parse_cache(None)
+    assert get_default_parse_cache() is None
+    Config.from_file(config_filename, 'zirkon')
+    assert parse_cache.hits == 1
+
+
+def test_load_file_no_cache(cache_dir, config_filename, default_parse_cache):
+    set_default_parse_cache(None)
+    content = load_file(Serializer.get_class('zirkon')(), config_filename)
+    assert content['a'] == 10
+    assert not os.path.exists(cache_dir)
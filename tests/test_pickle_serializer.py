@@ -22,3 +22,9 @@ def test_PickleSerializer_to_from_string(simple_config_content, serializer):
     serialization = serializer.to_string(simple_config_content)
     obj = serializer.from_string(serialization=serialization)
     assert obj == simple_config_content
+
+def test_PickleSerializer_to_from_file(simple_config_content, serializer, tmpdir):
+    filename = os.path.join(tmpdir.strpath, 'x.pickle')
+    serializer.to_file(simple_config_content, filename)
+    obj = serializer.from_file(filename)
+    assert obj == simple_config_content
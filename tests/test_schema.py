@@ -18,7 +18,10 @@
 __author__ = "Simone Campagna"
 
 import collections
+import concurrent.futures
 import io
+import os
+import pickle
 
 import pytest
 
@@ -34,6 +37,7 @@ from common.fixtures import dictionary, \
     SIMPLE_SCHEMA_ZIRKON_SERIALIZATION
 
 from zirkon.config import Config, ROOT, SECTION
+from zirkon import schema as schema_module
 from zirkon.schema import Schema
 from zirkon.validator import Int, IntChoice
 from zirkon.validator.error import InvalidChoiceError, \
@@ -106,6 +110,18 @@ def test_Schema_from_file_zirkon(simple_schema, tmp_text_file):
     schema = Schema.from_file(filename=tmp_text_file.name, protocol="zirkon")
     assert schema == simple_schema
 
+def test_Schema_from_string_zirkon_shared_validators():
+    schema = Schema.from_string("""\
+a = Int(min=0)
+[sub]
+    b = Int(min=0)
+    c = Int(min=1)
+""", protocol="zirkon")
+    assert schema['a'] is schema['sub']['b']
+    assert schema['sub']['c'] == Int(min=1)
+    schema = Schema.from_string("a = Int(min=0)\n", protocol="zirkon")
+    assert schema['a'] == Int(min=0)
+
 def test_Schema_get_serializer_json():
     assert isinstance(Schema.get_serializer("json"), JSONSerializer)
 
@@ -180,3 +196,53 @@ def test_Schema_macro_err_max(macro_schema, macro_config):
     with pytest.raises(MaxValueError) as exc_info:
         macro_schema.validate(macro_config, raise_on_error=True)
     assert str(exc_info.value) == "sub.d=18: value is greater than max 13"
+
+@pytest.fixture(params=[0, 2])
+def workers(request):
+    return request.param
+
+def test_Schema_validate_many(tmpdir, workers):
+    schema = Schema()
+    schema['x'] = Int(min=3)
+    schema['sub'] = {'y': Int(default=1)}
+    sources = []
+    for x in range(5):
+        filename = tmpdir.join('x{}.zirkon'.format(x)).strpath
+        Config({'x': x}).to_file(filename, 'zirkon')
+        sources.append(filename)
+    sources.append({'x': 10})
+    sources.append(Config({'x': 1}))
+    results = dict((id(source), result) for source, result in schema.validate_many(sources, workers=workers))
+    assert len(results) == len(sources)
+    for source, x in zip(sources, [0, 1, 2, 3, 4, 10, 1]):
+        validation = results[id(source)]
+        if x < 3:
+            assert isinstance(validation['x'], MinValueError)
+        else:
+            assert not validation
+
+def test_Schema_validate_many_error(tmpdir, workers):
+    schema = Schema()
+    schema['x'] = Int(min=3)
+    missing = tmpdir.join('missing.zirkon').strpath
+    results = dict(schema.validate_many([missing, 'x'], workers=workers))
+    assert isinstance(results[missing], OSError)
+    assert isinstance(results['x'], OSError)
+
+def test_Schema_validate_many_generator(workers):
+    schema = Schema()
+    schema['x'] = Int(min=3)
+    results = list(schema.validate_many(({'x': x} for x in range(20)), workers=workers))
+    assert sorted(source['x'] for source, validation in results if not validation) == list(range(3, 20))
+
+def _worker_plan(_):
+    return os.getpid(), schema_module._WORKER_PLAN is not None
+
+def test_Schema_warm_up_workers():
+    schema = Schema()
+    schema['x'] = Int(min=3)
+    plan_data = pickle.dumps(schema.compile())
+    with concurrent.futures.ProcessPoolExecutor(3) as executor:
+        schema_module._warm_up_workers(executor, 3, plan_data)
+        results = list(executor.map(_worker_plan, range(30)))
+    assert all(has_plan for pid, has_plan in results)
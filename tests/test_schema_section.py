@@ -26,7 +26,7 @@ from common.fixtures import \
     simple_section_content, \
     simple_schema_content
 from zirkon.section import Section
-from zirkon.schema_section import SchemaSection
+from zirkon.schema_section import SchemaSection, ValidationPlan
 from zirkon.validation import Validation
 from zirkon.validator import Int, Str, \
     FloatTuple, StrChoice
@@ -132,3 +132,63 @@ def test_SchemaSection_validate_unexpected_sub_removed(dictionary, generic_dicti
     assert not validation
     assert section['sub'].has_section('ssub')
     assert not section['sub']['ssub'].has_option('abc')
+
+@pytest.fixture(params=[None, Ignore(), Remove()])
+def unexpected_option_validator(request):
+    return request.param
+
+def test_SchemaSection_compile(generic_dictionary, simple_schema_content, simple_section_content, unexpected_option_validator):
+    simple_section_content['sub']['abc'] = 10
+    simple_section_content['sub']['ssub'] = {'abc': 10}
+    simple_section_content['sub']['subsub']['ssx'] = "delta"
+    del simple_section_content['sub']['sb']
+    schema_section = SchemaSection(dictionary=generic_dictionary, init=simple_schema_content,
+                                   unexpected_option_validator=unexpected_option_validator)
+    section0 = Section(init=simple_section_content)
+    section1 = Section(init=simple_section_content)
+    plan = schema_section.compile()
+    assert isinstance(plan, ValidationPlan)
+    validation0 = schema_section.validate(section0)
+    validation1 = plan.validate(section1)
+    assert validation1.to_string(protocol='zirkon') == validation0.to_string(protocol='zirkon')
+    assert section1 == section0
+    assert section1['sub']['sb'] == 3
+    assert isinstance(validation1['sub']['subsub']['ssx'], InvalidChoiceError)
+
+def test_SchemaSection_compile_entries(generic_dictionary, simple_schema_content):
+    schema_section = SchemaSection(dictionary=generic_dictionary, init=simple_schema_content)
+    plan = schema_section.compile()
+    assert [entry.fqname for entry in plan.entries] == \
+        ['a', 'sub.sa', 'sub.sb', 'sub.sc', 'sub.subsub.ssx', 'sub.subsub.ssy']
+    assert plan.root.expected_section_names == frozenset(['sub'])
+
+def test_SchemaSection_compile_reuse(generic_dictionary, simple_schema_content, simple_section_content):
+    schema_section = SchemaSection(dictionary=generic_dictionary, init=simple_schema_content)
+    plan = schema_section.compile()
+    schema_section['sub']['sa'] = Str()
+    for ssx in 'alpha', 'delta':
+        simple_section_content['sub']['subsub']['ssx'] = ssx
+        section = Section(init=simple_section_content)
+        validation = plan.validate(section)
+        assert (ssx == 'delta') == validation.has_section('sub')
+        assert (ssx == 'delta') == bool(validation)
+
+def test_SchemaSection_compile_raise_on_error(generic_dictionary, simple_schema_content, simple_section_content):
+    simple_section_content['sub']['abc'] = 10
+    schema_section = SchemaSection(dictionary=generic_dictionary, init=simple_schema_content)
+    section = Section(init=simple_section_content)
+    with pytest.raises(UnexpectedOptionError):
+        schema_section.compile().validate(section, raise_on_error=True)
+
+@pytest.mark.parametrize("use_defaults", [True, False])
+def test_SchemaSection_compile_use_defaults(generic_dictionary, use_defaults):
+    schema_section = SchemaSection(dictionary=generic_dictionary, use_defaults=use_defaults)
+    schema_section['x'] = Int(default=10)
+    schema_section['sub'] = {'y': Int(default=20)}
+    section0 = Section()
+    section1 = Section()
+    schema_section.validate(section0)
+    schema_section.compile().validate(section1)
+    assert section1['x'] == 10
+    assert section1['sub']['y'] == 20
+    assert section1 == section0
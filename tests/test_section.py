@@ -356,3 +356,71 @@ def test_function_section_options(section_tpl):
     assert count_section_options(section) == len(tpl)
     assert has_section_options(section) == bool(tpl)
     
+
+def test_Section_subsection_cached():
+    section = Section()
+    section['a'] = {'b': {'x': 1}}
+    assert section['a'] is section['a']
+    assert section['a']['b'] is section['a']['b']
+    assert dict(section.sections())['a'] is section['a']
+
+def test_Section_subsection_cache_invalidation():
+    section = Section()
+    section['a'] = {'x': 1}
+    sub_a = section['a']
+    section['a'] = {'x': 2}
+    assert section['a'] is not sub_a
+    assert section['a']['x'] == 2
+    del section['a']
+    section['a'] = {'x': 3}
+    assert section['a']['x'] == 3
+    section.clear()
+    section.update({'a': {'x': 4}})
+    assert section['a']['x'] == 4
+
+def test_Section_subsection_cache_shared_dictionary():
+    section1 = Section()
+    section1['a'] = {'x': 1}
+    section2 = Section(dictionary=section1.dictionary)
+    assert section2['a']['x'] == 1
+    section1['a'] = {'x': 2}
+    assert section2['a']['x'] == 2
+
+def test_Section_trusted_reads():
+    section = Section(trusted_reads=True)
+    assert section.trusted_reads
+    section['l'] = [1.0, 2.0]
+    section['sub'] = {'x': 1}
+    assert section['sub'].trusted_reads
+    # unchecked values set directly onto the dictionary are not checked on read:
+    section.dictionary['z'] = object()
+    assert section['z'] is section.dictionary['z']
+    section.trusted_reads = False
+    with pytest.raises(TypeError):
+        section['z']
+    with pytest.raises(TypeError):
+        section['w'] = object()
+
+def test_Section_track_changes():
+    section = Section({'a': 1, 'sub': {'b': 2, 'c': 3}})
+    assert section.get_changes() is None
+    generation = section.generation
+    section.track_changes()
+    section['a'] = 10
+    section['sub']['b'] = 20
+    del section['sub']['c']
+    assert section['sub'].generation == section.generation == generation + 3
+    assert section.get_changes() == {('a',), ('sub', 'b'), ('sub', 'c')}
+    section['sub'].clear()
+    assert ('sub',) in section.get_changes()
+    section.track_changes()
+    assert section.get_changes() == frozenset()
+
+def test_Section_root_state_not_in_subsections():
+    section = Section({'a': 1, 'sub': {'b': 2, 'subsub': {'c': 3}}})
+    section.track_changes()
+    section['sub']['subsub']['c'] = 4
+    for subsection in section['sub'], section['sub']['subsub']:
+        for attr_name in '_generation', '_changes', '_validation_state', '_macro_stack':
+            assert attr_name not in vars(subsection)
+    assert section.get_changes() == {('sub', 'subsub', 'c')}
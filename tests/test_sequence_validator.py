@@ -11,8 +11,9 @@ from zirkon.validator.error import MinValueError, \
                                    MinLengthError, \
                                    MaxLengthError, \
                                    InvalidTypeError, \
+                                   InvalidChoiceError, \
                                    MissingRequiredOptionError
-from zirkon.validator.int_validators import IntList, IntTuple
+from zirkon.validator.int_validators import IntList, IntTuple, IntChoice
 from zirkon.validator.float_validators import FloatList, FloatTuple
 from zirkon.validator.str_validators import StrList, StrTuple
 from zirkon.validator.bool_validators import BoolList, BoolTuple
@@ -187,3 +188,52 @@ def test_float_list_item_convert():
     value = validator.validate(name='a', value=[1,], defined=True)
     assert isinstance(value[0], float)
     assert not isinstance(value[0], int)
+
+def test_float_tuple_item_convert():
+    validator = FloatTuple()
+    value = validator.validate(name='a', value=(1, 2.5, 3), defined=True)
+    assert isinstance(value, tuple)
+    assert value == (1.0, 2.5, 3.0)
+    assert all(type(item) is float for item in value)
+
+def test_item_error_is_first_bad_item():
+    validator = IntList(item_min=0, item_max=10)
+    with pytest.raises(MaxValueError) as exc_info:
+        validator.validate(name='a', value=[1, 2, 11, 'x', -1], defined=True)
+    assert exc_info.value.option.name == 'a[2]'
+    with pytest.raises(InvalidTypeError) as exc_info:
+        validator.validate(name='a', value=[1, 2, 'x', 11, -1], defined=True)
+    assert exc_info.value.option.name == 'a[2]'
+    with pytest.raises(MinValueError) as exc_info:
+        validator.validate(name='a', value=[1, -1, 'x', 11], defined=True)
+    assert exc_info.value.option.name == 'a[1]'
+
+def test_str_list_item_len():
+    validator = StrList(item_min_len=1, item_max_len=3)
+    with pytest.raises(MinLengthError) as exc_info:
+        validator.validate(name='a', value=['ab', 'abc', ''], defined=True)
+    assert exc_info.value.option.name == 'a[2]'
+    with pytest.raises(MaxLengthError) as exc_info:
+        validator.validate(name='a', value=['abcd', ''], defined=True)
+    assert exc_info.value.option.name == 'a[0]'
+
+class IntChoiceList(IntList):
+    ITEM_VALIDATOR_CLASS = IntChoice
+
+def test_choice_list():
+    validator = IntChoiceList(item_choices=(1, 2, 3))
+    seq = [1, 2, 3] * 1000
+    assert validator.item_validator.checks[-1].scan_items(seq, len(seq), None) == (seq, len(seq))
+    assert validator.validate(name='a', value=seq, defined=True) is seq
+    with pytest.raises(InvalidChoiceError) as exc_info:
+        validator.validate(name='a', value=[1, 2, 4, 5], defined=True)
+    assert exc_info.value.option.name == 'a[2]'
+
+def test_big_list_unchanged():
+    validator = IntList(item_min=0)
+    seq = list(range(100000))
+    assert validator.validate(name='a', value=seq, defined=True) is seq
+    seq[-1] = -1
+    with pytest.raises(MinValueError) as exc_info:
+        validator.validate(name='a', value=seq, defined=True)
+    assert exc_info.value.option.name == 'a[99999]'
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+__author__ = "Simone Campagna"
+
+import os
+
+import pytest
+
+from common.fixtures import string_io
+
+from zirkon.flatmap import FlatMap
+from zirkon.config import Config, ROOT, SECTION
+from zirkon.sqlite_dictionary import SQLiteDictionary
+
+
+@pytest.fixture
+def db_filename(tmpdir):
+    return os.path.join(tmpdir.strpath, 'config.db')
+
+def test_SQLiteDictionary_mapping(db_filename):
+    with SQLiteDictionary(db_filename) as dictionary:
+        assert len(dictionary) == 0
+        dictionary['x'] = 10
+        dictionary['y'] = 'abc'
+        dictionary['x'] = 11
+        assert 'x' in dictionary
+        assert 'z' not in dictionary
+        assert dictionary['x'] == 11
+        assert list(dictionary) == ['x', 'y']
+        assert len(dictionary) == 2
+        del dictionary['x']
+        with pytest.raises(KeyError):
+            dictionary['x']
+        with pytest.raises(KeyError):
+            del dictionary['x']
+        with pytest.raises(TypeError):
+            dictionary[1] = 2
+        dictionary.clear()
+        assert len(dictionary) == 0
+
+def test_SQLiteDictionary_values(db_filename):
+    values = [None, 1, -3.5, 'alpha', True, False, 2 ** 80, [1, 2], (3, 'a'), ROOT['x'] + SECTION['y']]
+    with SQLiteDictionary(db_filename) as dictionary:
+        for index, value in enumerate(values):
+            dictionary['v{}'.format(index)] = value
+    with SQLiteDictionary(db_filename) as dictionary:
+        for index, value in enumerate(values):
+            stored_value = dictionary['v{}'.format(index)]
+            assert type(stored_value) == type(value)
+            if index == len(values) - 1:
+                assert stored_value.unparse() == value.unparse()
+            else:
+                assert stored_value == value
+
+def test_SQLiteDictionary_children(db_filename):
+    with SQLiteDictionary(db_filename) as dictionary:
+        for key in 'a', 'sub.', 'sub.x', 'sub.sub.', 'sub.sub.y', 'b', 'sub.z':
+            dictionary[key] = None
+        assert dictionary.children('') == ['a', 'sub.', 'b']
+        assert dictionary.children('sub.') == ['x', 'sub.', 'z']
+        assert dictionary.children('sub.sub.') == ['y']
+        assert dictionary.children('c.') == []
+        with pytest.raises(ValueError):
+            dictionary.prefix_index('/')
+
+def test_SQLiteDictionary_transaction(db_filename):
+    with SQLiteDictionary(db_filename) as dictionary:
+        with dictionary.transaction():
+            dictionary['x'] = 1
+            with dictionary.transaction():
+                dictionary['y'] = 2
+        assert dict(dictionary) == {'x': 1, 'y': 2}
+        with pytest.raises(ZeroDivisionError):
+            with dictionary.transaction():
+                dictionary['z'] = 3
+                del dictionary['x']
+                1 / 0
+        assert dict(dictionary) == {'x': 1, 'y': 2}
+
+def test_SQLiteDictionary_readers(db_filename):
+    with SQLiteDictionary(db_filename) as writer, SQLiteDictionary(db_filename) as reader:
+        writer['x'] = 1
+        assert reader['x'] == 1
+        with writer.transaction():
+            writer['x'] = 2
+            assert reader['x'] == 1
+        assert reader['x'] == 2
+
+def test_SQLiteDictionary_table(db_filename):
+    with pytest.raises(ValueError):
+        SQLiteDictionary(db_filename, table='a; drop table x')
+    with SQLiteDictionary(db_filename, table='t0') as dict0, \
+            SQLiteDictionary(db_filename, table='t1') as dict1:
+        dict0['x'] = 0
+        dict1['x'] = 1
+        assert dict0['x'] == 0
+        assert dict1['x'] == 1
+
+def test_Config_on_SQLiteDictionary(db_filename, string_io):
+    with SQLiteDictionary(db_filename) as dictionary:
+        config = Config(dictionary=FlatMap(dictionary))
+        config['x'] = 10
+        config['y'] = {}
+        config['y']['a'] = 'aaa'
+        config['y']['b'] = 111
+        config['y']['c'] = {'v': 10}
+        config['y']['c']['w'] = ROOT['x'] + SECTION['v']
+        config['y']['d'] = 888
+        config['z'] = 999
+        del config['y']['b']
+        assert config['y']['c']['w'] == 20
+    with SQLiteDictionary(db_filename) as dictionary:
+        config = Config(dictionary=FlatMap(dictionary))
+        config.dump(stream=string_io)
+        assert string_io.getvalue() == """\
+x = 10
+[y]
+    a = 'aaa'
+    [c]
+        v = 10
+        w = ROOT['x'] + SECTION['v']
+    d = 888
+z = 999
+"""
+        assert len(config['y']) == 3
+        del config['y']
+        assert list(dictionary) == ['x', 'z']
+
+def test_SQLiteDictionary_batch(db_filename):
+    with SQLiteDictionary(db_filename) as dictionary:
+        flatmap = FlatMap(dictionary)
+        with pytest.raises(ZeroDivisionError):
+            with flatmap.batch():
+                flatmap['x'] = 10
+                flatmap['sub'] = {'y': 20}
+                with SQLiteDictionary(db_filename) as other:
+                    assert len(other) == 0
+                flatmap['z'] = 1 // 0
+        with SQLiteDictionary(db_filename) as other:
+            assert list(other) == ['x', 'sub.', 'sub.y']
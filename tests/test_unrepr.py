@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import collections
+import threading
 
 import pytest
 
-from zirkon.toolbox.unrepr import unrepr
+from zirkon.toolbox.unrepr import unrepr, _unrepr_literal, UnreprCache
 
 
 Parameters = collections.namedtuple('Parameters', ('string', 'expected'))
@@ -106,3 +107,120 @@ def test_unrepr_syntax_error_func_call_2():
 def test_unrepr_syntax_error_func_call_3():
     with pytest.raises(SyntaxError) as exc_info:
         unrepr("import a", {})
+
+_literal_data = [
+    "10", "-3", "+3", "00", "1.5", "-0.0", ".5", "5.", "1e5", "1E-3", "1e400",
+    "'abc'", '"a b"', "''", "True", "False", "None", "10 ",
+    "[]", "()", "[ ]", "[1]", "(1,)", "[1, ]", "(1, 2.5, 'x', None, True)",
+    "['a,b', 'c]']", "(\t1\t,\t)",
+]
+
+@pytest.fixture(ids=_literal_data, params=_literal_data)
+def literal_string(request):
+    return request.param
+
+def test_unrepr_literal(literal_string):
+    found, value = _unrepr_literal(literal_string)
+    assert found
+    expected = eval(literal_string)
+    assert value == expected
+    assert type(value) is type(expected)
+    assert repr(value) == repr(expected)
+    assert unrepr(literal_string) == expected
+
+_not_literal_data = [
+    "01", "1_000", "1j", "0x10", r"'a\\b'", "'''x'''", "'a' 'b'", "b'x'", "r'x'",
+    "Truex", " 10", "(1)", "1, 2", "[[1]]", "[1 2]", "[1,,2]", "[,]", "-[3, 2]",
+]
+
+@pytest.fixture(ids=_not_literal_data, params=_not_literal_data)
+def not_literal_string(request):
+    return request.param
+
+def test_unrepr_not_literal(not_literal_string):
+    assert _unrepr_literal(not_literal_string) == (False, None)
+
+def test_UnreprCache_hits_misses():
+    cache = UnreprCache(maxsize=10)
+    assert cache.unrepr("1.5") == 1.5
+    assert cache.unrepr("1.5") == 1.5
+    assert cache.unrepr("'abc'") == 'abc'
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 2
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+def test_UnreprCache_copy_mutable():
+    cache = UnreprCache()
+    l0 = cache.unrepr("[1, [2, 3]]")
+    l0[1].append(4)
+    l1 = cache.unrepr("[1, [2, 3]]")
+    assert l1 == [1, [2, 3]]
+    assert l1 is not l0
+    assert cache.hits == 1
+
+def test_UnreprCache_globals_identity():
+    cache = UnreprCache()
+    gd0 = {'a': 1}
+    gd1 = {'a': 2}
+    assert cache.unrepr("a + 1", gd0) == 2
+    assert cache.unrepr("a + 1", gd1) == 3
+    assert cache.unrepr("a + 1", gd0) == 2
+    assert cache.hits == 1
+
+def test_UnreprCache_objects():
+    class Obj(object):
+        pass
+    gd = {'obj': Obj()}
+    cache = UnreprCache()
+    assert cache.unrepr("obj", gd) is gd['obj']
+    assert len(cache) == 0
+    assert cache.unrepr("obj", gd, share_objects=True) is gd['obj']
+    assert len(cache) == 1
+    assert cache.unrepr("obj", gd, share_objects=True) is gd['obj']
+    assert cache.hits == 1
+
+def test_UnreprCache_lru():
+    cache = UnreprCache(maxsize=2)
+    cache.unrepr("1")
+    cache.unrepr("2")
+    cache.unrepr("1")
+    cache.unrepr("3")
+    assert len(cache) == 2
+    cache.unrepr("1")
+    assert cache.hits == 2
+    cache.unrepr("2")
+    assert cache.misses == 4
+    cache.maxsize = 1
+    assert len(cache) == 1
+    cache.maxsize = 0
+    cache.unrepr("1")
+    assert len(cache) == 0
+
+def test_UnreprCache_error():
+    cache = UnreprCache()
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            cache.unrepr("1 << 2")
+    assert len(cache) == 0
+    assert cache.misses == 2
+
+def test_UnreprCache_threads():
+    cache = UnreprCache(maxsize=8)
+    strings = ["{}".format(i) for i in range(16)]
+    errors = []
+
+    def run():
+        for _ in range(50):
+            for string in strings:
+                if cache.unrepr(string) != int(string):
+                    errors.append(string)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert cache.hits + cache.misses == 4 * 50 * 16
+    assert len(cache) == 8
@@ -25,7 +25,8 @@ import pytest
 from common.fixtures import string_io
 
 from zirkon.schema import Schema
-from zirkon.config import ROOT, SECTION, Config
+from zirkon.config import ROOT, SECTION, Config, MacroCycleError
+from zirkon.toolbox.macro import MCall
 from zirkon.validator import Int, Float, Str
 from zirkon.utils import create_template_from_schema, replace_macros, \
     get_key, set_key, del_key
@@ -200,3 +201,28 @@ def test_del_key(string_io):
     [sub2]
         w = 40
 """
+
+def test_replace_macros_evaluates_once():
+    calls = []
+    def fun(value):
+        calls.append(value)
+        return value * 2
+    config = Config(defaults=True)
+    config['a'] = 1
+    config['b'] = MCall(fun, (ROOT['a'],))
+    config['sub'] = {'c': ROOT['b'] + ROOT['b']}
+    config.set_defaults(d=ROOT['b'] + ROOT['sub']['c'], sub={'e': SECTION['c'] * ROOT['b']})
+    replace_macros(config)
+    assert calls == [1]
+    config['a'] = 10
+    assert config.as_dict() == {'a': 10, 'b': 2, 'sub': {'c': 4, 'e': 8}, 'd': 6}
+    assert calls == [1]
+
+def test_replace_macros_cycle():
+    config = Config()
+    config['a'] = 1
+    config['x'] = ROOT['y'] + 1
+    config['y'] = ROOT['x'] + 1
+    with pytest.raises(MacroCycleError) as exc_info:
+        replace_macros(config)
+    assert str(exc_info.value) == "macro cycle: x -> y -> x"
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import pickle
+
+import pytest
+
+from common.fixtures import defaultsvalue, \
+                            dictionary, \
+                            simple_config_content, \
+                            simple_schema_content, \
+                            tmp_raw_file
+
+from zirkon.config import Config, ROOT, SECTION
+from zirkon.schema import Schema
+from zirkon.validator import Int, Str
+from zirkon.validator.error import MinValueError
+from zirkon.toolbox.serializer.zbin_serializer import ZBinSerializer
+
+@pytest.fixture
+def serializer():
+    return ZBinSerializer()
+
+def test_ZBinSerializer_to_from_string(simple_config_content, serializer):
+    serialization = serializer.to_string(simple_config_content)
+    assert isinstance(serialization, bytes)
+    obj = serializer.from_string(serialization=serialization)
+    assert obj == simple_config_content
+
+def test_ZBinSerializer_to_from_file(simple_config_content, serializer, tmp_raw_file):
+    serializer.to_file(obj=simple_config_content, filename=tmp_raw_file.name)
+    obj = serializer.from_file(filename=tmp_raw_file.name)
+    assert obj == simple_config_content
+
+_values = [
+    None, True, False, 0, 1, -1, 63, -64, 127, 128, -129, 2 ** 64, -(2 ** 100),
+    0.0, -0.0, 1.5, float('inf'), '', 'abc', 'àèìòù', b'', b'\x00\xff',
+    [], (), [1, 'a', [2.5, (None, True)]], (1, [], ()),
+    collections.OrderedDict([('z', 1), ('a', collections.OrderedDict())]),
+]
+
+@pytest.fixture(params=_values, ids=[repr(value) for value in _values])
+def value(request):
+    return request.param
+
+def test_ZBinSerializer_values(serializer, value):
+    obj = serializer.from_string(serializer.to_string({'key': value}))
+    assert obj['key'] == value
+    assert type(obj['key']) is type(value)
+    assert repr(obj['key']) == repr(value)
+
+def test_ZBinSerializer_order(serializer):
+    content = collections.OrderedDict([('b', 1), ('a', collections.OrderedDict([('y', 2), ('x', 3)])), ('c', 4)])
+    obj = serializer.from_string(serializer.to_string(content))
+    assert list(obj.keys()) == ['b', 'a', 'c']
+    assert list(obj['a'].keys()) == ['y', 'x']
+
+def test_ZBinSerializer_string_table(serializer):
+    content = collections.OrderedDict(('section_{}'.format(i), {'option_name': 'option_value'}) for i in range(100))
+    serialization = serializer.to_string(content)
+    assert serialization.count(b'option_name') == 1
+    assert serialization.count(b'option_value') == 1
+    assert len(serialization) < len(pickle.dumps(content, protocol=3))
+
+def test_ZBinSerializer_section_lazy_strings(serializer):
+    content = {'a': {'x': 'bad_string'}, 'sub_\u00e8': {'y': 'good'}}
+    serialization = serializer.to_string(content)
+    # strings outside the section are not decoded:
+    corrupted = serialization.replace(b'bad_string', b'bad_\xff\xfering')
+    assert serializer.section_from_string(corrupted, ['sub_\u00e8']) == {'y': 'good'}
+    with pytest.raises(ValueError):
+        serializer.from_string(corrupted)
+
+def test_ZBinSerializer_section(serializer):
+    content = {
+        'a': [1, 2, {'x': 1}],
+        'sub': {'x': 1, 'b': b'data', 'f': 1.5, 'n': None, 'deep': {'t': (1, 2)}},
+        'sub2': {'sub': {'y': 2}},
+    }
+    serialization = serializer.to_string(content)
+    assert serializer.section_from_string(serialization, ['sub']) == content['sub']
+    assert serializer.section_from_string(serialization, ['sub', 'deep']) == {'t': (1, 2)}
+    assert serializer.section_from_string(serialization, ['sub2', 'sub']) == {'y': 2}
+    assert serializer.section_from_string(serialization, []) == content
+    with pytest.raises(KeyError):
+        serializer.section_from_string(serialization, ['sub', 'x'])
+    with pytest.raises(KeyError):
+        serializer.section_from_string(serialization, ['sub3'])
+
+def test_ZBinSerializer_section_from_file(serializer, tmp_raw_file):
+    content = {'a': 1, 'sub': {'x': 1, 'deep': {'t': 'abc'}}}
+    serializer.to_file(obj=content, filename=tmp_raw_file.name)
+    assert serializer.section_from_file(tmp_raw_file.name, ['sub', 'deep']) == {'t': 'abc'}
+
+def test_ZBinSerializer_invalid(serializer):
+    with pytest.raises(ValueError) as exc_info:
+        serializer.from_string(b'ZBOX\x01' + bytes(8), filename='x.zbin')
+    assert str(exc_info.value) == "x.zbin: not a zbin serialization"
+    with pytest.raises(ValueError) as exc_info:
+        serializer.from_string(b'ZBIN\x09' + bytes(8))
+    assert str(exc_info.value) == "<string>: unsupported zbin version 9"
+
+def test_ZBinSerializer_truncated(serializer):
+    content = {'a': [1, 2, 3], 's': {'x': 'hello', 't': (1.5, b'xy', None, True)}}
+    serialization = serializer.to_string(content)
+    for size in range(len(serialization)):
+        with pytest.raises(ValueError):
+            serializer.from_string(serialization[:size])
+        with pytest.raises(ValueError):
+            serializer.section_from_string(serialization[:size], ['s'])
+    with pytest.raises(ValueError) as exc_info:
+        serializer.from_string(serialization[:-1], filename='x.zbin')
+    assert str(exc_info.value) == "x.zbin: truncated/corrupt zbin data"
+
+def test_ZBinSerializer_corrupted(serializer):
+    content = {'a': [1, 2, 3], 's': {'x': 'hello'}}
+    serialization = serializer.to_string(content)
+    # trailing garbage:
+    with pytest.raises(ValueError):
+        serializer.from_string(serialization + b'\x00')
+    # string table offset out of range:
+    with pytest.raises(ValueError):
+        serializer.from_string(serialization[:5] + bytes([255] * 8) + serialization[13:])
+    # list size exceeding the enclosing mapping:
+    index = 16
+    assert serialization[index] == 7
+    corrupted = bytearray(serialization)
+    corrupted[index + 1] += 1
+    with pytest.raises(ValueError):
+        serializer.from_string(bytes(corrupted))
+
+def test_ZBinSerializer_unsupported(serializer):
+    with pytest.raises(TypeError) as exc_info:
+        serializer.to_string({'a': {1, 2}})
+    assert str(exc_info.value) == "cannot serialize object of type set"
+    with pytest.raises(TypeError):
+        serializer.to_string({1: 2})
+    with pytest.raises(TypeError):
+        serializer.to_string([1, 2])
+
+def test_ZBinSerializer_config_macros():
+    config = Config()
+    config['a'] = 10
+    config['sub'] = {'b': ROOT['a'] + SECTION['c'] * 2, 'c': 3}
+    serialization = config.to_string(protocol='zbin')
+    config2 = Config.from_string(serialization, protocol='zbin')
+    assert config2['sub']['b'] == 16
+    macro = config2.as_dict(evaluate=False)['sub']['b']
+    assert macro.unparse() == config.as_dict(evaluate=False)['sub']['b'].unparse()
+
+def test_ZBinSerializer_schema_validators():
+    schema = Schema()
+    schema['a'] = Int(min=1, default=3)
+    schema['sub'] = {'s': Str(default='x'), 'i': Int(max=ROOT['a'])}
+    serialization = schema.to_string(protocol='zbin')
+    schema2 = Schema.from_string(serialization, protocol='zbin')
+    assert schema2 == schema
+    config = Config({'a': 0, 'sub': {'i': 2}})
+    validation = schema2.validate(config)
+    assert isinstance(validation['a'], MinValueError)
+    assert validation.to_string(protocol='zbin')
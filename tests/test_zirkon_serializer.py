@@ -14,7 +14,7 @@ from common.fixtures import simple_config_content, \
                             SIMPLE_CONFIG_ZIRKON_SERIALIZATION
 
 from zirkon.config import Config
-from zirkon.toolbox.serializer.zirkon_serializer import ZirkonSerializer
+from zirkon.toolbox.serializer.zirkon_serializer import ZirkonSerializer, LazyMapping
 
 @pytest.fixture
 def serializer():
@@ -85,3 +85,141 @@ def test_ZirkonSerializer(string, serializer):
     obj = serializer.from_string(string)
     string2 = serializer.to_string(obj=obj)
     assert string == string2
+
+class LineStream(object):
+    def __init__(self, serialization):
+        self.name = 'line_stream'
+        self.serialization = serialization
+        self.consumed = 0
+
+    def __iter__(self):
+        for line in self.serialization.splitlines(True):
+            self.consumed += 1
+            yield line
+
+    def read(self):
+        raise AssertionError("stream.read() called")
+
+def test_ZirkonSerializer_from_stream_lines(simple_config_content, serializer):
+    stream = LineStream(SIMPLE_CONFIG_ZIRKON_SERIALIZATION)
+    obj = serializer.from_stream(stream=stream)
+    assert obj == simple_config_content
+    assert stream.consumed == len(SIMPLE_CONFIG_ZIRKON_SERIALIZATION.splitlines())
+
+def test_ZirkonSerializer_from_stream_lines_error(serializer):
+    stream = LineStream("a = 1\n b = 2\nc = 3\nd = 4\n")
+    with pytest.raises(IndentationError) as exc_info:
+        serializer.from_stream(stream=stream)
+    assert str(exc_info.value) == "line 1@line_stream: unexpected indentation"
+    assert stream.consumed == 2
+
+class WriteCounter(object):
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+        return len(data)
+
+def test_ZirkonSerializer_to_stream_chunks(simple_config_content, serializer):
+    serializer.WRITE_BUFFER_SIZE = 20
+    stream = WriteCounter()
+    count = serializer.to_stream(obj=simple_config_content, stream=stream)
+    assert ''.join(stream.chunks) == SIMPLE_CONFIG_ZIRKON_SERIALIZATION
+    assert count == len(SIMPLE_CONFIG_ZIRKON_SERIALIZATION)
+    assert len(stream.chunks) > 1
+    assert all(chunk.endswith('\n') for chunk in stream.chunks)
+
+def test_ZirkonSerializer_to_stream_empty(serializer):
+    stream = WriteCounter()
+    assert serializer.to_stream(obj={}, stream=stream) == 0
+    assert serializer.to_string({}) == ''
+
+def _as_plain_dict(mapping):
+    return collections.OrderedDict(
+        (key, _as_plain_dict(value) if isinstance(value, collections.Mapping) else value)
+        for key, value in mapping.items())
+
+def test_ZirkonSerializer_lazy_from_string(string, serializer):
+    obj = serializer.lazy_from_string(string)
+    assert isinstance(obj, LazyMapping)
+    assert _as_plain_dict(obj) == serializer.from_string(string)
+
+def test_ZirkonSerializer_lazy_from_string_simple(simple_config_content, serializer):
+    obj = serializer.lazy_from_string(SIMPLE_CONFIG_ZIRKON_SERIALIZATION)
+    assert obj == simple_config_content
+
+def test_ZirkonSerializer_lazy_from_file(simple_config_content, serializer, tmp_text_file):
+    tmp_text_file.write(SIMPLE_CONFIG_ZIRKON_SERIALIZATION)
+    tmp_text_file.flush()
+    obj = serializer.lazy_from_file(filename=tmp_text_file.name)
+    assert obj == simple_config_content
+
+def test_ZirkonSerializer_lazy_sections(serializer):
+    obj = serializer.lazy_from_string(strings['c0'])
+    assert not obj.is_loaded()
+    assert list(obj.keys()) == ['a', 'b', 'c', 'x', 'f', 'xx', 'g', 'j', 'k', 'l']
+    assert obj.is_loaded()
+    assert not obj['c'].is_loaded()
+    assert not obj['g'].is_loaded()
+    assert obj['c']['e']['y'] == 10
+    assert obj['c'].is_loaded()
+    assert not obj['c']['d'].is_loaded()
+    assert not obj['g'].is_loaded()
+
+def test_ZirkonSerializer_lazy_unparsed_errors(serializer):
+    obj = serializer.lazy_from_string("""\
+a = 1
+[good]
+    x = 2
+[bad]
+    y = 3
+  z = 4
+""")
+    assert obj['good']['x'] == 2
+    with pytest.raises(IndentationError) as exc_info:
+        obj['bad']['y']
+    assert str(exc_info.value) == "line 5@<string>: unmatching indentation"
+
+@pytest.mark.parametrize("serialization, error_type, message", [
+    ("a = 1\n b = 2\nc = 3\n", IndentationError, "line 1@<string>: unexpected indentation"),
+    ("[a]\n    [b]\n        x = 1\n      y = 2\n", IndentationError, "line 3@<string>: unmatching indentation"),
+    ("a = 1\n[a\n", ValueError, "invalid line 1@<string>: unbalanced []"),
+    ("\n\na\n", ValueError, "unparsable line 2@<string>: 'a'"),
+])
+def test_ZirkonSerializer_lazy_errors(serializer, serialization, error_type, message):
+    with pytest.raises(error_type) as exc_info:
+        serializer.from_string(serialization)
+    assert str(exc_info.value) == message
+    with pytest.raises(error_type) as exc_info:
+        _as_plain_dict(serializer.lazy_from_string(serialization))
+    assert str(exc_info.value) == message
+
+def test_ZirkonSerializer_from_file_mmap(serializer, tmpdir, monkeypatch):
+    filename = os.path.join(tmpdir.strpath, 'x.zirkon')
+    with open(filename, 'wb') as f_stream:
+        f_stream.write("a = 'àè'\r\n[sub]\r\n    b = 1\r\n".encode('utf-8'))
+
+    def from_stream(*args, **kwargs):
+        raise AssertionError("from_stream() called")
+
+    monkeypatch.setattr(serializer, 'from_stream', from_stream)
+    obj = serializer.from_file(filename)
+    assert obj == {'a': 'àè', 'sub': {'b': 1}}
+    assert serializer.lazy_from_file(filename) == obj
+
+def test_ZirkonSerializer_from_file_empty(serializer, tmpdir):
+    filename = os.path.join(tmpdir.strpath, 'x.zirkon')
+    with open(filename, 'wb'):
+        pass
+    assert serializer.from_file(filename) == {}
+    assert serializer.lazy_from_file(filename) == {}
+    with serializer.mapped_file(filename) as buffer:
+        assert buffer == b''
+
+def test_ZirkonSerializer_to_file_utf8(serializer, tmpdir):
+    filename = os.path.join(tmpdir.strpath, 'x.zirkon')
+    serializer.to_file({'a': 'àè'}, filename)
+    with open(filename, 'rb') as f_stream:
+        assert f_stream.read() == "a = 'àè'\n".encode('utf-8')
+    assert serializer.from_file(filename) == {'a': 'àè'}
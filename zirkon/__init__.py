@@ -28,10 +28,11 @@ __all__ = [
     'Schema',
     'Validation',
     'ConfigValidationError',
+    'MacroCycleError',
     'SECTION',
     'ROOT',
 ]
 
-from .config import Config, ConfigValidationError, SECTION, ROOT
+from .config import Config, ConfigValidationError, MacroCycleError, SECTION, ROOT
 from .schema import Schema
 from .validation import Validation
@@ -56,6 +56,7 @@ __license__ = 'Apache License Version 2.0'
 __all__ = [
     'Config',
     'ConfigValidationError',
+    'MacroCycleError',
     'SECTION',
     'ROOT',
 ]
@@ -64,6 +65,7 @@ __all__ = [
 from .config_base import ConfigBase, ConfigValidationError
 from .config_section import ConfigSection
 from .macros import ROOT, SECTION
+from .section import MacroCycleError
 
 
 class Config(ConfigBase, ConfigSection):  # pylint: disable=too-many-ancestors
@@ -79,6 +81,15 @@ class Config(ConfigBase, ConfigSection):  # pylint: disable=too-many-ancestors
            enables defaults
        macros: bool, optional
            enables macros
+       trusted_reads: bool, optional
+           if True, option values are type-checked only when they are set;
+           reading a non-macro option is a plain dictionary lookup
+       cache_macros: bool, optional
+           if True, the value of each macro option is cached until one of the
+           options it reads through ROOT/SECTION is changed
+       incremental_validation: bool, optional
+           if True, self validation checks only the options changed since the
+           last successful self validation, and the options depending on them
        schema: |Schema|, optional
            the validation schema
        validate: bool, optional
@@ -86,13 +97,19 @@ class Config(ConfigBase, ConfigSection):  # pylint: disable=too-many-ancestors
     """
 
     def __init__(self, init=None, *, dictionary=None, defaults=True,
-                 macros=True, schema=None, validate=True):
+                 macros=True, trusted_reads=False, cache_macros=False,
+                 schema=None, validate=True, incremental_validation=False):
         super().__init__(dictionary=dictionary, init=init, defaults=defaults,
-                         macros=macros, schema=schema, validate=validate)
+                         macros=macros, trusted_reads=trusted_reads,
+                         cache_macros=cache_macros, schema=schema, validate=validate,
+                         incremental_validation=incremental_validation)
 
     @ConfigSection.defaults.setter
     def defaults(self, value):  # pylint: disable=arguments-differ
         """defaults setter"""
         self._set_defaults(value)
+        self._clear_subsection_cache()
+        self._invalidate_macros()
+        self._record_change()
 
 
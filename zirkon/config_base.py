@@ -30,8 +30,9 @@ __all__ = [
 
 from .section import Section
 from .toolbox.serializer import Serializer
-from .toolbox.unrepr import unrepr
+from .toolbox.unrepr import unrepr, UNREPR_CACHE
 from .macros import ROOT, SECTION
+from .parse_cache import load_file
 
 
 class ConfigValidationError(Exception):
@@ -60,15 +61,19 @@ class ConfigBase(Section):
              self validate during initialization;
          macros: bool, optional
              enables macros (defaults to True);
+         incremental_validation: bool, optional
+             if True, self validation checks only the options changed since
+             the last successful self validation (defaults to False)
          \*\*section_options:
              keyword arguments to be passed to the Section contructor
     """
 
     def __init__(self, init=None, *, dictionary=None, schema=None, validate=True,
-                 macros=True, **section_options):
+                 macros=True, incremental_validation=False, **section_options):
         super().__init__(dictionary=dictionary, init=init,
                          macros=macros, **section_options)
         self._schema = None
+        self._incremental_validation = bool(incremental_validation)
         self.set_schema(schema=schema, validate=validate)
 
     @property
@@ -81,6 +86,28 @@ class ConfigBase(Section):
         """Sets the schema attribute"""
         return self.set_schema(schema)
 
+    @property
+    def incremental_validation(self):
+        """Returns True if self validation is incremental
+
+        Returns
+        -------
+        bool
+            enabled/disabled
+        """
+        return self._incremental_validation
+
+    @incremental_validation.setter
+    def incremental_validation(self, value):
+        """Enables/disables incremental self validation
+
+        Parameters
+        ----------
+        value: bool
+            enabled/disabled
+        """
+        self._incremental_validation = bool(value)
+
     def set_schema(self, schema, *, validate=True):
         """Sets the validation schema
 
@@ -121,7 +148,8 @@ class ConfigBase(Section):
                If 'raise_on_errors' is True, it contains at most one error.
         """
         if self._schema is not None:
-            validation = self._schema.validate(self, raise_on_error=False)
+            validation = self._schema.validate(self, raise_on_error=False,
+                                               incremental=self._incremental_validation)
             if raise_on_error and validation:
                 raise ConfigValidationError(validation=validation)
             else:
@@ -134,7 +162,9 @@ class ConfigBase(Section):
            Parameters
            ----------
            protocol: str
-               a valid protocol name
+               a valid protocol name, or a configured serializer instance
+               (for instance JSONSerializer(compact=True)), which is returned
+               as is
 
            Raises
            ------
@@ -146,6 +176,8 @@ class ConfigBase(Section):
            zirkon.toolbox.serializer.Serializer
                the serializer instance.
         """
+        if isinstance(protocol, Serializer):
+            return protocol
         serializer_class = Serializer.get_class(protocol)
         if serializer_class is None:
             raise ValueError("serialization protocol {} not available [{}]".format(
@@ -176,7 +208,7 @@ class ConfigBase(Section):
         """
         self.self_validate(raise_on_error=True)
         serializer_instance = self.get_serializer(protocol)
-        obj = self.as_dict(defaults=defaults, evaluate=False)
+        obj = self.serialization_object(serializer_instance, defaults=defaults)
         return serializer_instance.to_string(obj)
 
     def to_stream(self, stream, protocol, *, defaults=False):
@@ -199,7 +231,7 @@ class ConfigBase(Section):
         """
         self.self_validate(raise_on_error=True)
         serializer_instance = self.get_serializer(protocol)
-        obj = self.as_dict(defaults=defaults, evaluate=False)
+        obj = self.serialization_object(serializer_instance, defaults=defaults)
         serializer_instance.to_stream(obj, stream)
 
     def to_file(self, filename, protocol, *, defaults=False):
@@ -222,7 +254,7 @@ class ConfigBase(Section):
         """
         self.self_validate(raise_on_error=True)
         serializer_instance = self.get_serializer(protocol)
-        obj = self.as_dict(defaults=defaults, evaluate=False)
+        obj = self.serialization_object(serializer_instance, defaults=defaults)
         serializer_instance.to_file(obj, filename)
 
     def dump(self, stream=None, protocol="zirkon", *, defaults=False):
@@ -231,7 +263,8 @@ class ConfigBase(Section):
 
     @classmethod
     def from_file(cls, filename, protocol, *,
-                  dictionary=None, schema=None, validate=True, **config_args):
+                  dictionary=None, schema=None, validate=True, parse_cache=None, lazy=False,
+                  **config_args):
         r"""Deserializes from file 'filename' according to 'protocol'.
 
              Parameters
@@ -246,17 +279,36 @@ class ConfigBase(Section):
                  the validation schema (defaults to None)
              validate: bool, optional
                  if True self-validate on contruction (defaults to True)
+             parse_cache: |ParseCache|, optional
+                 the parse cache (a ParseCache, a cache directory, or False
+                 to disable caching); defaults to the default parse cache
+             lazy: bool, optional
+                 if True, the parsed content is used as internal dictionary,
+                 and sections are parsed only when they are first accessed
+                 (only for protocols supporting lazy loading, such as
+                 'zirkon'); the parse cache is not used (defaults to False)
              \*\*config_args
                  keyword arguments to be passed to the constructor
 
+             Raises
+             ------
+             ValueError
+                 lazy loading with an explicit dictionary
+
              Returns
              -------
              cls
                  the deserialized object
         """
         serializer_instance = cls.get_serializer(protocol)
-        content = serializer_instance.from_file(filename)
-        instance = cls(init=content, dictionary=dictionary, **config_args)
+        if lazy:
+            if dictionary is not None:
+                raise ValueError("lazy loading cannot be used with an explicit dictionary")
+            content = serializer_instance.lazy_from_file(filename)
+            instance = cls(dictionary=content, **config_args)
+        else:
+            content = load_file(serializer_instance, filename, parse_cache=parse_cache)
+            instance = cls(init=content, dictionary=dictionary, **config_args)
         instance.set_schema(schema=schema, validate=validate)
         return instance
 
@@ -323,7 +375,7 @@ class ConfigBase(Section):
         instance.set_schema(schema=schema, validate=validate)
         return instance
 
-    def read(self, filename, protocol):
+    def read(self, filename, protocol, *, parse_cache=None):
         """Reads from file 'filename' according to 'protocol'. The initial content is cleared.
 
            Parameters
@@ -332,16 +384,20 @@ class ConfigBase(Section):
                a file name
            protocol: str
                a valid protocol name
+           parse_cache: |ParseCache|, optional
+               the parse cache (a ParseCache, a cache directory, or False
+               to disable caching); defaults to the default parse cache
 
            Raises
            ------
            |OptionValidationError|
                option validation error
         """
-        self.clear()
-        serializer_instance = self.get_serializer(protocol)
-        content = serializer_instance.from_file(filename)
-        self.update(content)
+        with self.batch():
+            self.clear()
+            serializer_instance = self.get_serializer(protocol)
+            content = load_file(serializer_instance, filename, parse_cache=parse_cache)
+            self.update(content)
         self.self_validate(raise_on_error=True)
 
     def write(self, filename, protocol):
@@ -372,25 +428,62 @@ def _setup_codecs():
     """_setup_codecs()
        Setup codecs for validators.
     """
+    def _macro_encode(macro_object):
+        """Encodes a Macro object to json/zbin.
+
+           Parameters
+           ----------
+           macro_object: Macro
+               the macro object
+
+           Returns
+           -------
+           dict
+               the encoded dictionary
+        """
+        return {'macro_expression': macro_object.unparse()}
+
+    def _macro_decode(macro_class_name, arguments):
+        """Decodes a Macro object from JSON.
+
+           Parameters
+           ----------
+           macro_class_name: str
+               the macro class name
+           arguments: dict
+               the encoded dict
+
+           Raises
+           ------
+           NameError
+               class not found
+
+           Returns
+           -------
+           Macro
+               the decoded object
+        """
+        macro_class = find_subclass(Macro, macro_class_name, include_self=True)
+        if macro_class is None:
+            raise NameError("undefined Macro class {}".format(macro_class_name))
+        return eval(arguments['macro_expression'], {'ROOT': ROOT, 'SECTION': SECTION})  # pylint: disable=eval-used
+
     _json_serializer_module = getattr(serializer, 'json_serializer', None)
     if _json_serializer_module is not None:
-        def _macro_encode(macro_object):
-            """Encodes a Macro object to json.
-
-               Parameters
-               ----------
-               macro_object: Macro
-                   the macro object
+        _json_serializer_module.JSONSerializer.codec_catalog().add_codec(
+            class_type=Macro,
+            encode=_macro_encode,
+            decode=_macro_decode,
+        )
 
-               Returns
-               -------
-               dict
-                   the encoded dictionary
-            """
-            return {'macro_expression': macro_object.unparse()}
+    _zbin_serializer_module = getattr(serializer, 'zbin_serializer', None)
+    if _zbin_serializer_module is not None:
+        macro_globals_d = {'SECTION': SECTION, 'ROOT': ROOT}
 
-        def _macro_decode(macro_class_name, arguments):
-            """Decodes a Macro object from JSON.
+        def _macro_zbin_decode(macro_class_name, arguments):  # pylint: disable=unused-argument
+            """Decodes a Macro object from zbin. The macro expression is
+               parsed by unrepr, as for text serializers, so that loading
+               a zbin file never evaluates arbitrary code.
 
                Parameters
                ----------
@@ -399,29 +492,23 @@ def _setup_codecs():
                arguments: dict
                    the encoded dict
 
-               Raises
-               ------
-               NameError
-                   class not found
-
                Returns
                -------
                Macro
                    the decoded object
             """
-            macro_class = find_subclass(Macro, macro_class_name, include_self=True)
-            if macro_class is None:
-                raise NameError("undefined Macro class {}".format(macro_class_name))
-            return eval(arguments['macro_expression'], {'ROOT': ROOT, 'SECTION': SECTION})  # pylint: disable=eval-used
+            return unrepr(arguments['macro_expression'], macro_globals_d)
 
-        _json_serializer_module.JSONSerializer.codec_catalog().add_codec(
+        _zbin_serializer_module.ZBinSerializer.codec_catalog().add_codec(
             class_type=Macro,
             encode=_macro_encode,
-            decode=_macro_decode,
+            decode=_macro_zbin_decode,
         )
 
     _text_serializer_module = getattr(serializer, 'text_serializer', None)
     if _text_serializer_module is not None:
+        str_globals_d = {'SECTION': SECTION, 'ROOT': ROOT}
+
         def _str_text_encode(str_object):
             """Encodes a string to configobj/zirkon.
 
@@ -451,7 +538,7 @@ def _setup_codecs():
                -------
                str: the decoded string
             """
-            return unrepr(repr_data, {'SECTION': SECTION, 'ROOT': ROOT})
+            return UNREPR_CACHE.unrepr(repr_data, str_globals_d)
 
         _text_serializer_module.TextSerializer.codec_catalog().add_codec(
             class_type=str,
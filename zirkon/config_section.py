@@ -65,15 +65,21 @@ class ConfigSection(Section):
            enables macros
        defaults: bool, optional
            enables defaults
+       trusted_reads: bool, optional
+           if True, option values are type-checked only when they are set
+       cache_macros: bool, optional
+           if True, the values of macro options are cached
     """
     SUPPORTED_SEQUENCE_TYPES = (list, tuple)
     SUPPORTED_SCALAR_TYPES = (int, float, bool, str, type(None))
 
     def __init__(self, init=None, *, dictionary=None, parent=None, name=None,
-                 defaults=True, macros=True):
+                 defaults=True, macros=True, trusted_reads=False, cache_macros=False):
+        self._trusted_reads = bool(trusted_reads)
         self._set_defaults(defaults)
         super().__init__(init=init, dictionary=dictionary, parent=parent,
-                         name=name, macros=macros)
+                         name=name, macros=macros, trusted_reads=trusted_reads,
+                         cache_macros=cache_macros)
 
     def _set_defaults(self, value):
         """Set defaults attribute
@@ -93,11 +99,11 @@ class ConfigSection(Section):
         elif isinstance(value, DefaultsSection):
             defaults = value
         elif value is True:
-            defaults = DefaultsSection()
+            defaults = DefaultsSection(trusted_reads=self._trusted_reads)
         elif isinstance(value, Section):
-            defaults = DefaultsSection(dictionary=value.dictionary)
+            defaults = DefaultsSection(dictionary=value.dictionary, trusted_reads=self._trusted_reads)
         elif isinstance(value, collections.Mapping):
-            defaults = DefaultsSection(dictionary=value)
+            defaults = DefaultsSection(dictionary=value, trusted_reads=self._trusted_reads)
         else:
             raise TypeError("invalid defaults object of type {}: not a Section".format(
                 type(value).__name__))
@@ -119,6 +125,19 @@ class ConfigSection(Section):
     def _subsection_class(cls):
         return ConfigSection
 
+    def _macro_cache_stamp(self):
+        # defaults changes are not tracked option by option:
+        if self._has_defaults:
+            return self._defaults.root.generation
+        else:
+            return None
+
+    def _path_dictionaries(self):
+        if self._has_defaults:
+            return self.dictionary, self._defaults.dictionary
+        else:
+            return self.dictionary, None
+
     def _subsection(self, section_name, dictionary):
         if self._has_defaults:
             with self._defaults.referencing(self):
@@ -129,9 +148,20 @@ class ConfigSection(Section):
         else:
             subdefaults = None
         return self._subsection_class()(dictionary=dictionary, parent=self,
-                                        macros=self.macros,
+                                        macros=self.macros, trusted_reads=self.trusted_reads,
                                         name=section_name, defaults=subdefaults)
 
+    def _cached_subsection(self, section_name, dictionary):
+        subsection = super()._cached_subsection(section_name=section_name, dictionary=dictionary)
+        if self._has_defaults:
+            subdefaults = subsection.defaults
+            if subdefaults is None or \
+                    subdefaults.dictionary is not self._defaults.dictionary.get(section_name, None):
+                # the defaults subsection has been replaced:
+                self._clear_subsection_cache(section_name)
+                subsection = super()._cached_subsection(section_name=section_name, dictionary=dictionary)
+        return subsection
+
     def set_defaults(self, **kwargs):
         r"""Set default options and sections
 
@@ -190,6 +220,7 @@ class ConfigSection(Section):
             return super().__getitem__(key)
         else:
             if self._has_defaults and key in self._defaults:
+                self._record_read(key)
                 with self._defaults.referencing(self):
                     value = self._defaults[key]
                 if isinstance(value, collections.Mapping):
@@ -214,15 +245,32 @@ class ConfigSection(Section):
                 with self._defaults.referencing(self):
                     self._defaults.update(dictionary.defaults)
 
+    def _iter_serialization_items(self, defaults):
+        if not (defaults and self._has_defaults):
+            yield from super()._iter_serialization_items(defaults=defaults)
+            return
+        # same items and order as as_dict(): the default keys (possibly
+        # overridden), then the other keys
+        dictionary = self._dictionary
+        defaults_dictionary = self._defaults.dictionary
+        for key, value in self._defaults.serialization_view().items():
+            if key in dictionary:
+                value = self._serialization_value(key, dictionary[key], defaults)
+            yield key, value
+        for key, value in dictionary.items():
+            if key not in defaults_dictionary:
+                yield key, self._serialization_value(key, value, defaults)
+
     def as_dict(self, *, dict_class=collections.OrderedDict, defaults=True, evaluate=True):
-        if defaults and self._has_defaults:
-            with self._defaults.referencing(self):
-                defaults_dict = self._defaults.as_dict(dict_class=dict_class,
-                                                       evaluate=evaluate)
-        else:
-            defaults_dict = None
-        self_dict = super().as_dict(dict_class=dict_class, defaults=defaults,
-                                    evaluate=evaluate)
+        with self.caching_macros():
+            if defaults and self._has_defaults:
+                with self._defaults.referencing(self):
+                    defaults_dict = self._defaults.as_dict(dict_class=dict_class,
+                                                           evaluate=evaluate)
+            else:
+                defaults_dict = None
+            self_dict = super().as_dict(dict_class=dict_class, defaults=defaults,
+                                        evaluate=evaluate)
         if defaults_dict is None:
             return self_dict
         else:
@@ -62,14 +62,16 @@ class DefaultsSection(Section):
            the Section name
        macros: bool, optional
            enables macros
+       trusted_reads: bool, optional
+           if True, option values are type-checked only when they are set
        reference_root: Section, optional
            the reference root
     """
     def __init__(self, init=None, *, dictionary=None, parent=None, name=None,
-                 macros=True, reference_root=None):
+                 macros=True, trusted_reads=False, reference_root=None):
         self._reference_root = reference_root
         super().__init__(init=init, dictionary=dictionary, parent=parent,
-                         macros=macros, name=name)
+                         macros=macros, trusted_reads=trusted_reads, name=name)
 
     @property
     def reference_root(self):
@@ -88,9 +90,15 @@ class DefaultsSection(Section):
 
     def _subsection(self, section_name, dictionary):
         return self._subsection_class()(dictionary=dictionary, parent=self,
-                                        macros=self.macros,
+                                        macros=self.macros, trusted_reads=self.trusted_reads,
                                         name=section_name, reference_root=self.get_reference_root())
 
+    def _cached_subsection(self, section_name, dictionary):
+        subsection = super()._cached_subsection(section_name=section_name, dictionary=dictionary)
+        # the reference root can be changed by referencing():
+        subsection._reference_root = self.get_reference_root()  # pylint: disable=protected-access
+        return subsection
+
     @contextlib.contextmanager
     def referencing(self, section):
         """Context manager to temporarily switch reference_root to section.
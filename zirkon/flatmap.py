@@ -28,6 +28,7 @@ __all__ = [
 ]
 
 import collections
+import contextlib
 
 from .toolbox.identifier import is_valid_identifier
 
@@ -54,6 +55,17 @@ class FlatMap(collections.MutableMapping):
        FlatMap(a=10, c=30)
        >>>
 
+       The keys of each submap are kept in a prefix index, which is shared by
+       the flatmap and all its submaps; so submap iteration, length and
+       clear cost O(submap size). The index is built when it is first needed;
+       after that, the internal dictionary must be changed only through
+       the flatmap or its submaps. If the dictionary provides a
+       'prefix_index(dot)' method (for instance SQLiteDictionary), the index
+       is provided by the dictionary itself.
+
+       Inside the 'batch()' context, writes are buffered in memory and
+       written to the dictionary on exit.
+
        Parameters
        ----------
        dictionary: Mapping, optional
@@ -69,8 +81,9 @@ class FlatMap(collections.MutableMapping):
     def __init__(self, dictionary, *, init=None, prefix=''):
         if dictionary is None:
             dictionary = self.dictionary_factory()
-        self._dictionary = dictionary
+        self._storage = _Storage(dictionary)
         self._prefix = prefix
+        self._submaps = {}
         if init:
             self.update(init)
 
@@ -83,7 +96,7 @@ class FlatMap(collections.MutableMapping):
         |Mapping|
             the flattened dictionary
         """
-        return self._dictionary
+        return self._storage.dictionary
 
     @property
     def prefix(self):
@@ -96,6 +109,39 @@ class FlatMap(collections.MutableMapping):
         """
         return self._prefix
 
+    @contextlib.contextmanager
+    def batch(self):
+        """Context manager buffering all the writes and deletions (of the flatmap
+           and of all its submaps) in memory; reads see the buffered changes.
+           On exit, the changes are written to the dictionary in one pass, and
+           the dictionary is synced if it has a 'sync()' method (shelve, dbm).
+           If the dictionary provides its own 'batch()' method
+           (for instance SQLiteDictionary), it is used instead.
+           Nested batches are merged into the outermost one.
+
+           Yields
+           ------
+           self
+               the flatmap itself
+        """
+        storage = self._storage
+        backing = storage.backing
+        if storage.dictionary is not backing:
+            yield self
+        elif hasattr(backing, 'batch'):
+            with backing.batch():
+                yield self
+        else:
+            storage.dictionary = _WriteBackDictionary(backing)
+            try:
+                yield self
+            finally:
+                write_back = storage.dictionary
+                storage.dictionary = backing
+                write_back.flush()
+                if hasattr(backing, 'sync'):
+                    backing.sync()
+
     @classmethod
     def dictionary_factory(cls):
         """Factory for new dictionaries.
@@ -210,19 +256,32 @@ class FlatMap(collections.MutableMapping):
         else:
             return None
 
-    def _iter_keys(self):
-        """Iterates over (abs_key, rel_key)
+    def _get_index(self):
+        """Returns the prefix index, building it if needed.
+
+           Returns
+           -------
+           _PrefixIndex
+               the prefix index
+        """
+        storage = self._storage
+        if storage.index is None:
+            prefix_index = getattr(storage.backing, 'prefix_index', None)
+            if prefix_index is not None:
+                storage.index = prefix_index(self.DOT)
+            else:
+                storage.index = _PrefixIndex(self.DOT, storage.dictionary.keys())
+        return storage.index
+
+    def _iter_rel_keys(self):
+        """Iterates over the submap's relative keys (submap names end with DOT).
 
            Yields
            ------
-           tuple
-               a 2-tuple containing (absolute key, relative key)
+           str
+               the relative key
         """
-        for abs_key in self._dictionary.keys():
-            if abs_key.startswith(self._prefix):
-                rel_key = abs_key[len(self._prefix):]
-                if rel_key:
-                    yield abs_key, rel_key
+        yield from self._get_index().children(self._prefix)
 
     @classmethod
     def submap_class(cls):
@@ -236,7 +295,9 @@ class FlatMap(collections.MutableMapping):
         return FlatMap
 
     def submap(self, prefix):
-        """Return a submap with a given prefix.
+        """Return a submap with a given prefix. Submaps are stateless views
+           on the same dictionary, so they are cached by prefix (until the
+           submap is removed).
 
            Parameters
            ----------
@@ -248,46 +309,58 @@ class FlatMap(collections.MutableMapping):
            FlatMap
                the submap instance
         """
-        return self.submap_class()(dictionary=self._dictionary, prefix=prefix)
+        submap = self._submaps.get(prefix, None)
+        if submap is None:
+            submap = self.submap_class()(dictionary=self._storage.dictionary, prefix=prefix)
+            submap._storage = self._storage  # pylint: disable=protected-access
+            self._submaps[prefix] = submap
+        return submap
 
     def __getitem__(self, key):
+        dictionary = self._storage.dictionary
         abs_key = self.get_abs_key(key)
-        if abs_key in self._dictionary:
-            return self._dictionary[abs_key]
+        if abs_key in dictionary:
+            return dictionary[abs_key]
         else:
             submap_prefix = self.get_submap_prefix(abs_key)
-            if submap_prefix in self._dictionary:
+            if submap_prefix in dictionary:
                 return self.submap(prefix=submap_prefix)
         raise KeyError("undefined key {}{}".format(self._prefix, key))
 
     def __setitem__(self, key, value):
+        dictionary = self._storage.dictionary
         abs_key = self.get_abs_key(key)
         submap_prefix = self.get_submap_prefix(abs_key)
         if isinstance(value, collections.Mapping):
-            if abs_key in self._dictionary:
+            if abs_key in dictionary:
                 raise ValueError("cannot replace key {}{} with submap".format(self._prefix, key))
-            if submap_prefix in self._dictionary:
+            if submap_prefix in dictionary:
                 # clear all submap's keys
                 self[key].clear()
             submap = self.submap(prefix=submap_prefix)
-            self._dictionary[submap_prefix] = self.SUBMAP_PLACEHOLDER
+            dictionary[submap_prefix] = self.SUBMAP_PLACEHOLDER
+            self._get_index().add(submap_prefix)
             for sub_key, sub_value in value.items():
                 submap[sub_key] = sub_value
         else:
-            if submap_prefix in self._dictionary:
+            if submap_prefix in dictionary:
                 raise ValueError("cannot replace submap {}{} with key".format(self._prefix, key))
-            self._dictionary[abs_key] = value
+            dictionary[abs_key] = value
+            self._get_index().add(abs_key)
 
     def __delitem__(self, key):
+        dictionary = self._storage.dictionary
         abs_key = self.get_abs_key(key)
-        if abs_key in self._dictionary:
-            del self._dictionary[abs_key]
+        if abs_key in dictionary:
+            del dictionary[abs_key]
+            self._get_index().remove(abs_key)
             return
         submap_prefix = self.get_submap_prefix(abs_key)
-        if submap_prefix in self._dictionary:
-            submap = self[key]
-            submap.clear()
-            del self._dictionary[submap.prefix]
+        if submap_prefix in dictionary:
+            self.submap(prefix=submap_prefix).clear()
+            del dictionary[submap_prefix]
+            self._get_index().remove(submap_prefix)
+            self._submaps.pop(submap_prefix, None)
             return
         raise KeyError(self._prefix + key, "missing key/submap{}{}".format(self._prefix, key))
 
@@ -304,50 +377,56 @@ class FlatMap(collections.MutableMapping):
            bool
                True if key is in the flatmap
         """
+        dictionary = self._storage.dictionary
         abs_key = self.get_abs_key(key)
-        if abs_key in self._dictionary:
+        if abs_key in dictionary:
             return True
         submap_prefix = self.get_submap_prefix(abs_key)
-        if submap_prefix in self._dictionary:
+        if submap_prefix in dictionary:
             return True
         return False
 
     def clear(self):
         """Clears all the dictionary content.
         """
-        for abs_key, _ in self._iter_keys():
-            if len(abs_key) > len(self._prefix):
-                del self._dictionary[abs_key]
+        dictionary = self._storage.dictionary
+        index = self._get_index()
+        for rel_key in list(index.children(self._prefix)):
+            abs_key = self._prefix + rel_key
+            if self.get_submap_name(rel_key) is not None:
+                self.submap(prefix=abs_key).clear()
+                self._submaps.pop(abs_key, None)
+            del dictionary[abs_key]
+            index.remove(abs_key)
 
     def get(self, key, default=None):
+        dictionary = self._storage.dictionary
         abs_key = self.get_abs_key(key)
-        if abs_key in self._dictionary:
-            return self._dictionary[abs_key]
+        if abs_key in dictionary:
+            return dictionary[abs_key]
         else:
             submap_prefix = self.get_submap_prefix(abs_key)
-            if submap_prefix in self._dictionary:
+            if submap_prefix in dictionary:
                 return self.submap(prefix=submap_prefix)
         return default
 
     def __contains__(self, key):
+        dictionary = self._storage.dictionary
         abs_key = self.get_abs_key(key)
-        return abs_key in self._dictionary or self.get_submap_prefix(abs_key) in self._dictionary
+        return abs_key in dictionary or self.get_submap_prefix(abs_key) in dictionary
 
     def __len__(self):
-        count = 0
-        for _, rel_key in self._iter_keys():
-            if self.nesting_level(rel_key) == 0:
-                count += 1
-        return count
+        return len(self._get_index().children(self._prefix))
 
     def items(self):
-        for abs_key, rel_key in self._iter_keys():
-            if self.nesting_level(rel_key) == 0:
-                submap_name = self.get_submap_name(rel_key)
-                if submap_name is not None:
-                    yield submap_name, self.submap(prefix=abs_key)
-                else:
-                    yield rel_key, self._dictionary[abs_key]
+        dictionary = self._storage.dictionary
+        for rel_key in self._iter_rel_keys():
+            abs_key = self._prefix + rel_key
+            submap_name = self.get_submap_name(rel_key)
+            if submap_name is not None:
+                yield submap_name, self.submap(prefix=abs_key)
+            else:
+                yield rel_key, dictionary[abs_key]
 
     def keys(self):
         for rel_key, _ in self.items():
@@ -364,10 +443,11 @@ class FlatMap(collections.MutableMapping):
     def copy(self):
         """Returns a deep copy of the FlatMap instance.
         """
-        if hasattr(self._dictionary, 'copy'):
-            return self.__class__(dictionary=self._dictionary.copy())
+        dictionary = self._storage.dictionary
+        if hasattr(dictionary, 'copy'):
+            return self.__class__(dictionary=dictionary.copy())
         else:
-            return self.__class__(self.dictionary_factory(), init=self._dictionary)
+            return self.__class__(self.dictionary_factory(), init=dictionary)
 
     def as_dict(self, *, dict_class=collections.OrderedDict):
         """Returns a dict with all the flatmap's content
@@ -401,7 +481,6 @@ class FlatMap(collections.MutableMapping):
             \*\*kwargs: |Mapping|
                 additional key-value items
         """
-        print(dictionary, kwargs)
         if dictionary:
             if isinstance(dictionary, collections.Mapping):
                 iterable = dictionary.items()
@@ -413,7 +492,7 @@ class FlatMap(collections.MutableMapping):
             self[key] = value
 
     def __repr__(self):
-        return "{}(dictionary={!r}, prefix={!r})".format(self.__class__.__name__, self._dictionary, self._prefix)
+        return "{}(dictionary={!r}, prefix={!r})".format(self.__class__.__name__, self.dictionary, self._prefix)
 
     def __str__(self):
         map_data = []
@@ -428,7 +507,7 @@ class FlatMap(collections.MutableMapping):
 
     def __eq__(self, dictionary):
         submap_class = self.submap_class()
-        if isinstance(dictionary, submap_class) and dictionary.dictionary is self._dictionary:
+        if isinstance(dictionary, submap_class) and dictionary.dictionary is self.dictionary:
             return dictionary.prefix == self._prefix
         else:
             # compare self vs dictionary
@@ -446,6 +525,160 @@ class FlatMap(collections.MutableMapping):
             return True
 
     def __bool__(self):
-        for _ in self._iter_keys():
-            return True
-        return False
+        return bool(self._get_index().children(self._prefix))
+
+
+class _Storage(object):  # pylint: disable=too-few-public-methods
+    """Storage shared by a FlatMap and all its submaps: the backing
+       dictionary, the dictionary currently used (the backing dictionary, or
+       a write-back buffer during batches) and the prefix index.
+
+       Parameters
+       ----------
+       dictionary: Mapping
+           the backing dictionary
+    """
+    def __init__(self, dictionary):
+        self.backing = dictionary
+        self.dictionary = dictionary
+        self.index = None
+
+
+_MISSING = object()
+_DELETED = object()
+
+
+class _WriteBackDictionary(collections.MutableMapping):
+    """Buffers the changes to a dictionary until 'flush()' is called.
+
+       Parameters
+       ----------
+       backing: Mapping
+           the backing dictionary
+    """
+    def __init__(self, backing):
+        self._backing = backing
+        self._pending = collections.OrderedDict()
+
+    def __getitem__(self, key):
+        value = self._pending.get(key, _MISSING)
+        if value is _MISSING:
+            return self._backing[key]
+        elif value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        value = self._pending.get(key, _MISSING)
+        if value is _MISSING:
+            return key in self._backing
+        return value is not _DELETED
+
+    def __setitem__(self, key, value):
+        self._pending[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._pending[key] = _DELETED
+
+    def __iter__(self):
+        for key in self._backing.keys():
+            if self._pending.get(key, _MISSING) is not _DELETED:
+                yield key
+        for key, value in self._pending.items():
+            if value is not _DELETED and key not in self._backing:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def flush(self):
+        """Writes the buffered changes to the backing dictionary."""
+        backing = self._backing
+        for key, value in self._pending.items():
+            if value is _DELETED:
+                if key in backing:
+                    del backing[key]
+            else:
+                backing[key] = value
+        self._pending.clear()
+
+
+class _PrefixIndex(object):
+    """Index of the keys of a flattened dictionary: for each submap prefix,
+       it stores the relative keys of the submap items, in insertion order.
+       Submap keys end with 'dot'.
+
+       Parameters
+       ----------
+       dot: str
+           the separator
+       abs_keys: iterable
+           the initial absolute keys
+    """
+    def __init__(self, dot, abs_keys=()):
+        self._dot = dot
+        self._children = {'': collections.OrderedDict()}
+        for abs_key in abs_keys:
+            self.add(abs_key)
+
+    def _split(self, abs_key):
+        """Splits an absolute key into (prefix, rel_key).
+
+           Parameters
+           ----------
+           abs_key: str
+               the absolute key
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (prefix, rel_key)
+        """
+        index = abs_key.rfind(self._dot, 0, len(abs_key) - 1) + 1
+        return abs_key[:index], abs_key[index:]
+
+    def children(self, prefix):
+        """Returns the relative keys of the items of submap 'prefix'.
+
+           Parameters
+           ----------
+           prefix: str
+               the submap prefix
+
+           Returns
+           -------
+           OrderedDict
+               the relative keys
+        """
+        return self._children.get(prefix, ())
+
+    def add(self, abs_key):
+        """Adds a key.
+
+           Parameters
+           ----------
+           abs_key: str
+               the absolute key
+        """
+        prefix, rel_key = self._split(abs_key)
+        children = self._children.get(prefix, None)
+        if children is None:
+            children = self._children[prefix] = collections.OrderedDict()
+        children[rel_key] = None
+        if abs_key.endswith(self._dot) and abs_key not in self._children:
+            self._children[abs_key] = collections.OrderedDict()
+
+    def remove(self, abs_key):
+        """Removes a key.
+
+           Parameters
+           ----------
+           abs_key: str
+               the absolute key
+        """
+        prefix, rel_key = self._split(abs_key)
+        self._children[prefix].pop(rel_key, None)
+        if abs_key.endswith(self._dot):
+            self._children.pop(abs_key, None)
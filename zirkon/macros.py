@@ -52,6 +52,13 @@ class MNameCall(MName):
     def evaluate(self, globals_d=None):
         return super().evaluate(globals_d=globals_d)()
 
+    def _impl_compile(self, compiler):
+        if self.globals_d is None:
+            return "{}()".format(compiler.name(self.name))
+        else:
+            # evaluate already performs the call
+            return compiler.evaluate_call(self)
+
 
 SECTION = MNameCall('SECTION')
 ROOT = MName('ROOT')
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""\
+Implementation of the ParseCache class, a disk cache of parsed config
+files (similar to __pycache__ for python modules).
+
+After a file has been parsed, its content is stored as a zbin image in the
+cache directory; the image is keyed on the absolute file path, the file
+size and modification time, the serializer class and the zirkon version,
+so that it is used only if the file has not been changed since. Files
+loaded by serializers with non-default loading options (see
+'Serializer.load_options()') are not cached.
+
+The cache is opt-in: it can be passed to 'from_file(...)' and 'read(...)'
+of Config, Schema and Validation, or set as default with
+'set_default_parse_cache(...)' or with the ZIRKON_PARSE_CACHE_DIR
+environment variable.
+"""
+
+__author__ = "Simone Campagna"
+__copyright__ = 'Copyright (c) 2015 Simone Campagna'
+__license__ = 'Apache License Version 2.0'
+__all__ = [
+    'ParseCache',
+    'get_default_parse_cache',
+    'set_default_parse_cache',
+    'load_file',
+]
+
+import hashlib
+import os
+import tempfile
+
+from .toolbox.serializer import ZBinSerializer
+from .version import VERSION
+
+
+class ParseCache(object):
+    """Disk cache of parsed config files.
+
+       Parameters
+       ----------
+       directory: str
+           the cache directory (it is created if needed)
+    """
+    SUFFIX = '.zbin'
+
+    def __init__(self, directory):
+        self._directory = os.path.abspath(directory)
+        self._serializer = ZBinSerializer()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self):
+        """Returns the cache directory.
+
+           Returns
+           -------
+           str
+               the cache directory
+        """
+        return self._directory
+
+    def get_key(self, serializer, filename):
+        """Returns the cache key for a file.
+
+           Parameters
+           ----------
+           serializer: |Serializer|
+               the serializer
+           filename: str
+               the file name
+
+           Returns
+           -------
+           list
+               the cache key
+        """
+        filename = os.path.abspath(filename)
+        stat = os.stat(filename)
+        serializer_class = type(serializer)
+        return [filename, stat.st_size, stat.st_mtime_ns, serializer.class_tag(),
+                "{}.{}".format(serializer_class.__module__, serializer_class.__qualname__), VERSION]
+
+    def get_cache_filename(self, key):
+        """Returns the cache file name for a key.
+
+           Parameters
+           ----------
+           key: list
+               the cache key
+
+           Returns
+           -------
+           str
+               the cache file name
+        """
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self._directory, digest + self.SUFFIX)
+
+    def _load_image(self, cache_filename, key):
+        """Loads a cached image.
+
+           Parameters
+           ----------
+           cache_filename: str
+               the cache file name
+           key: list
+               the cache key
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (found, content)
+        """
+        try:
+            image = self._serializer.from_file(cache_filename)
+        except Exception:  # pylint: disable=broad-except
+            # missing or corrupted image
+            return False, None
+        if image.get('key', None) != key:
+            return False, None
+        return True, image['content']
+
+    def _store_image(self, cache_filename, key, content):
+        """Stores an image (atomically). Errors are ignored, since caching is
+           only an optimization.
+
+           Parameters
+           ----------
+           cache_filename: str
+               the cache file name
+           key: list
+               the cache key
+           content: Mapping
+               the parsed content
+        """
+        try:
+            serialization = self._serializer.to_string({'key': key, 'content': content})
+            os.makedirs(self._directory, exist_ok=True)
+            f_stream = tempfile.NamedTemporaryFile(dir=self._directory, suffix='.tmp', delete=False)
+            try:
+                with f_stream:
+                    f_stream.write(serialization)
+                os.replace(f_stream.name, cache_filename)
+            except BaseException:
+                os.remove(f_stream.name)
+                raise
+        except (TypeError, OSError):
+            pass
+
+    def load(self, serializer, filename):
+        """Loads a file, using the cached image if it is up to date; otherwise
+           the file is parsed and the image is stored. Serializers with
+           non-default loading options bypass the cache.
+
+           Parameters
+           ----------
+           serializer: |Serializer|
+               the serializer
+           filename: str
+               the file name
+
+           Returns
+           -------
+           |any|
+               the deserialized object
+        """
+        if isinstance(serializer, ZBinSerializer) or serializer.load_options():
+            # already fast to load, or images cannot store the load options
+            return serializer.from_file(filename)
+        key = self.get_key(serializer, filename)
+        cache_filename = self.get_cache_filename(key)
+        found, content = self._load_image(cache_filename, key)
+        if found:
+            self.hits += 1
+            return content
+        self.misses += 1
+        content = serializer.from_file(filename)
+        self._store_image(cache_filename, key, content)
+        return content
+
+    def clear(self):
+        """Removes all the cached images.
+        """
+        if os.path.isdir(self._directory):
+            for entry in os.listdir(self._directory):
+                if entry.endswith(self.SUFFIX):
+                    os.remove(os.path.join(self._directory, entry))
+
+    def __repr__(self):
+        return "{}(directory={!r})".format(self.__class__.__name__, self._directory)
+
+
+_DEFAULT_PARSE_CACHE = None
+if os.environ.get('ZIRKON_PARSE_CACHE_DIR', ''):
+    _DEFAULT_PARSE_CACHE = ParseCache(os.environ['ZIRKON_PARSE_CACHE_DIR'])
+
+
+def get_default_parse_cache():
+    """Returns the default parse cache.
+
+       Returns
+       -------
+       |ParseCache|
+           the default parse cache, or None
+    """
+    return _DEFAULT_PARSE_CACHE
+
+
+def set_default_parse_cache(parse_cache):
+    """Sets the default parse cache.
+
+       Parameters
+       ----------
+       parse_cache: |ParseCache|
+           a ParseCache, a cache directory, or None to disable the default cache
+    """
+    global _DEFAULT_PARSE_CACHE  # pylint: disable=global-statement
+    if isinstance(parse_cache, str):
+        parse_cache = ParseCache(parse_cache)
+    _DEFAULT_PARSE_CACHE = parse_cache
+
+
+def load_file(serializer, filename, parse_cache=None):
+    """Loads a file with 'serializer', using 'parse_cache'.
+
+       Parameters
+       ----------
+       serializer: |Serializer|
+           the serializer
+       filename: str
+           the file name
+       parse_cache: |ParseCache|, optional
+           a ParseCache, a cache directory, False to disable caching, or
+           None to use the default parse cache (if any)
+
+       Returns
+       -------
+       |any|
+           the deserialized object
+    """
+    if parse_cache is None:
+        parse_cache = _DEFAULT_PARSE_CACHE
+    elif isinstance(parse_cache, str):
+        parse_cache = ParseCache(parse_cache)
+    if parse_cache:
+        return parse_cache.load(serializer, filename)
+    else:
+        return serializer.from_file(filename)
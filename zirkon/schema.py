@@ -17,6 +17,10 @@
 
 """\
 Schema class.
+
+Many configs can be validated in parallel with 'Schema.validate_many';
+the schema is compiled once, and the compiled plan is shipped once to each
+worker process.
 """
 
 __author__ = "Simone Campagna"
@@ -26,10 +30,107 @@ __all__ = [
     'Schema',
 ]
 
+import concurrent.futures
+import multiprocessing
+import os
+import pickle
+import sys
+
+from .config import Config
 from .config_base import ConfigBase
+from .section import Section
 from .schema_section import SchemaSection
 from .validator import ValidatorInstance
 
+# the validation plan of the current worker process
+_WORKER_PLAN = None
+
+
+def _set_worker_plan(plan_data, barrier=None):
+    """Sets the validation plan of the current worker process.
+
+       Parameters
+       ----------
+       plan_data: bytes
+           the pickled |ValidationPlan|
+       barrier: multiprocessing.Barrier, optional
+           a barrier shared by all the workers: waiting on it makes
+           each worker run exactly one '_set_worker_plan' task
+    """
+    global _WORKER_PLAN  # pylint: disable=global-statement
+    _WORKER_PLAN = pickle.loads(plan_data)
+    if barrier is not None:
+        barrier.wait()
+
+
+def _warm_up_workers(executor, workers, plan_data):
+    """Sets the validation plan of all the workers of an executor without
+       initializer (python < 3.7): one '_set_worker_plan' task is submitted
+       per worker, and all the workers wait on a barrier until each one has
+       got its task.
+
+       Parameters
+       ----------
+       executor: concurrent.futures.ProcessPoolExecutor
+           the executor
+       workers: int
+           the number of worker processes of the executor
+       plan_data: bytes
+           the pickled |ValidationPlan|
+    """
+    with multiprocessing.Manager() as manager:
+        barrier = manager.Barrier(workers)  # pylint: disable=no-member
+        futures = [executor.submit(_set_worker_plan, plan_data, barrier) for _ in range(workers)]
+        for future in futures:
+            future.result()
+
+
+def _validate_source(plan, source, protocol):
+    """Loads and validates a config source; errors are returned, not raised.
+
+       Parameters
+       ----------
+       plan: |ValidationPlan|
+           the validation plan
+       source: |any|
+           a file name, a Section or a Mapping
+       protocol: str
+           the protocol used to read file names
+
+       Returns
+       -------
+       |any|
+           the Validation, or the raised exception
+    """
+    try:
+        if isinstance(source, str):
+            config = Config.from_file(source, protocol)
+        elif isinstance(source, Section):
+            config = source
+        else:
+            config = Config(init=source)
+        return plan.validate(config)
+    except Exception as err:  # pylint: disable=broad-except
+        return err
+
+
+def _worker_validate_source(source, protocol):
+    """Validates a source in a worker process with the worker plan.
+
+       Parameters
+       ----------
+       source: |any|
+           a file name, a Section or a Mapping
+       protocol: str
+           the protocol used to read file names
+
+       Returns
+       -------
+       |any|
+           the Validation, or the raised exception
+    """
+    return _validate_source(_WORKER_PLAN, source, protocol)
+
 
 class Schema(ConfigBase, SchemaSection):  # pylint: disable=too-many-ancestors
     """Schema config class.
@@ -62,3 +163,73 @@ class Schema(ConfigBase, SchemaSection):  # pylint: disable=too-many-ancestors
                                                         unexpected_option_validator=ValidatorInstance())
             schema_validator.validate(section=self, raise_on_error=True)
 
+    def validate_many(self, sources, protocol="zirkon", *, workers=None):
+        """Validates many independent configs in a pool of worker processes,
+           and yields the results as they finish.
+
+           The schema is compiled once; the compiled plan is shipped once to
+           each worker (on python < 3.7, where executors have no initializer,
+           by a warm-up task per worker). Sources are loaded and validated in the workers, so
+           in-memory configs are validated on a copy (default values are not
+           added to them), unless workers is 0. Errors are isolated: an exception raised while
+           loading or validating a source is yielded in place of its
+           Validation.
+
+           Parameters
+           ----------
+           sources: iterable
+               file names, Sections or Mappings
+           protocol: str, optional
+               the protocol used to read file names (defaults to 'zirkon')
+           workers: int, optional
+               the number of worker processes (defaults to the number of
+               cpus); if 0, sources are validated in the current process
+
+           Yields
+           ------
+           tuple
+               a 2-tuple (source, result), where result is the |Validation|
+               or the exception raised for source
+        """
+        plan = self.compile()
+        if workers == 0:
+            for source in sources:
+                yield source, _validate_source(plan, source, protocol)
+            return
+        if workers is None:
+            workers = os.cpu_count() or 1
+        plan_data = pickle.dumps(plan, protocol=pickle.HIGHEST_PROTOCOL)
+        if sys.version_info >= (3, 7):
+            executor = concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_set_worker_plan, initargs=(plan_data,))
+        else:
+            executor = concurrent.futures.ProcessPoolExecutor(workers)
+        # a bounded number of pending tasks, so that sources can be a
+        # long-running generator:
+        max_pending = 4 * workers
+        pending = {}
+        sources = iter(sources)
+        with executor:
+            if sys.version_info < (3, 7):
+                _warm_up_workers(executor, workers, plan_data)
+            try:
+                while True:
+                    for source in sources:
+                        future = executor.submit(_worker_validate_source, source, protocol)
+                        pending[future] = source
+                        if len(pending) >= max_pending:
+                            break
+                    if not pending:
+                        break
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        source = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as err:  # pylint: disable=broad-except
+                            result = err
+                        yield source, result
+            finally:
+                # the iteration may have been stopped by the caller
+                for future in pending:
+                    future.cancel()
@@ -16,7 +16,29 @@
 #
 
 """
-Implementation of the SchemaSection class, implementing the validate method.
+Implementation of the SchemaSection class, implementing the validate method,
+and of the ValidationPlan class, a validation plan compiled from a schema,
+which can be used to validate many configs against the same schema.
+
+With 'validate(config, incremental=True)' only the options changed since
+the last successful validation are checked again, together with the options
+whose value, validator arguments or default depend on them:
+
+>>> from zirkon.config import Config
+>>> from zirkon.schema import Schema
+>>> from zirkon.validator import Int
+>>> from zirkon import macros
+>>> schema = Schema()
+>>> schema['n'] = Int(default=3)
+>>> schema['m'] = Int(min=macros.ROOT['n'])
+>>> config = Config({'n': 2, 'm': 3})
+>>> schema.validate(config, incremental=True).dump()
+>>> config['n'] = 4
+>>> sorted(config.get_changes())
+[('n',)]
+>>> schema.validate(config, incremental=True).dump()
+m = MinValueError('m=3: value is lower than min 4')
+>>>
 """
 
 __author__ = "Simone Campagna"
@@ -24,8 +46,15 @@ __copyright__ = 'Copyright (c) 2015 Simone Campagna'
 __license__ = 'Apache License Version 2.0'
 __all__ = [
     'SchemaSection',
+    'ValidationPlan',
+    'PlanEntry',
+    'SectionPlan',
 ]
 
+import collections
+import contextlib
+import heapq
+
 from .section import Section
 from .config_section import ConfigSection
 from .validation_section import ValidationSection
@@ -47,18 +76,68 @@ def _reset_option_default(*, section, option, option_name):
         defaults = section.defaults
         if defaults is not None:
             section_defaults = defaults
-            if option.defined:
-                for key, _ in section.options():
-                    if key == option_name:
-                        # option is from standard values
-                        break
-                else:
-                    # option is from section_defaults:
-                    # it is removed in order to be replaced by eventually new value
-                    option.defined = False
+            if option.defined and option_name not in section.dictionary:
+                # option is from section_defaults:
+                # it is removed in order to be replaced by eventually new value
+                option.defined = False
     return section_defaults
 
 
+_ValidationState = collections.namedtuple(
+    "_ValidationState",
+    ("schema", "schema_generation", "stamp", "dependencies", "dependents"))
+
+
+@contextlib.contextmanager
+def _recording_dependencies(dependencies, section, option_name):
+    """Context manager recording the option/section paths read while an option
+       is validated; they are stored in 'dependencies' (if not None), along
+       with the option index (an option already found keeps its index).
+       The macro cache of the section root must be enabled.
+    """
+    if dependencies is None:
+        yield
+    else:
+        path = section.fqname + (option_name,)
+        macro_cache = section.root._macro_cache  # pylint: disable=protected-access
+        with macro_cache.recording() as option_dependencies:
+            yield
+        option_dependencies.add(path)
+        if path in dependencies:
+            index = dependencies[path][0]
+        else:
+            index = len(dependencies)
+        dependencies[path] = (index, frozenset(option_dependencies))
+
+
+def _validate_option(*, validator, use_defaults, section, validation_section,
+                     option_name, raise_on_error, option):
+    """Validates an option and uses the validation result to
+       eventually change the option value.
+       Used to implement SchemaSection.impl_validate(...) and
+       ValidationPlan.validate(...) methods.
+    """
+    section_defaults = _reset_option_default(section=section, option=option, option_name=option_name)
+    prev_defined = option.defined
+    prev_value = option.value
+    try:
+        validator.validate_option(option, section)
+    except OptionValidationError as err:
+        validation_section[option_name] = err
+        if raise_on_error:
+            raise
+    else:
+        if not option.defined:
+            if prev_defined:
+                del section[option_name]
+        else:
+            if option.value is not prev_value:
+                if prev_defined or not use_defaults:
+                    section[option_name] = option.value
+                else:
+                    section_defaults[option_name] = option.value
+
+
 class SchemaSection(Section):
     """A section class to perform validation. All values must be Validator
        instances.
@@ -95,6 +174,7 @@ class SchemaSection(Section):
 
     def __init__(self, init=None, *, dictionary=None, parent=None, name=None,
                  macros=True, unexpected_option_validator=None, use_defaults=True):
+        self._subsection_cache = {}
         self._unexpected_option_validator = None
         self.unexpected_option_validator = unexpected_option_validator
         self._use_defaults = None
@@ -123,13 +203,21 @@ class SchemaSection(Section):
             if True, defaults are enabled
         """
         self._use_defaults = bool(value)
+        self._clear_subsection_cache()
+        self._record_change()
 
     @classmethod
     def _subsection_class(cls):
         return SchemaSection
 
+    def _record_change(self, key=None):
+        # the use_defaults and unexpected_option_validator setters are
+        # called also during construction:
+        if hasattr(self, '_root'):
+            super()._record_change(key)
+
     def _subsection(self, section_name, dictionary):
-        return self._subsection_class()(dictionary=dictionary, name=section_name,
+        return self._subsection_class()(dictionary=dictionary, parent=self, name=section_name,
                                         macros=self.macros,
                                         unexpected_option_validator=self._unexpected_option_validator,
                                         use_defaults=self._use_defaults)
@@ -164,11 +252,19 @@ class SchemaSection(Section):
         if not isinstance(validator, Validator):
             raise TypeError("{!r} is not a Validator".format(validator))
         self._unexpected_option_validator = validator
+        self._clear_subsection_cache()
+        self._record_change()
 
-    def validate(self, section, *, validation=None, raise_on_error=False):
+    def validate(self, section, *, validation=None, raise_on_error=False, incremental=False):
         """Validates 'section' and returns a ValidationSection with the found
            validation errors.
 
+           If 'incremental' is True and 'section' is a root section, the
+           changes of 'section' are tracked after a successful validation;
+           the next incremental validation with the same (unchanged) schema
+           checks only the changed options and the options depending on them.
+           Only changes done through the Section interface are tracked.
+
            Parameters
            ----------
            section: zirkon.Section
@@ -177,6 +273,9 @@ class SchemaSection(Section):
                the validation object to be used, or None
            raise_on_error: bool, optional
                if True, the first error is raised.
+           incremental: bool, optional
+               if True, only the options changed since the last successful
+               incremental validation are validated (defaults to False)
 
            Raises
            ------
@@ -190,13 +289,186 @@ class SchemaSection(Section):
         """
         if validation is None:
             validation = Validation()
-        self.impl_validate(
-            section=section,
-            validation_section=validation,
-            raise_on_error=raise_on_error)
+        if incremental and section.root is section:
+            self._validate_incremental(section, validation, raise_on_error)
+        else:
+            self.impl_validate(
+                section=section,
+                validation_section=validation,
+                raise_on_error=raise_on_error)
         return validation
 
-    def impl_validate(self, section, validation_section, *, raise_on_error=False, parent_fqname=''):
+    def _validate_incremental(self, section, validation, raise_on_error):
+        """Incremental validation of a root section. The validation state
+           (the dependencies of each option) is kept on the section only if
+           no error is found.
+
+           Parameters
+           ----------
+           section: zirkon.Section
+               the root section to be validated
+           validation: zirkon.Validation
+               the validation object to be filled
+           raise_on_error: bool
+               if True, the first error is raised.
+        """
+        # pylint: disable=protected-access
+        state = section._validation_state
+        changes = section.get_changes()
+        section._validation_state = None
+        with section.caching_macros():
+            if state is not None and changes is not None and state.schema is self and \
+                    state.schema_generation == self.generation and \
+                    state.stamp == section._macro_cache_stamp() and \
+                    all(path in state.dependencies and self._is_option_path(section, path) for path in changes):
+                self._revalidate_options(section, validation, raise_on_error, state, changes)
+            else:
+                dependencies = collections.OrderedDict()
+                self.impl_validate(
+                    section=section,
+                    validation_section=validation,
+                    raise_on_error=raise_on_error,
+                    dependencies=dependencies)
+                dependents = {}
+                for path, (_, option_dependencies) in dependencies.items():
+                    for dependency in option_dependencies:
+                        dependents.setdefault(dependency, set()).add(path)
+                state = _ValidationState(schema=self, schema_generation=None, stamp=None,
+                                         dependencies=dependencies, dependents=dependents)
+        if not validation:
+            section._validation_state = state._replace(
+                schema_generation=self.generation,
+                stamp=section._macro_cache_stamp())
+            section.track_changes()
+
+    @classmethod
+    def _is_option_path(cls, section, path):
+        """Returns True if 'path' is an option path of 'section', or a missing
+           option in an existing section.
+
+           Parameters
+           ----------
+           section: zirkon.Section
+               the root section
+           path: tuple
+               the path
+
+           Returns
+           -------
+           bool
+               True if path is an option path
+        """
+        for name in path[:-1]:
+            section = section.get_section(name, None)
+            if section is None:
+                return False
+        return not section.has_section(path[-1])
+
+    def _revalidate_options(self, section, validation, raise_on_error, state, changes):
+        """Validates the changed options and all the options depending on
+           them, in schema order; the options depending on an option whose
+           value is changed by validation (for instance a default value) are
+           validated too.
+
+           Parameters
+           ----------
+           section: zirkon.Section
+               the root section to be validated
+           validation: zirkon.Validation
+               the validation object to be filled
+           raise_on_error: bool
+               if True, the first error is raised.
+           state: _ValidationState
+               the validation state (updated)
+           changes: frozenset
+               the changed option paths
+        """
+        dependencies = state.dependencies
+        queue = []
+        queued = set()
+
+        def enqueue(paths):
+            """Adds paths to the queue"""
+            for path in paths:
+                if path not in queued and path in dependencies:
+                    queued.add(path)
+                    heapq.heappush(queue, (dependencies[path][0], path))
+
+        for path in changes:
+            enqueue((path,))
+            enqueue(state.dependents.get(path, ()))
+        while queue:
+            _, path = heapq.heappop(queue)
+            if self._revalidate_option(section, validation, raise_on_error, state, path):
+                enqueue(state.dependents.get(path, ()))
+
+    def _revalidate_option(self, section, validation, raise_on_error, state, path):
+        """Validates the option 'path' of a root section.
+
+           Parameters
+           ----------
+           section: zirkon.Section
+               the root section to be validated
+           validation: zirkon.Validation
+               the validation object to be filled
+           raise_on_error: bool
+               if True, the first error is raised.
+           state: _ValidationState
+               the validation state (updated)
+           path: tuple
+               the option path
+
+           Returns
+           -------
+           bool
+               True if the option has been changed by validation
+        """
+        schema_section = self
+        for name in path[:-1]:
+            section = section.get_section(name)
+            if schema_section is not None:
+                schema_subsection = schema_section.get_section(name, None)
+                if schema_subsection is None:
+                    # unexpected section:
+                    use_defaults = True
+                    validator = schema_section.unexpected_option_validator
+                schema_section = schema_subsection
+        option_name = path[-1]
+        if schema_section is not None:
+            use_defaults = schema_section.use_defaults
+            if schema_section.has_option(option_name):
+                validator = schema_section[option_name]
+            else:
+                validator = schema_section.unexpected_option_validator
+                if not section.has_option(option_name):
+                    # removed unexpected option:
+                    return False
+        elif not section.has_option(option_name):
+            # removed option of an unexpected section:
+            return False
+        validation_section = ValidationSection()
+        fqname = '.'.join(path)
+        with _recording_dependencies(state.dependencies, section, option_name):
+            if section.has_option(option_name):
+                option = Option(name=fqname, value=section.get_option(option_name), defined=True)
+            else:
+                option = Option(name=fqname, value=None, defined=False)
+            prev_defined, prev_value = option.defined, option.value
+            _validate_option(validator=validator, use_defaults=use_defaults,
+                             section=section, validation_section=validation_section,
+                             option_name=option_name, raise_on_error=raise_on_error, option=option)
+        for dependency in state.dependencies[path][1]:
+            state.dependents.setdefault(dependency, set()).add(path)
+        if validation_section:
+            for name in path[:-1]:
+                if not validation.has_section(name):
+                    validation[name] = {}
+                validation = validation[name]
+            validation[option_name] = validation_section[option_name]
+        return option.defined != prev_defined or option.value is not prev_value
+
+    def impl_validate(self, section, validation_section, *, raise_on_error=False, parent_fqname='',
+                      dependencies=None):
         """Implementation of the validate method.
 
            Parameters
@@ -209,17 +481,21 @@ class SchemaSection(Section):
                if True, the first error is raised.
            parent_fqname: str, optional
                the fully qualified name (with dots) of the parent
+           dependencies: dict, optional
+               if not None, the paths read while validating each option
+               are stored here (used by incremental validation)
 
            Raises
            ------
            zirkon.validator.OptionValidationError
                option validation error
         """
-        args = dict(raise_on_error=raise_on_error, parent_fqname=parent_fqname)
+        args = dict(raise_on_error=raise_on_error, parent_fqname=parent_fqname, dependencies=dependencies)
         self.impl_validate_options(section=section, validation_section=validation_section, **args)
         self.impl_validate_subsections(section=section, validation_section=validation_section, **args)
 
-    def impl_validate_subsections(self, *, section, validation_section, raise_on_error=False, parent_fqname=''):
+    def impl_validate_subsections(self, *, section, validation_section, raise_on_error=False, parent_fqname='',
+                                  dependencies=None):
         """Implementation of the validate method for subsections
 
            Parameters
@@ -232,6 +508,9 @@ class SchemaSection(Section):
                if True, the first error is raised.
            parent_fqname: str, optional
                the fully qualified name (with dots) of the parent
+           dependencies: dict, optional
+               if not None, the paths read while validating each option
+               are stored here (used by incremental validation)
 
            Raises
            ------
@@ -256,7 +535,8 @@ class SchemaSection(Section):
                     subsection,
                     validation_section=sub_validation_section,
                     raise_on_error=raise_on_error,
-                    parent_fqname=subsection_fqname)
+                    parent_fqname=subsection_fqname,
+                    dependencies=dependencies)
                 if sub_validation_section:
                     validation_section[subsection_name] = sub_validation_section
         # unexpected subsections:
@@ -270,11 +550,13 @@ class SchemaSection(Section):
                     section[subsection_name],
                     validation_section=sub_validation_section,
                     raise_on_error=raise_on_error,
-                    parent_fqname=subsection_fqname)
+                    parent_fqname=subsection_fqname,
+                    dependencies=dependencies)
                 if sub_validation_section:
                     validation_section[subsection_name] = sub_validation_section
 
-    def impl_validate_options(self, *, section, validation_section, raise_on_error=False, parent_fqname=''):
+    def impl_validate_options(self, *, section, validation_section, raise_on_error=False, parent_fqname='',
+                              dependencies=None):
         """Implementation of the validate method for options
 
            Parameters
@@ -287,6 +569,9 @@ class SchemaSection(Section):
                if True, the first error is raised.
            parent_fqname: str, optional
                the fully qualified name (with dots) of the parent
+           dependencies: dict, optional
+               if not None, the paths read while validating each option
+               are stored here (used by incremental validation)
 
            Raises
            ------
@@ -301,6 +586,289 @@ class SchemaSection(Section):
             if section.has_section(option_name):
                 validation_section[option_name] = UnexpectedSectionError(
                     "unexpected section {} (expecting option)".format(fqname))
+            else:
+                with _recording_dependencies(dependencies, section, option_name):
+                    if section.has_option(option_name):
+                        value = section.get_option(option_name)
+                        defined = True
+                    else:
+                        value = None
+                        defined = False
+                    option = Option(name=fqname, value=value, defined=defined)
+                    self._validate_option(
+                        validator=validator,
+                        section=section,
+                        validation_section=validation_section,
+                        option_name=option_name,
+                        option=option,
+                        raise_on_error=raise_on_error)
+        # unexpected options:
+        for option_name, option_value in list(section.options()):
+            if option_name not in expected_option_names:
+                validator = self._unexpected_option_validator
+                fqname = parent_fqname + option_name
+                option = Option(name=fqname, value=option_value, defined=True)
+                with _recording_dependencies(dependencies, section, option_name):
+                    self._validate_option(
+                        validator=validator,
+                        validation_section=validation_section,
+                        section=section,
+                        option_name=option_name,
+                        option=option,
+                        raise_on_error=raise_on_error)
+
+    def _validate_option(self, *, validator, section, validation_section,
+                         option_name, raise_on_error, option):
+        """Validates an option and uses the validation result to
+           eventually change the option value.
+           Used to implement SchemaSection.impl_validate(...) method.
+        """
+        _validate_option(validator=validator, use_defaults=self._use_defaults,
+                         section=section, validation_section=validation_section,
+                         option_name=option_name, raise_on_error=raise_on_error, option=option)
+
+    def compile(self):
+        """Compiles the schema to a ValidationPlan. The plan is a snapshot of
+           the schema: later changes of the schema do not affect it.
+
+           Returns
+           -------
+           ValidationPlan
+               the validation plan
+        """
+        return ValidationPlan(self)
+
+
+PlanEntry = collections.namedtuple(
+    "PlanEntry",
+    ("path", "fqname", "validator", "use_defaults"))
+PlanEntry.__doc__ = """\
+Validation plan entry for an expected option.
+
+   Parameters
+   ----------
+   path: tuple
+       the option path (section names and option name)
+   fqname: str
+       the fully qualified option name (with dots)
+   validator: |Validator|
+       the option validator
+   use_defaults: bool
+       if True, values set by the validator go to the defaults
+"""
+
+SectionPlan = collections.namedtuple(
+    "SectionPlan",
+    ("path", "fqname", "entries", "subsections", "expected_option_names", "expected_section_names",
+     "unexpected_option_validator", "use_defaults"))
+SectionPlan.__doc__ = """\
+Validation plan for a section.
+
+   Parameters
+   ----------
+   path: tuple
+       the section path (None for unexpected sections)
+   fqname: str
+       the fully qualified section name prefix (with dots)
+   entries: tuple
+       the PlanEntry tuple for the expected options
+   subsections: tuple
+       the (subsection name, SectionPlan) tuple for the expected subsections
+   expected_option_names: frozenset
+       the expected option names
+   expected_section_names: frozenset
+       the expected subsection names
+   unexpected_option_validator: |Validator|
+       the validator for unexpected options
+   use_defaults: bool
+       if True, values set by validators go to the defaults
+"""
+
+
+class ValidationPlan(object):
+    """Immutable validation plan compiled from a schema: it contains the flat
+       list of validation entries and, for each section, the precomputed sets
+       of expected option and section names. Validating a config with a plan
+       gives the same result as validating it with the schema, but the schema
+       is not traversed again; a plan can be shared to validate many configs.
+
+       Since it has the same 'validate' method, a ValidationPlan can be used
+       as config schema.
+
+       >>> from zirkon.schema import Schema
+       >>> from zirkon.config import Config
+       >>> from zirkon.validator import Int, Str
+       >>> schema = Schema()
+       >>> schema['a'] = Int(default=1)
+       >>> schema['sub'] = {'s': Str()}
+       >>> plan = schema.compile()
+       >>> [entry.fqname for entry in plan.entries]
+       ['a', 'sub.s']
+       >>> config = Config()
+       >>> config['sub'] = {'s': 'x', 't': 2}
+       >>> plan.validate(config).dump()
+       [sub]
+           t = UnexpectedOptionError('sub.t=2: unexpected option')
+       >>> config['a']
+       1
+       >>>
+
+       Parameters
+       ----------
+       schema_section: |SchemaSection|
+           the schema to be compiled
+    """
+
+    def __init__(self, schema_section):
+        self._unexpected_plans = {}
+        entries = []
+        self._root = self._compile(schema_section, (), entries)
+        self._entries = tuple(entries)
+
+    def _unexpected_plan(self, unexpected_option_validator):
+        """Returns the plan for unexpected sections.
+
+           Parameters
+           ----------
+           unexpected_option_validator: |Validator|
+               the validator for unexpected options
+
+           Returns
+           -------
+           SectionPlan
+               the section plan
+        """
+        key = id(unexpected_option_validator)
+        plan = self._unexpected_plans.get(key, None)
+        if plan is None:
+            plan = self._unexpected_plans[key] = SectionPlan(
+                path=None, fqname=None, entries=(), subsections=(),
+                expected_option_names=frozenset(), expected_section_names=frozenset(),
+                unexpected_option_validator=unexpected_option_validator,
+                use_defaults=True)
+        return plan
+
+    def _compile(self, schema_section, path, entries):
+        """Compiles a schema section.
+
+           Parameters
+           ----------
+           schema_section: |SchemaSection|
+               the schema section
+           path: tuple
+               the section path
+           entries: list
+               the list of all the entries (filled)
+
+           Returns
+           -------
+           SectionPlan
+               the section plan
+        """
+        fqname = ''.join(name + '.' for name in path)
+        use_defaults = schema_section.use_defaults
+        section_entries = []
+        for option_name, validator in schema_section.options():
+            section_entries.append(PlanEntry(
+                path=path + (option_name,), fqname=fqname + option_name,
+                validator=validator, use_defaults=use_defaults))
+        entries.extend(section_entries)
+        subsections = []
+        for subsection_name, schema_subsection in schema_section.sections():
+            subsections.append((subsection_name, self._compile(schema_subsection, path + (subsection_name,), entries)))
+        unexpected_option_validator = schema_section.unexpected_option_validator
+        # makes the unexpected plan available while validating
+        self._unexpected_plan(unexpected_option_validator)
+        return SectionPlan(
+            path=path, fqname=fqname,
+            entries=tuple(section_entries),
+            subsections=tuple(subsections),
+            expected_option_names=frozenset(entry.path[-1] for entry in section_entries),
+            expected_section_names=frozenset(name for name, _ in subsections),
+            unexpected_option_validator=unexpected_option_validator,
+            use_defaults=use_defaults)
+
+    @property
+    def entries(self):
+        """Returns the flat tuple of PlanEntries for all the expected options.
+
+           Returns
+           -------
+           tuple
+               the plan entries
+        """
+        return self._entries
+
+    @property
+    def root(self):
+        """Returns the root SectionPlan.
+
+           Returns
+           -------
+           SectionPlan
+               the root section plan
+        """
+        return self._root
+
+    def validate(self, section, *, validation=None, raise_on_error=False, incremental=False):
+        """Validates 'section' and returns a ValidationSection with the found
+           validation errors.
+
+           Parameters
+           ----------
+           section: zirkon.Section
+               the section to be validated
+           validation: zirkon.Validation, optional
+               the validation object to be used, or None
+           raise_on_error: bool, optional
+               if True, the first error is raised.
+           incremental: bool, optional
+               accepted for compatibility with SchemaSection.validate;
+               plans do not track changes, so the validation is always
+               complete
+
+           Raises
+           ------
+           OptionValidationError
+               option validation error
+
+           Returns
+           -------
+           zirkon.Validation
+               the validation result
+        """
+        if validation is None:
+            validation = Validation()
+        self._validate_section(self._root, section, validation, raise_on_error, '')
+        return validation
+
+    def _validate_section(self, section_plan, section, validation_section, raise_on_error, parent_fqname):
+        """Validates a section according to a section plan.
+
+           Parameters
+           ----------
+           section_plan: SectionPlan
+               the section plan
+           section: zirkon.Section
+               the section to be validated
+           validation_section: zirkon.validation_section.ValidationSection
+               the ValidationSection object to be filled
+           raise_on_error: bool
+               if True, the first error is raised.
+           parent_fqname: str
+               the fully qualified name (with dots) of the parent
+
+           Raises
+           ------
+           zirkon.validator.OptionValidationError
+               option validation error
+        """
+        # expected options:
+        for entry in section_plan.entries:
+            option_name = entry.path[-1]
+            if section.has_section(option_name):
+                validation_section[option_name] = UnexpectedSectionError(
+                    "unexpected section {} (expecting option)".format(entry.fqname))
             else:
                 if section.has_option(option_name):
                     value = section.get_option(option_name)
@@ -308,52 +876,53 @@ class SchemaSection(Section):
                 else:
                     value = None
                     defined = False
-                option = Option(name=fqname, value=value, defined=defined)
-                self._validate_option(
-                    validator=validator,
+                option = Option(name=entry.fqname, value=value, defined=defined)
+                _validate_option(
+                    validator=entry.validator,
+                    use_defaults=entry.use_defaults,
                     section=section,
                     validation_section=validation_section,
                     option_name=option_name,
                     option=option,
                     raise_on_error=raise_on_error)
         # unexpected options:
+        expected_option_names = section_plan.expected_option_names
         for option_name, option_value in list(section.options()):
             if option_name not in expected_option_names:
-                validator = self._unexpected_option_validator
-                fqname = parent_fqname + option_name
-                option = Option(name=fqname, value=option_value, defined=True)
-                self._validate_option(
-                    validator=validator,
-                    validation_section=validation_section,
+                option = Option(name=parent_fqname + option_name, value=option_value, defined=True)
+                _validate_option(
+                    validator=section_plan.unexpected_option_validator,
+                    use_defaults=section_plan.use_defaults,
                     section=section,
+                    validation_section=validation_section,
                     option_name=option_name,
                     option=option,
                     raise_on_error=raise_on_error)
-
-    def _validate_option(self, *, validator, section, validation_section,
-                         option_name, raise_on_error, option):
-        """Validates an option and uses the validation result to
-           eventually change the option value.
-           Used to implement SchemaSection.impl_validate(...) method.
-        """
-        section_defaults = _reset_option_default(section=section, option=option, option_name=option_name)
-        prev_defined = option.defined
-        prev_value = option.value
-        try:
-            validator.validate_option(option, section)
-        except OptionValidationError as err:
-            validation_section[option_name] = err
-            if raise_on_error:
-                raise
-        else:
-            if not option.defined:
-                if prev_defined:
-                    del section[option_name]
+        # expected subsections:
+        for subsection_name, subsection_plan in section_plan.subsections:
+            if section.has_option(subsection_name):
+                validation_section[subsection_name] = UnexpectedOptionError(
+                    "unexpected option {} (expecting section)".format(subsection_name))
             else:
-                if option.value is not prev_value:
-                    if prev_defined or not self._use_defaults:
-                        section[option_name] = option.value
-                    else:
-                        section_defaults[option_name] = option.value
-
+                if section.has_section(subsection_name):
+                    subsection = section.get_section(subsection_name)
+                else:
+                    subsection = section.add_section(subsection_name)
+                sub_validation_section = ValidationSection()
+                self._validate_section(subsection_plan, subsection, sub_validation_section,
+                                       raise_on_error, parent_fqname + subsection_name + '.')
+                if sub_validation_section:
+                    validation_section[subsection_name] = sub_validation_section
+        # unexpected subsections:
+        expected_section_names = section_plan.expected_section_names
+        for subsection_name, subsection in list(section.sections()):
+            if subsection_name not in expected_section_names:
+                unexpected_plan = self._unexpected_plans[id(section_plan.unexpected_option_validator)]
+                sub_validation_section = ValidationSection()
+                self._validate_section(unexpected_plan, section[subsection_name], sub_validation_section,
+                                       raise_on_error, parent_fqname + subsection_name + '.')
+                if sub_validation_section:
+                    validation_section[subsection_name] = sub_validation_section
 
+    def __repr__(self):
+        return "{}(<{} entries>)".format(self.__class__.__name__, len(self._entries))
@@ -52,6 +52,7 @@ __author__ = "Simone Campagna"
 __copyright__ = 'Copyright (c) 2015 Simone Campagna'
 __license__ = 'Apache License Version 2.0'
 __all__ = [
+    'MacroCycleError',
     'Section',
     'iter_section_options',
     'count_section_options',
@@ -60,14 +61,31 @@ __all__ = [
 ]
 
 import collections
+import contextlib
 import sys
 
+from .toolbox.dependency_cache import DependencyCache
 from .toolbox.macro import Macro
 from .toolbox.dictutils import as_dict
 from .toolbox.identifier import is_valid_identifier
 from .toolbox.serializer import Serializer
 
 
+class MacroCycleError(RuntimeError):
+    """Raised when a macro option refers to itself, directly or through other
+       macro options.
+
+       Parameters
+       ----------
+       cycle: tuple
+           the option paths forming the cycle
+    """
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__("macro cycle: {}".format(
+            ' -> '.join('.'.join(path) for path in cycle)))
+
+
 class Section(collections.MutableMapping):  # pylint: disable=too-many-public-methods
     """Dictionary-like object implementing storage of options/sections. The
        internal representation is stored onto a standard dictionary, which can
@@ -85,13 +103,32 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
            the section name
        macros: bool, optional
            enables macros
+       trusted_reads: bool, optional
+           if True, option values are type-checked only when they are set;
+           reading a non-macro option does not check it again (defaults to False)
+       cache_macros: bool, optional
+           if True, the values of macro options are cached until one of the
+           options they depend on is changed (defaults to False); it is used only
+           by root sections
     """
     SUPPORTED_SEQUENCE_TYPES = (list, tuple)
     SUPPORTED_SCALAR_TYPES = (int, float, bool, str, type(None))
-
-    def __init__(self, init=None, *, dictionary=None, parent=None, name=None, macros=True):
+    # state used only by root (and reference root) sections; these class
+    # defaults are shadowed by instance attributes on first write, so that
+    # subsections do not allocate them:
+    _generation = 0  # modification counter
+    _changes = None  # changed paths
+    _validation_state = None  # incremental validation state
+    _macro_stack = None  # macros being evaluated
+
+    def __init__(self, init=None, *, dictionary=None, parent=None, name=None, macros=True,
+                 trusted_reads=False, cache_macros=False):
+        self._subsection_cache = {}
+        self._macro_cache = None
         self._macros = None
         self.macros = macros
+        self._trusted_reads = None
+        self.trusted_reads = trusted_reads
         if dictionary is None:
             dictionary = self._dictionary_factory()
         self._dictionary = dictionary
@@ -103,6 +140,8 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
             self._parent = parent
             self._root = self._parent.root
             self._fqname = self._parent.fqname + (name,)
+        if cache_macros and parent is None:
+            self._macro_cache = DependencyCache()
         # the reference root for ROOT and SECTION:
         if init:
             self.update(init)
@@ -138,7 +177,7 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
         |Section|
             the root section
         """
-        return self._parent
+        return self._root
 
     @property
     def fqname(self):
@@ -151,6 +190,18 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
         """
         return self._fqname
 
+    @property
+    def generation(self):
+        """Returns the modification counter of the root section; it is
+           incremented at each change.
+
+        Returns
+        -------
+        int
+            the modification counter
+        """
+        return self._root._generation  # pylint: disable=protected-access
+
     @property
     def macros(self):
         """Returns True if macros are enabled
@@ -172,6 +223,97 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
             enabled/disabled
         """
         self._macros = bool(value)
+        self._clear_subsection_cache()
+
+    @property
+    def trusted_reads(self):
+        """Returns True if stored option values are trusted on read
+
+        Returns
+        -------
+        bool
+            enabled/disabled
+        """
+        return self._trusted_reads
+
+    @trusted_reads.setter
+    def trusted_reads(self, value):
+        """Enables/disables trusted reads
+
+        Parameters
+        ----------
+        value: bool
+            enabled/disabled
+        """
+        self._trusted_reads = bool(value)
+        self._clear_subsection_cache()
+
+    @property
+    def cache_macros(self):
+        """Returns True if macro values are cached (the setting belongs to the root section)
+
+        Returns
+        -------
+        bool
+            enabled/disabled
+        """
+        return self._root._macro_cache is not None  # pylint: disable=protected-access
+
+    @cache_macros.setter
+    def cache_macros(self, value):
+        """Enables/disables caching of macro values
+
+        Parameters
+        ----------
+        value: bool
+            enabled/disabled
+        """
+        root = self._root
+        if not value:
+            root._macro_cache = None  # pylint: disable=protected-access
+        elif root._macro_cache is None:  # pylint: disable=protected-access
+            root._macro_cache = DependencyCache()  # pylint: disable=protected-access
+
+    @contextlib.contextmanager
+    def caching_macros(self):
+        """Context manager to temporarily enable the macro cache of the
+           reference root. It is used to evaluate many macros at once:
+           each macro value is computed only once, after the values it
+           depends on.
+
+           Yields
+           ------
+           self
+               the section itself
+        """
+        reference_root = self.get_reference_root()
+        # pylint: disable=protected-access
+        if isinstance(reference_root, Section) and reference_root._macro_cache is None:
+            reference_root._macro_cache = DependencyCache()
+            try:
+                yield self
+            finally:
+                reference_root._macro_cache = None
+        else:
+            yield self
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Context manager to buffer the writes to the internal dictionary,
+           if it supports batches (for instance |FlatMap|). It is used for
+           bulk updates.
+
+           Yields
+           ------
+           self
+               the section itself
+        """
+        batch = getattr(self._dictionary, 'batch', None)
+        if batch is None:
+            yield self
+        else:
+            with batch():
+                yield self
 
     @classmethod
     def _subsection_class(cls):
@@ -194,8 +336,44 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
         """
         return self._subsection_class()(dictionary=dictionary, parent=self,
                                         macros=self._macros,
+                                        trusted_reads=self._trusted_reads,
                                         name=section_name)
 
+    def _cached_subsection(self, section_name, dictionary):
+        """Returns the cached subsection view for 'section_name'; a new subsection
+           is built if the cache is empty or if it refers to a different dictionary.
+
+           Parameters
+           ----------
+           section_name: str
+               the section name
+           dictionary: |Mapping|
+               the subsection's internal dictionary
+
+           Returns
+           -------
+           subsection_class
+               a subsection_class instance
+        """
+        subsection = self._subsection_cache.get(section_name, None)
+        if subsection is None or subsection.dictionary is not dictionary:
+            subsection = self._subsection(section_name=section_name, dictionary=dictionary)
+            self._subsection_cache[section_name] = subsection
+        return subsection
+
+    def _clear_subsection_cache(self, section_name=None):
+        """Drops cached subsection views.
+
+           Parameters
+           ----------
+           section_name: str, optional
+               the section name (if None, the whole cache is dropped)
+        """
+        if section_name is None:
+            self._subsection_cache.clear()
+        else:
+            self._subsection_cache.pop(section_name, None)
+
     @classmethod
     def _dictionary_factory(cls):
         """Factory for new dictionaries.
@@ -217,18 +395,24 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
         """
         return self._root
 
-    def evaluate_option_value(self, value):
-        """Evaluates an option's value.
+    def evaluate_option_value(self, value, key=None):
+        """Evaluates an option's value. If the option name 'key' is available,
+           cyclic macro references are detected, and if the reference root caches
+           macros, the cached value is used.
 
            Parameters
            ----------
            value: |any|
                the option value
+           key: str, optional
+               the option name
 
            Raises
            ------
            ValueError
                cannot evaluate (macros are disabled)
+           MacroCycleError
+               the macro refers to itself
 
            Returns
            -------
@@ -238,13 +422,179 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
         if isinstance(value, Macro):
             if self._macros:
                 reference_root = self.get_reference_root()
-                section_getter = lambda: get_section_value(reference_root, *self._fqname)
-                value = value.evaluate({'SECTION': section_getter, 'ROOT': reference_root})
+                if key is not None and isinstance(reference_root, Section):
+                    path = self._fqname + (key,)
+                    macro_stack = reference_root._macro_stack  # pylint: disable=protected-access
+                    if macro_stack is None:
+                        macro_stack = reference_root._macro_stack = collections.OrderedDict()
+                    if path in macro_stack:
+                        cycle = tuple(macro_stack)
+                        cycle = cycle[cycle.index(path):] + (path,)
+                        raise MacroCycleError(cycle)
+                    macro_stack[path] = None
+                    try:
+                        if reference_root._macro_cache is not None:  # pylint: disable=protected-access
+                            value = self._evaluate_cached_macro(value, path, reference_root)
+                        else:
+                            value = self._evaluate_macro(value, reference_root)
+                    finally:
+                        macro_stack.popitem()
+                else:
+                    value = self._evaluate_macro(value, reference_root)
             else:
                 raise ValueError("cannot evaluate {}: macros are not enabled".format(
                     value.unparse()))
         return value
 
+    def _evaluate_macro(self, macro, reference_root):
+        """Evaluates a macro through its compiled function.
+
+           Parameters
+           ----------
+           macro: |Macro|
+               the macro
+           reference_root: |Section|
+               the section to be used as ROOT
+
+           Returns
+           -------
+           |any|
+               the evaluated value
+        """
+        if reference_root is self._root:
+            section_getter = lambda: self
+        else:
+            section_getter = lambda: get_section_value(reference_root, *self._fqname)
+        return macro.compile()({'SECTION': section_getter, 'ROOT': reference_root})
+
+    def _evaluate_cached_macro(self, macro, path, reference_root):
+        """Evaluates the macro value of option 'path' using the reference root's cache.
+           The option paths read during evaluation are recorded as dependencies.
+
+           Parameters
+           ----------
+           macro: |Macro|
+               the macro
+           path: tuple
+               the option path
+           reference_root: |Section|
+               the section to be used as ROOT
+
+           Returns
+           -------
+           |any|
+               the evaluated value
+        """
+        macro_cache = reference_root._macro_cache  # pylint: disable=protected-access
+        macro_cache.validate(reference_root._macro_cache_stamp())  # pylint: disable=protected-access
+        found, value = macro_cache.lookup(path, macro)
+        if not found:
+            with macro_cache.recording() as dependencies:
+                value = self._evaluate_macro(macro, reference_root)
+            macro_cache.store(path, macro, value, dependencies)
+        if isinstance(value, list):
+            # the cached value must not be changed by the caller:
+            value = list(value)
+        return value
+
+    def _macro_cache_stamp(self):  # pylint: disable=no-self-use
+        """Returns a stamp for the content which macro values can depend on,
+           but which is not tracked as option dependencies.
+           A change in the stamp invalidates all the cached macro values.
+
+           Returns
+           -------
+           |any|
+               the stamp
+        """
+        return None
+
+    def _record_read(self, key):
+        """Records option/section 'key' as a dependency of the macro being evaluated.
+
+           Parameters
+           ----------
+           key: str
+               the key
+        """
+        macro_cache = self._root._macro_cache  # pylint: disable=protected-access
+        if macro_cache is not None and macro_cache.is_recording:
+            macro_cache.record(self._fqname + (key,))
+
+    def _record_path(self, keys):
+        """Records all the option/section paths traversed by 'keys' as dependencies
+           of the macro being evaluated.
+
+           Parameters
+           ----------
+           keys: tuple
+               the keys
+        """
+        macro_cache = self._root._macro_cache  # pylint: disable=protected-access
+        if macro_cache is not None and macro_cache.is_recording:
+            for index in range(1, len(keys) + 1):
+                macro_cache.record(self._fqname + keys[:index])
+
+    def _invalidate_macros(self, key=None):
+        """Drops the cached macro values depending on option/section 'key'
+           (on all the section content if 'key' is None).
+
+           Parameters
+           ----------
+           key: str, optional
+               the key
+        """
+        macro_cache = self._root._macro_cache  # pylint: disable=protected-access
+        if macro_cache is not None:
+            if key is not None:
+                macro_cache.invalidate(self._fqname + (key,))
+            elif self._fqname:
+                for section_key in self._dictionary.keys():
+                    macro_cache.invalidate(self._fqname + (section_key,))
+            else:
+                macro_cache.clear()
+
+    def _record_change(self, key=None):
+        """Records a change of option/section 'key' (of all the section content
+           if 'key' is None): the modification counter is incremented, and, if
+           changes are tracked, the changed path is recorded.
+
+           Parameters
+           ----------
+           key: str, optional
+               the key
+        """
+        root = self._root
+        root._generation += 1  # pylint: disable=protected-access
+        changes = root._changes  # pylint: disable=protected-access
+        if changes is not None:
+            if key is None:
+                changes.add(self._fqname)
+            else:
+                changes.add(self._fqname + (key,))
+
+    def track_changes(self):
+        """Starts tracking the changed option/section paths of the root section,
+           and drops the paths tracked so far.
+        """
+        self._root._changes = set()  # pylint: disable=protected-access
+
+    def get_changes(self):
+        """Returns the option/section paths changed since the last call to
+           'track_changes()' (a changed section path means that all its
+           content could be changed).
+           Only changes done through the Section interface are tracked.
+
+           Returns
+           -------
+           frozenset
+               the changed paths, or None if changes are not tracked
+        """
+        changes = self._root._changes  # pylint: disable=protected-access
+        if changes is None:
+            return None
+        return frozenset(changes)
+
     def _check_option(self, key, value):
         """Checks the option type. Raises in case of errors.
 
@@ -283,23 +633,84 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
 
     def __getitem__(self, key):
         value = self._dictionary[key]
+        self._record_read(key)
         if isinstance(value, collections.Mapping):
-            return self._subsection(section_name=key, dictionary=value)
+            return self._cached_subsection(section_name=key, dictionary=value)
+        elif self._trusted_reads and not isinstance(value, Macro):
+            # already checked by __setitem__
+            return value
         else:
-            value = self.evaluate_option_value(value)
+            value = self.evaluate_option_value(value, key=key)
             self._check_option(key=key, value=value)
             return value
 
+    def _path_dictionaries(self):
+        """Returns the dictionaries used by get_path_value: the section
+           dictionary and the defaults dictionary (or None).
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (dictionary, defaults dictionary)
+        """
+        return self._dictionary, None
+
+    def get_path_value(self, keys):
+        """Returns the value for a tuple of keys; it is equivalent to
+           get_section_value(self, *keys), but option values are looked up
+           directly in the internal dictionaries (and in the defaults),
+           without building the intermediate subsections.
+           Sections and macro options are returned through the standard lookup.
+
+           Parameters
+           ----------
+           keys: tuple
+               the keys for successive gets
+
+           Returns
+           -------
+           |any|
+               the value
+        """
+        if not keys:
+            return self
+        dictionary, defaults_dictionary = self._path_dictionaries()
+        for key in keys[:-1]:
+            dictionary = dictionary.get(key, None)
+            if not isinstance(dictionary, collections.Mapping):
+                # not a section, or a section available only in defaults:
+                return get_section_value(self, *keys)
+            if defaults_dictionary is not None:
+                defaults_dictionary = defaults_dictionary.get(key, None)
+                if not isinstance(defaults_dictionary, collections.Mapping):
+                    defaults_dictionary = None
+        key = keys[-1]
+        if key in dictionary:
+            value = dictionary[key]
+        elif defaults_dictionary is not None and key in defaults_dictionary:
+            value = defaults_dictionary[key]
+        else:
+            return get_section_value(self, *keys)
+        if isinstance(value, (collections.Mapping, Macro)):
+            return get_section_value(self, *keys)
+        self._record_path(keys)
+        if not self._trusted_reads:
+            self._check_option(key=key, value=value)
+        return value
+
     def __setitem__(self, key, value):
         if not isinstance(key, str):
             raise TypeError("invalid key {!r} of non-string type {}".format(key, type(key).__name__))
         elif not is_valid_identifier(key):
             raise ValueError("invalid key {!r}: malformed identifier".format(key))
+        self._clear_subsection_cache(key)
+        self._invalidate_macros(key)
+        self._record_change(key)
         if isinstance(value, collections.Mapping):
             if self.has_option(key):
                 raise TypeError("option {} cannot be replaced with a section".format(key))
             self._dictionary[key] = self._dictionary_factory()
-            section = self._subsection(section_name=key, dictionary=self._dictionary[key])
+            section = self._cached_subsection(section_name=key, dictionary=self._dictionary[key])
             section.update(value)
         else:
             if self.has_section(key):
@@ -313,11 +724,17 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
             self._dictionary[key] = value
 
     def __delitem__(self, key):
+        self._clear_subsection_cache(key)
+        self._invalidate_macros(key)
+        self._record_change(key)
         del self._dictionary[key]
 
     def clear(self):
         """Clears all the section's content.
         """
+        self._clear_subsection_cache()
+        self._invalidate_macros()
+        self._record_change()
         self._dictionary.clear()
 
     def copy(self):
@@ -473,7 +890,7 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
     def items(self):
         for key, value in self._dictionary.items():
             if isinstance(value, collections.Mapping):
-                value = self._subsection(section_name=key, dictionary=value)
+                value = self._cached_subsection(section_name=key, dictionary=value)
             yield key, value
 
     def keys(self):
@@ -500,15 +917,16 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
             \*\*kwargs: |Mapping|
                 additional key-value items
         """
-        if dictionary:
-            if isinstance(dictionary, collections.Mapping):
-                iterable = dictionary.items()
-            else:
-                iterable = dictionary
-            for key, value in iterable:
+        with self.batch():
+            if dictionary:
+                if isinstance(dictionary, collections.Mapping):
+                    iterable = dictionary.items()
+                else:
+                    iterable = dictionary
+                for key, value in iterable:
+                    self[key] = value
+            for key, value in kwargs.items():
                 self[key] = value
-        for key, value in kwargs.items():
-            self[key] = value
 
     def as_dict(self, *, dict_class=collections.OrderedDict, defaults=True, evaluate=True):
         """Returns a dict copy of all the section content.
@@ -524,14 +942,15 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
         """
         result = dict_class()
         subsection_class = self._subsection_class()
-        for key, value in self.items():
-            if isinstance(value, subsection_class):
-                result[key] = value.as_dict(dict_class=dict_class, defaults=defaults,
-                                            evaluate=evaluate)
-            else:
-                if evaluate:
-                    value = self.evaluate_option_value(value)
-                result[key] = value
+        with self.caching_macros():
+            for key, value in self.items():
+                if isinstance(value, subsection_class):
+                    result[key] = value.as_dict(dict_class=dict_class, defaults=defaults,
+                                                evaluate=evaluate)
+                else:
+                    if evaluate:
+                        value = self.evaluate_option_value(value, key=key)
+                    result[key] = value
         return result
 
     def __repr__(self):
@@ -559,6 +978,83 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
             return True
         return False
 
+    def _iter_serialization_items(self, defaults):
+        """Iterates over the items to be serialized (macros are not evaluated,
+           subsections are lazy serialization views).
+
+           Parameters
+           ----------
+           defaults: bool
+               if True, include default values
+
+           Yields
+           ------
+           tuple
+               a 2-tuple containing (key, value)
+        """
+        for key, value in self._dictionary.items():
+            yield key, self._serialization_value(key, value, defaults)
+
+    def _serialization_value(self, key, value, defaults):
+        """Returns the value to be serialized for a raw dictionary value.
+
+           Parameters
+           ----------
+           key: str
+               the key
+           value: |any|
+               the raw value
+           defaults: bool
+               if True, include default values
+
+           Returns
+           -------
+           |any|
+               the value, or a serialization view for subsections
+        """
+        if isinstance(value, collections.Mapping):
+            subsection = self._cached_subsection(section_name=key, dictionary=value)
+            value = subsection.serialization_view(defaults=defaults)
+        return value
+
+    def serialization_view(self, *, defaults=False):
+        """Returns a read-only mapping view of the content to be serialized:
+           it has the same items as 'as_dict(defaults=defaults, evaluate=False)',
+           but the section content is not copied.
+
+           Parameters
+           ----------
+           defaults: bool, optional
+               if True, include default values (defaults to False)
+
+           Returns
+           -------
+           Mapping
+               the serialization view
+        """
+        return _SerializationView(self, defaults=defaults)
+
+    def serialization_object(self, serializer, *, defaults=False):
+        """Returns the object to be passed to 'serializer': a serialization
+           view for streaming serializers, a dict copy for the other ones.
+
+           Parameters
+           ----------
+           serializer: |Serializer|
+               the serializer
+           defaults: bool, optional
+               if True, include default values (defaults to False)
+
+           Returns
+           -------
+           Mapping
+               the object to be serialized
+        """
+        if serializer.is_streaming():
+            return self.serialization_view(defaults=defaults)
+        else:
+            return self.as_dict(defaults=defaults, evaluate=False)
+
     def dump(self, stream=None, protocol="zirkon", *, defaults=False):
         """Dumps the content to a stream.
 
@@ -567,17 +1063,52 @@ class Section(collections.MutableMapping):  # pylint: disable=too-many-public-me
            stream: file, optional
                the stream where to write (defaults to sys.stdout)
            protocol: str, optional
-               the protocol (defaults to "zirkon")
+               the protocol, or a serializer instance (defaults to "zirkon")
            defaults: bool, optional
                if True, dump defaults too
         """
         if stream is None:
             stream = sys.stdout
-        serializer = Serializer.get_class(protocol)()
-        obj = self.as_dict(defaults=defaults, evaluate=False)
+        if isinstance(protocol, Serializer):
+            serializer = protocol
+        else:
+            serializer = Serializer.get_class(protocol)()
+        obj = self.serialization_object(serializer, defaults=defaults)
         serializer.to_stream(stream=stream, obj=obj)
 
 
+class _SerializationView(collections.Mapping):
+    """Read-only lazy view of the section content to be serialized.
+
+       Parameters
+       ----------
+       section: |Section|
+           the section
+       defaults: bool
+           if True, include default values
+    """
+    def __init__(self, section, defaults):
+        self._section = section
+        self._defaults = defaults
+
+    def items(self):
+        # pylint: disable=protected-access
+        yield from self._section._iter_serialization_items(defaults=self._defaults)
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def __len__(self):
+        return sum(1 for _ in self.items())
+
+    def __getitem__(self, key):
+        for item_key, value in self.items():
+            if item_key == key:
+                return value
+        raise KeyError(key)
+
+
 def iter_section_options(section):
     """Iterates recursively on all option items.
 
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Implementation of the SQLiteDictionary class, a persistent flat dictionary
+stored in a sqlite3 database. It can be used as FlatMap dictionary:
+
+>>> from zirkon.flatmap import FlatMap
+>>> from zirkon.config import Config
+>>> with SQLiteDictionary(':memory:') as dictionary:
+...     config = Config(dictionary=FlatMap(dictionary))
+...     config['x'] = 10
+...     config['sub'] = {'y': 20}
+...     config.dump()
+...     sorted(dictionary.keys())
+x = 10
+[sub]
+    y = 20
+['sub.', 'sub.y', 'x']
+>>>
+"""
+
+__author__ = "Simone Campagna"
+__copyright__ = 'Copyright (c) 2015 Simone Campagna'
+__license__ = 'Apache License Version 2.0'
+__all__ = [
+    'SQLiteDictionary',
+]
+
+import collections
+import contextlib
+import pickle
+import sqlite3
+
+from .toolbox.identifier import is_valid_identifier
+
+
+class SQLiteDictionary(collections.MutableMapping):
+    """SQLiteDictionary is a mapping with str keys stored in a sqlite3 table.
+       Keys are indexed, and the table stores for each key the prefix of its
+       FlatMap submap: so key lookups are O(log n), and FlatMap submap
+       iteration is a range scan on the prefix index.
+
+       The database is opened in WAL mode, so many processes can read it
+       while it is written. Each change is committed immediately, unless it
+       is done inside 'transaction()'.
+
+       int, float, str and None values are stored as sqlite values; all the
+       other values (bool, list, tuple, macros...) are pickled, so the database
+       must be trusted as a pickle file.
+
+       Parameters
+       ----------
+       filename: str
+           the database filename (':memory:' for an in-memory database)
+       table: str, optional
+           the table name (defaults to 'zirkon')
+       dot: str, optional
+           the FlatMap key separator (defaults to '.')
+       timeout: float, optional
+           the time to wait for locks held by other connections (defaults to 5.0)
+    """
+    PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+    SQL_TYPES = (int, float, str, type(None))
+    SQL_INT_RANGE = (-2 ** 63, 2 ** 63)
+
+    def __init__(self, filename, *, table='zirkon', dot='.', timeout=5.0):
+        if not is_valid_identifier(table):
+            raise ValueError("invalid table name {!r}".format(table))
+        self._filename = filename
+        self._table = table
+        self._dot = dot
+        self._depth = 0
+        self._connection = sqlite3.connect(filename, timeout=timeout)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS {t} ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "key TEXT NOT NULL UNIQUE, "
+            "prefix TEXT NOT NULL, "
+            "value)".format(t=table))
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS {t}_prefix ON {t} (prefix, seq)".format(t=table))
+        self._connection.commit()
+
+    @property
+    def filename(self):
+        """Returns the database filename
+
+        Returns
+        -------
+        str
+            the filename
+        """
+        return self._filename
+
+    @property
+    def table(self):
+        """Returns the table name
+
+        Returns
+        -------
+        str
+            the table name
+        """
+        return self._table
+
+    def _execute(self, query, parameters=()):
+        """Executes a query on the table.
+
+           Parameters
+           ----------
+           query: str
+               the query ('{t}' is replaced by the table name)
+           parameters: tuple, optional
+               the query parameters
+
+           Returns
+           -------
+           sqlite3.Cursor
+               the cursor
+        """
+        return self._connection.execute(query.format(t=self._table), parameters)
+
+    def _commit(self):
+        """Commits the changes, if no transaction is active."""
+        if not self._depth:
+            self._connection.commit()
+
+    def _split(self, key):
+        """Returns the submap prefix for key.
+
+           Parameters
+           ----------
+           key: str
+               the key
+
+           Returns
+           -------
+           str
+               the prefix
+        """
+        return key[:key.rfind(self._dot, 0, len(key) - 1) + 1]
+
+    @classmethod
+    def _encode(cls, value):
+        """Encodes a value.
+
+           Parameters
+           ----------
+           value: |any|
+               the value
+
+           Returns
+           -------
+           |any|
+               the sqlite value
+        """
+        if type(value) in cls.SQL_TYPES:  # pylint: disable=unidiomatic-typecheck
+            if not isinstance(value, int) or cls.SQL_INT_RANGE[0] <= value < cls.SQL_INT_RANGE[1]:
+                return value
+        return sqlite3.Binary(pickle.dumps(value, protocol=cls.PICKLE_PROTOCOL))
+
+    @classmethod
+    def _decode(cls, value):
+        """Decodes a value.
+
+           Parameters
+           ----------
+           value: |any|
+               the sqlite value
+
+           Returns
+           -------
+           |any|
+               the value
+        """
+        if isinstance(value, bytes):
+            return pickle.loads(value)
+        return value
+
+    def __getitem__(self, key):
+        row = self._execute("SELECT value FROM {t} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self._decode(row[0])
+
+    def __setitem__(self, key, value):
+        if not isinstance(key, str):
+            raise TypeError("invalid key {!r} of non-string type {}".format(key, type(key).__name__))
+        value = self._encode(value)
+        cursor = self._execute("UPDATE {t} SET value = ? WHERE key = ?", (value, key))
+        if cursor.rowcount == 0:
+            self._execute("INSERT INTO {t} (key, prefix, value) VALUES (?, ?, ?)",
+                          (key, self._split(key), value))
+        self._commit()
+
+    def __delitem__(self, key):
+        cursor = self._execute("DELETE FROM {t} WHERE key = ?", (key,))
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+        self._commit()
+
+    def __contains__(self, key):
+        return self._execute("SELECT 1 FROM {t} WHERE key = ?", (key,)).fetchone() is not None
+
+    def __iter__(self):
+        for row in self._execute("SELECT key FROM {t} ORDER BY seq").fetchall():
+            yield row[0]
+
+    def __len__(self):
+        return self._execute("SELECT COUNT(*) FROM {t}").fetchone()[0]
+
+    def clear(self):
+        self._execute("DELETE FROM {t}")
+        self._commit()
+
+    def children(self, prefix):
+        """Returns the relative keys of the items with the given submap prefix,
+           in insertion order.
+
+           Parameters
+           ----------
+           prefix: str
+               the submap prefix
+
+           Returns
+           -------
+           list
+               the relative keys
+        """
+        rows = self._execute("SELECT key FROM {t} WHERE prefix = ? ORDER BY seq", (prefix,)).fetchall()
+        return [row[0][len(prefix):] for row in rows]
+
+    def prefix_index(self, dot):
+        """Returns the prefix index to be used by FlatMap.
+
+           Parameters
+           ----------
+           dot: str
+               the FlatMap key separator
+
+           Raises
+           ------
+           ValueError
+               the key separator does not match
+
+           Returns
+           -------
+           _SQLitePrefixIndex
+               the prefix index
+        """
+        if dot != self._dot:
+            raise ValueError("invalid key separator {!r}: the dictionary uses {!r}".format(dot, self._dot))
+        return _SQLitePrefixIndex(self)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Context manager for transactions: changes are committed on exit,
+           or rolled back on error. Transactions can be nested (only the
+           outermost one commits).
+
+           Yields
+           ------
+           self
+               the dictionary itself
+        """
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            if not self._depth:
+                self._connection.rollback()
+            raise
+        else:
+            self._depth -= 1
+            self._commit()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Context manager deferring commits: changes are committed on exit,
+           also on error (so, unlike 'transaction()', the changes done before
+           the error are kept). It is used by 'FlatMap.batch()'.
+
+           Yields
+           ------
+           self
+               the dictionary itself
+        """
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            self._commit()
+
+    def commit(self):
+        """Commits the pending changes."""
+        self._connection.commit()
+
+    def close(self):
+        """Commits the pending changes and closes the database."""
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return "{}(filename={!r}, table={!r})".format(self.__class__.__name__, self._filename, self._table)
+
+
+class _SQLitePrefixIndex(object):
+    """FlatMap prefix index for a SQLiteDictionary: the index is stored
+       in the database itself, so add and remove do nothing.
+
+       Parameters
+       ----------
+       dictionary: |SQLiteDictionary|
+           the dictionary
+    """
+    def __init__(self, dictionary):
+        self._dictionary = dictionary
+
+    def children(self, prefix):
+        """Returns the relative keys of the items of submap 'prefix'.
+
+           Parameters
+           ----------
+           prefix: str
+               the submap prefix
+
+           Returns
+           -------
+           list
+               the relative keys
+        """
+        return self._dictionary.children(prefix)
+
+    def add(self, abs_key):
+        """Adds a key (nothing to do).
+
+           Parameters
+           ----------
+           abs_key: str
+               the absolute key
+        """
+        # the prefix column keeps the SQL index up to date
+
+    def remove(self, abs_key):
+        """Removes a key (nothing to do).
+
+           Parameters
+           ----------
+           abs_key: str
+               the absolute key
+        """
+        # the prefix column keeps the SQL index up to date
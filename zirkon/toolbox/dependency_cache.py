@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""\
+Implementation of the DependencyCache class, a memo cache whose entries
+are dropped when one of the keys they have been computed from is changed.
+
+>>> cache = DependencyCache()
+>>> data = {'a': 2, 'b': 3}
+>>> def compute():
+...     cache.record('a')
+...     cache.record('b')
+...     return data['a'] * data['b']
+>>> with cache.recording() as dependencies:
+...     value = compute()
+>>> cache.store('c', 'source', value, dependencies)
+>>> cache.lookup('c', 'source')
+(True, 6)
+>>> cache.invalidate('b')
+>>> cache.lookup('c', 'source')
+(False, None)
+>>>
+"""
+
+__author__ = "Simone Campagna"
+__copyright__ = 'Copyright (c) 2015 Simone Campagna'
+__license__ = 'Apache License Version 2.0'
+__all__ = [
+    'DependencyCache',
+]
+
+import collections
+import contextlib
+
+
+_Entry = collections.namedtuple('_Entry', ('source', 'value', 'dependencies'))
+
+
+class DependencyCache(object):
+    """Memo cache tracking dependencies. While a value is being computed
+       inside the 'recording()' context, every key passed to 'record(key)'
+       is collected as a dependency; the value is then stored with
+       'store(...)', and it is dropped by 'invalidate(key)' as soon as the key
+       itself or one of its dependencies is invalidated.
+
+       Recordings can be nested: dependencies of an inner recording, and of the
+       cached entries found by 'lookup(...)', are also dependencies of the
+       outer one.
+
+       Each entry is stored along with a 'source' object (for instance the
+       expression that has been evaluated): 'lookup(...)' finds an entry only
+       if it has been computed from the very same source.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._dependents = {}
+        self._frames = []
+        self._stamp = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def is_recording(self):
+        """Returns True if dependencies are currently recorded.
+
+           Returns
+           -------
+           bool
+               True if a recording is active
+        """
+        return bool(self._frames)
+
+    def record(self, key):
+        """Records a dependency for the current recording (if any).
+
+           Parameters
+           ----------
+           key: |any|
+               the dependency key (must be hashable)
+        """
+        if self._frames:
+            self._frames[-1].add(key)
+
+    @contextlib.contextmanager
+    def recording(self):
+        """Context manager recording dependencies.
+
+           Yields
+           ------
+           set
+               the set of recorded dependencies
+        """
+        dependencies = set()
+        self._frames.append(dependencies)
+        try:
+            yield dependencies
+        finally:
+            self._frames.pop()
+            if self._frames:
+                self._frames[-1].update(dependencies)
+
+    def lookup(self, key, source):
+        """Looks for the entry 'key' computed from 'source'.
+
+           Parameters
+           ----------
+           key: |any|
+               the entry key
+           source: |any|
+               the source object
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (found, value)
+        """
+        entry = self._entries.get(key, None)
+        if entry is not None and entry.source is source:
+            if self._frames:
+                self._frames[-1].update(entry.dependencies)
+            return True, entry.value
+        return False, None
+
+    def store(self, key, source, value, dependencies):
+        """Stores a new entry.
+
+           Parameters
+           ----------
+           key: |any|
+               the entry key
+           source: |any|
+               the source object
+           value: |any|
+               the value
+           dependencies: iterable
+               the dependency keys
+        """
+        dependencies = frozenset(dependencies)
+        self._entries[key] = _Entry(source=source, value=value, dependencies=dependencies)
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(key)
+
+    def invalidate(self, key):
+        """Drops the entry 'key' and all the entries depending on 'key'.
+
+           Parameters
+           ----------
+           key: |any|
+               the changed key
+        """
+        self._entries.pop(key, None)
+        for dependent_key in self._dependents.pop(key, ()):
+            self._entries.pop(dependent_key, None)
+
+    def validate(self, stamp):
+        """Clears the cache if 'stamp' differs from the stamp of the last validation.
+           It can be used to invalidate all the entries when something not tracked
+           as a dependency has changed (for instance, a modification counter).
+
+           Parameters
+           ----------
+           stamp: |any|
+               the stamp
+        """
+        if stamp != self._stamp:
+            self.clear()
+            self._stamp = stamp
+
+    def clear(self):
+        """Drops all the entries.
+        """
+        self._entries.clear()
+        self._dependents.clear()
+        self._stamp = None
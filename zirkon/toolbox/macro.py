@@ -18,6 +18,24 @@
 """\
 Implementation of the Macro abstract base class for evaluation of Macros. A Macro is
 a python expression whose binding and evaluation can be deferred.
+
+A Macro can be compiled to a python function; the compiled function is
+equivalent to the 'evaluate' method, but it does not walk the expression tree:
+
+>>> x = MName('x')
+>>> macro = 3 * x + 1
+>>> compiled = macro.compile()
+>>> compiled({'x': 2})
+7
+>>> compiled({'x': 10}) == macro.evaluate({'x': 10})
+True
+>>>
+
+Const subexpressions can be folded:
+
+>>> (x * (MConst(2) ** 10)).optimize()
+x * 1024
+>>>
 """
 
 __author__ = "Simone Campagna"
@@ -31,12 +49,14 @@ __all__ = [
 ]
 
 import abc
+import keyword
 
 
 class Macro(metaclass=abc.ABCMeta):
     """Abstract base class to compose generic expressions.
        Concrete classes must implement the evaluate(globals_d=None) method.
     """
+    CONST_FOLDING = False
     PRIORITY = {
         'MConst': 100000, 'MName': 100000, 'MOr': 1, 'MAnd': 2, 'MNot': 3, 'MContains': 4,
         # 'MIs': 5,
@@ -87,6 +107,57 @@ class Macro(metaclass=abc.ABCMeta):
         """
         return self._impl_unparse_wrap(wrap=False)
 
+    def compile(self):
+        """Compiles the expression to a python function 'function(globals_d=None)',
+           which is equivalent to the 'evaluate' method. The optimized expression
+           is compiled; the compiled function is built once and stored in the
+           macro instance.
+
+           Returns
+           -------
+           function
+               the compiled function
+        """
+        function = self.__dict__.get('_compiled_function', None)
+        if function is None:
+            function = _MacroCompiler().compile(self.optimize())
+            self._compiled_function = function  # pylint: disable=attribute-defined-outside-init
+        return function
+
+    def optimize(self):
+        """Returns an equivalent expression where const subexpressions are
+           folded, and equal subexpressions are shared.
+           Only subexpressions whose operands and value are immutable
+           (numbers, strings, tuples...) are folded; calls and attribute
+           lookups are never folded.
+
+           Returns
+           -------
+           |Macro|
+               the optimized expression
+        """
+        value = _MacroOptimizer().optimize(self)
+        if not isinstance(value, Macro):
+            value = MConst(value)
+        return value
+
+    def _impl_compile(self, compiler):
+        """Implementation of the compile method. Returns a python expression
+           computing the macro value; the default implementation calls the
+           'evaluate' method.
+
+           Parameters
+           ----------
+           compiler: _MacroCompiler
+               the compiler
+
+           Returns
+           -------
+           str
+               the python expression
+        """
+        return compiler.evaluate_call(self)
+
     def _impl_unparse_wrap(self, wrap):
         """If 'wrap' puts output in parenthesis.
 
@@ -399,6 +470,9 @@ class MConst(Macro):
     def evaluate(self, globals_d=None):
         return self._impl_evaluate_operand(operand=self.value, globals_d=globals_d)
 
+    def _impl_compile(self, compiler):
+        return compiler.operand(self.value)
+
     def _impl_unparse(self):
         return self._impl_unparse_operand(self.value)
 
@@ -439,6 +513,12 @@ class MName(Macro):
             raise NameError("name {!r} is not defined".format(self.name))
         return globals_d[self.name]
 
+    def _impl_compile(self, compiler):
+        if self.globals_d is None:
+            return compiler.name(self.name)
+        else:
+            return compiler.evaluate_call(self)
+
     def _impl_unparse(self):
         return self.name
 
@@ -483,6 +563,18 @@ class MCall(Macro):
         n_args = {key: self._impl_evaluate_operand(operand, globals_d) for key, operand in self.n_args.items()}
         return value(*p_args, **n_args)
 
+    def _impl_compile(self, compiler):
+        l_args = [compiler.operand(operand) for operand in self.p_args]
+        kw_args = []
+        for key, operand in self.n_args.items():
+            if key.isidentifier() and not keyword.iskeyword(key):
+                l_args.append("{}={}".format(key, compiler.operand(operand)))
+            else:
+                kw_args.append("{}: {}".format(compiler.const(key), compiler.operand(operand)))
+        if kw_args:
+            l_args.append("**{{{}}}".format(', '.join(kw_args)))
+        return "{}({})".format(compiler.operand(self.functor), ', '.join(l_args))
+
     def _impl_unparse(self):
         l_args = []
         if self.p_args:
@@ -500,6 +592,8 @@ class MUnaryOperator(Macro):
        operand: |any|
            the operand
     """
+    CONST_FOLDING = True
+    COMPILE_FORMAT = None
 
     def __init__(self, operand):
         self.operand = operand
@@ -514,6 +608,11 @@ class MUnaryOperator(Macro):
         value = self._impl_evaluate_operand(operand=self.operand, globals_d=globals_d)
         return self._impl_unary_operation(value)
 
+    def _impl_compile(self, compiler):
+        if self.COMPILE_FORMAT is None:
+            return super()._impl_compile(compiler)
+        return self.COMPILE_FORMAT.format(compiler.operand(self.operand))
+
     @abc.abstractmethod
     def _impl_unary_operation(self, value):
         """Returns the unary operation
@@ -533,6 +632,7 @@ class MUnaryOperator(Macro):
 
 class MAbs(MUnaryOperator):
     """Macro 'abs()' function."""
+    COMPILE_FORMAT = "abs({})"
 
     def _impl_unary_operation(self, value):
         return abs(value)
@@ -543,6 +643,7 @@ class MAbs(MUnaryOperator):
 
 class MPos(MUnaryOperator):
     """Macro '+' unary operator."""
+    COMPILE_FORMAT = "(+{})"
 
     def _impl_unary_operation(self, value):
         return +value
@@ -553,6 +654,7 @@ class MPos(MUnaryOperator):
 
 class MNeg(MUnaryOperator):
     """Macro '-' unary operator."""
+    COMPILE_FORMAT = "(-{})"
 
     def _impl_unary_operation(self, value):
         return -value
@@ -563,6 +665,7 @@ class MNeg(MUnaryOperator):
 
 class MNot(MUnaryOperator):
     """Macro 'not' unary operator."""
+    COMPILE_FORMAT = "(not {})"
 
     def _impl_unary_operation(self, value):
         return not value
@@ -573,6 +676,7 @@ class MNot(MUnaryOperator):
 
 class MLen(MUnaryOperator):
     """Macro 'len' function."""
+    COMPILE_FORMAT = "len({})"
 
     def _impl_unary_operation(self, value):
         return len(value)
@@ -583,6 +687,7 @@ class MLen(MUnaryOperator):
 
 class MStr(MUnaryOperator):
     """Macro 'str' function."""
+    COMPILE_FORMAT = "str({})"
 
     def _impl_unary_operation(self, value):
         return str(value)
@@ -593,6 +698,7 @@ class MStr(MUnaryOperator):
 
 class MRepr(MUnaryOperator):
     """Macro 'repr' function."""
+    COMPILE_FORMAT = "repr({})"
 
     def _impl_unary_operation(self, value):
         return repr(value)
@@ -612,6 +718,8 @@ class MBinaryOperator(Macro):
            the right operand
     """
     BINOP_SYMBOL = None
+    CONST_FOLDING = True
+    COMPILE_FORMAT = None
 
     def __init__(self, left_operand, right_operand):
         self.left_operand = left_operand
@@ -622,6 +730,12 @@ class MBinaryOperator(Macro):
         right_value = self._impl_evaluate_operand(operand=self.right_operand, globals_d=globals_d)
         return self._impl_binary_operation(left_value, right_value)
 
+    def _impl_compile(self, compiler):
+        if self.COMPILE_FORMAT is None:
+            return super()._impl_compile(compiler)
+        return self.COMPILE_FORMAT.format(compiler.operand(self.left_operand),
+                                          compiler.operand(self.right_operand))
+
     @abc.abstractmethod
     def _impl_binary_operation(self, left_value, right_value):
         """Returns the binary operation result.
@@ -659,6 +773,7 @@ class MBinaryOperator(Macro):
 class MAdd(MBinaryOperator):
     """Macro '+' binary operator."""
     BINOP_SYMBOL = '+'
+    COMPILE_FORMAT = "({} + {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value + right_value
@@ -667,6 +782,7 @@ class MAdd(MBinaryOperator):
 class MMul(MBinaryOperator):
     """Macro '*' binary operator."""
     BINOP_SYMBOL = '*'
+    COMPILE_FORMAT = "({} * {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value * right_value
@@ -675,6 +791,7 @@ class MMul(MBinaryOperator):
 class MSub(MBinaryOperator):
     """Macro '-' binary operator."""
     BINOP_SYMBOL = '-'
+    COMPILE_FORMAT = "({} - {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value - right_value
@@ -683,6 +800,7 @@ class MSub(MBinaryOperator):
 class MTrueDiv(MBinaryOperator):
     """Macro '/' binary operator."""
     BINOP_SYMBOL = '/'
+    COMPILE_FORMAT = "({} / {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value / right_value
@@ -691,6 +809,7 @@ class MTrueDiv(MBinaryOperator):
 class MFloorDiv(MBinaryOperator):
     """Macro '//' binary operator."""
     BINOP_SYMBOL = '//'
+    COMPILE_FORMAT = "({} // {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value // right_value
@@ -699,6 +818,7 @@ class MFloorDiv(MBinaryOperator):
 class MMod(MBinaryOperator):
     """Macro '%' binary operator."""
     BINOP_SYMBOL = '%'
+    COMPILE_FORMAT = "({} % {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value % right_value
@@ -706,6 +826,7 @@ class MMod(MBinaryOperator):
 
 class MDivMod(MBinaryOperator):
     """Macro 'divmod' function."""
+    COMPILE_FORMAT = "divmod({}, {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return divmod(left_value, right_value)
@@ -719,6 +840,7 @@ class MDivMod(MBinaryOperator):
 class MPow(MBinaryOperator):
     """Macro '**' binary operator."""
     BINOP_SYMBOL = '**'
+    COMPILE_FORMAT = "({} ** {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value ** right_value
@@ -727,6 +849,7 @@ class MPow(MBinaryOperator):
 class MEq(MBinaryOperator):
     """Macro '==' binary operator."""
     BINOP_SYMBOL = '=='
+    COMPILE_FORMAT = "({} == {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value == right_value
@@ -735,6 +858,7 @@ class MEq(MBinaryOperator):
 class MNe(MBinaryOperator):
     """Macro '!=' binary operator."""
     BINOP_SYMBOL = '!='
+    COMPILE_FORMAT = "({} != {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value != right_value
@@ -743,6 +867,7 @@ class MNe(MBinaryOperator):
 class MLt(MBinaryOperator):
     """Macro '<' binary operator."""
     BINOP_SYMBOL = '<'
+    COMPILE_FORMAT = "({} < {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value < right_value
@@ -751,6 +876,7 @@ class MLt(MBinaryOperator):
 class MLe(MBinaryOperator):
     """Macro '<=' binary operator."""
     BINOP_SYMBOL = '<='
+    COMPILE_FORMAT = "({} <= {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value <= right_value
@@ -759,6 +885,7 @@ class MLe(MBinaryOperator):
 class MGt(MBinaryOperator):
     """Macro '>' binary operator."""
     BINOP_SYMBOL = '>'
+    COMPILE_FORMAT = "({} > {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value > right_value
@@ -767,6 +894,7 @@ class MGt(MBinaryOperator):
 class MGe(MBinaryOperator):
     """Macro '>=' binary operator."""
     BINOP_SYMBOL = '>='
+    COMPILE_FORMAT = "({} >= {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value >= right_value
@@ -774,6 +902,7 @@ class MGe(MBinaryOperator):
 
 class MAnd(MBinaryOperator):
     """Macro 'and' binary operator."""
+    COMPILE_FORMAT = "_macro_and({}, {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value and right_value
@@ -786,6 +915,7 @@ class MAnd(MBinaryOperator):
 
 class MOr(MBinaryOperator):
     """Macro 'or' binary operator."""
+    COMPILE_FORMAT = "_macro_or({}, {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value or right_value
@@ -793,13 +923,25 @@ class MOr(MBinaryOperator):
 
 class MGetattr(MUnaryOperator):
     """Macro 'getattr' function."""
+    CONST_FOLDING = False
+
     def __init__(self, operand, attr_name):
         super().__init__(operand)
         self.attr_name = attr_name
 
+    def __reduce__(self):
+        return (self.__class__, (self.operand, self.attr_name))
+
     def _impl_unary_operation(self, operand):
         return getattr(operand, self.attr_name)
 
+    def _impl_compile(self, compiler):
+        operand = compiler.operand(self.operand)
+        if self.attr_name.isidentifier() and not keyword.iskeyword(self.attr_name):
+            return "{}.{}".format(operand, self.attr_name)
+        else:
+            return "getattr({}, {})".format(operand, compiler.const(self.attr_name))
+
     def _impl_unparse(self):
         operand = self._impl_unparse_operand(self.operand)
         fmt = "{}.{}"
@@ -807,11 +949,27 @@ class MGetattr(MUnaryOperator):
 
 
 class MGetitem(MBinaryOperator):
-    """Macro 'getitem' function."""
+    """Macro 'getitem' function. Compiled chains of getitems with str keys
+       (for instance x['a']['b']) are resolved by a single call to
+       'get_path_value(keys)' if the object provides this method.
+    """
+    COMPILE_FORMAT = "{}[{}]"
 
     def _impl_binary_operation(self, left, right):
         return left[right]
 
+    def _impl_compile(self, compiler):
+        keys = []
+        operand = self
+        while isinstance(operand, MGetitem) and compiler.is_compilable(type(operand)) and \
+                isinstance(operand.right_operand, str):
+            keys.append(operand.right_operand)
+            operand = operand.left_operand
+        if operand is self:
+            return super()._impl_compile(compiler)
+        keys.reverse()
+        return "_macro_getitem_path({}, {})".format(compiler.operand(operand), compiler.const(tuple(keys)))
+
     def _impl_unparse(self):
         left = self._impl_unparse_left_operand(self.left_operand)
         right = self._impl_unparse_right_operand(self.right_operand, wrap=False)
@@ -821,6 +979,7 @@ class MGetitem(MBinaryOperator):
 
 class MContains(MBinaryOperator):
     """Macro 'in' binary operator."""
+    COMPILE_FORMAT = "({} in {})"
 
     def _impl_binary_operation(self, left_value, right_value):
         return left_value in right_value
@@ -829,3 +988,320 @@ class MContains(MBinaryOperator):
         return "{} in {}".format(
             self._impl_unparse_left_operand(self.left_operand),
             self._impl_unparse_right_operand(self.right_operand))
+
+
+def _macro_and(left_value, right_value):
+    """Implementation of the compiled MAnd operator (both operands are evaluated)."""
+    return left_value and right_value
+
+
+def _macro_or(left_value, right_value):
+    """Implementation of the compiled MOr operator (both operands are evaluated)."""
+    return left_value or right_value
+
+
+def _macro_getitem_path(value, keys):
+    """Implementation of compiled getitem chains: returns value[keys[0]][keys[1]]...
+
+       Parameters
+       ----------
+       value: |any|
+           the object
+       keys: tuple
+           the keys
+
+       Returns
+       -------
+       |any|
+           the item value
+    """
+    get_path_value = getattr(type(value), 'get_path_value', None)
+    if get_path_value is not None:
+        return get_path_value(value, keys)
+    for key in keys:
+        value = value[key]
+    return value
+
+
+class _MacroCompiler(object):
+    """Compiles a Macro to a python function. Names are looked up in
+       'globals_d' once per call, const operands are bound to the
+       function's globals.
+
+       Macro classes whose evaluation has been overridden without
+       overriding the compilation are compiled as calls to their
+       'evaluate' method.
+    """
+    COMPILE_ATTRIBUTES = ('_impl_compile', 'COMPILE_FORMAT')
+    EVALUATE_ATTRIBUTES = ('evaluate', '_impl_unary_operation', '_impl_binary_operation')
+    __compilable = {}
+
+    def __init__(self):
+        self._namespace = {'_macro_and': _macro_and, '_macro_or': _macro_or,
+                           '_macro_getitem_path': _macro_getitem_path}
+        self._consts = {}
+        self._names = {}
+
+    @classmethod
+    def _owner(cls, macro_class, attributes):
+        """Returns the most derived class defining one of 'attributes'.
+
+           Parameters
+           ----------
+           macro_class: type
+               the macro class
+           attributes: tuple
+               the attribute names
+
+           Returns
+           -------
+           type
+               the owner class
+        """
+        for klass in macro_class.__mro__:
+            if any(attribute in klass.__dict__ for attribute in attributes):
+                return klass
+
+    @classmethod
+    def is_compilable(cls, macro_class):
+        """Returns True if the compilation of 'macro_class' is consistent with its evaluation.
+
+           Parameters
+           ----------
+           macro_class: type
+               the macro class
+
+           Returns
+           -------
+           bool
+               True if the class compilation can be used
+        """
+        compilable = cls.__compilable.get(macro_class, None)
+        if compilable is None:
+            compilable = issubclass(cls._owner(macro_class, cls.COMPILE_ATTRIBUTES),
+                                    cls._owner(macro_class, cls.EVALUATE_ATTRIBUTES))
+            cls.__compilable[macro_class] = compilable
+        return compilable
+
+    def const(self, value):
+        """Binds a const value.
+
+           Parameters
+           ----------
+           value: |any|
+               the value
+
+           Returns
+           -------
+           str
+               the python expression
+        """
+        var_name = self._consts.get(id(value), None)
+        if var_name is None:
+            var_name = "_c{}".format(len(self._consts))
+            self._consts[id(value)] = var_name
+            self._namespace[var_name] = value
+        return var_name
+
+    def name(self, name):
+        """Binds a name to be looked up in globals_d.
+
+           Parameters
+           ----------
+           name: str
+               the name
+
+           Returns
+           -------
+           str
+               the python expression
+        """
+        var_name = self._names.get(name, None)
+        if var_name is None:
+            var_name = "_n{}".format(len(self._names))
+            self._names[name] = var_name
+        return var_name
+
+    def evaluate_call(self, macro):
+        """Returns a call to the 'evaluate' method of 'macro'.
+
+           Parameters
+           ----------
+           macro: |Macro|
+               the macro
+
+           Returns
+           -------
+           str
+               the python expression
+        """
+        return "{}.evaluate(globals_d)".format(self.const(macro))
+
+    def operand(self, operand):
+        """Compiles an operand.
+
+           Parameters
+           ----------
+           operand: |any|
+               the operand (a Macro object or other value)
+
+           Returns
+           -------
+           str
+               the python expression
+        """
+        if isinstance(operand, Macro):
+            if self.is_compilable(type(operand)):
+                return operand._impl_compile(self)  # pylint: disable=protected-access
+            else:
+                return self.evaluate_call(operand)
+        else:
+            return self.const(operand)
+
+    def compile(self, macro):
+        """Compiles a macro.
+
+           Parameters
+           ----------
+           macro: |Macro|
+               the macro
+
+           Returns
+           -------
+           function
+               the compiled function
+        """
+        expression = self.operand(macro)
+        lines = ["def _compiled_macro(globals_d=None):"]
+        if self._names:
+            lines.append("    if globals_d is None:")
+            lines.append("        globals_d = {}")
+            for name, var_name in self._names.items():
+                lines.append("    if {} not in globals_d:".format(self.const(name)))
+                lines.append("        raise NameError('name {{!r}} is not defined'.format({}))".format(
+                    self.const(name)))
+                lines.append("    {} = globals_d[{}]".format(var_name, self.const(name)))
+        lines.append("    return {}".format(expression))
+        source = '\n'.join(lines) + '\n'
+        code = compile(source, "<macro>", "exec")
+        exec(code, self._namespace)  # pylint: disable=exec-used
+        return self._namespace['_compiled_macro']
+
+
+class _MacroOptimizer(object):
+    """Optimizes a Macro: folds const subexpressions and shares equal
+       subexpressions. Nodes are rebuilt from their '__reduce__' arguments.
+    """
+    IMMUTABLE_TYPES = (int, float, complex, bool, str, bytes, type(None))
+
+    def __init__(self):
+        self._nodes = {}
+
+    @classmethod
+    def is_immutable(cls, value):
+        """Returns True if value is immutable.
+
+           Parameters
+           ----------
+           value: |any|
+               the value
+
+           Returns
+           -------
+           bool
+               True if value is immutable
+        """
+        if isinstance(value, tuple):
+            return all(cls.is_immutable(item) for item in value)
+        return type(value) in cls.IMMUTABLE_TYPES
+
+    def _key(self, value):
+        """Returns the structural key of a value.
+
+           Parameters
+           ----------
+           value: |any|
+               the value (a Macro object or other value)
+
+           Returns
+           -------
+           tuple
+               the key
+        """
+        if isinstance(value, Macro):
+            return ('macro', id(value))
+        elif self.is_immutable(value):
+            return ('const', type(value), repr(value))
+        elif isinstance(value, tuple):
+            return ('tuple',) + tuple(self._key(item) for item in value)
+        elif isinstance(value, dict):
+            return ('dict',) + tuple((key, self._key(item)) for key, item in value.items())
+        else:
+            return ('object', id(value))
+
+    def _map(self, value, consts):
+        """Optimizes a reduce argument; sets consts[0] to False if a
+           macro operand is found.
+
+           Parameters
+           ----------
+           value: |any|
+               the argument
+           consts: list
+               a 1-item list
+
+           Returns
+           -------
+           |any|
+               the optimized argument
+        """
+        if isinstance(value, Macro):
+            value = self.optimize(value)
+            if isinstance(value, Macro):
+                consts[0] = False
+            return value
+        elif isinstance(value, tuple):
+            return tuple(self._map(item, consts) for item in value)
+        elif isinstance(value, dict):
+            return value.__class__((key, self._map(item, consts)) for key, item in value.items())
+        else:
+            if not self.is_immutable(value):
+                consts[0] = False
+            return value
+
+    def optimize(self, macro):
+        """Optimizes a macro.
+
+           Parameters
+           ----------
+           macro: |Macro|
+               the macro
+
+           Returns
+           -------
+           |any|
+               the optimized macro, or its value if it is const
+        """
+        if isinstance(macro, MName):
+            args = macro.__reduce__()[1]
+            consts = [False]
+        else:
+            consts = [True]
+            args = tuple(self._map(arg, consts) for arg in macro.__reduce__()[1])
+        if isinstance(macro, MConst):
+            return args[0]
+        key = (type(macro),) + tuple(self._key(arg) for arg in args)
+        node = self._nodes.get(key, None)
+        if node is None:
+            node = type(macro)(*args)
+            if consts[0] and node.CONST_FOLDING:
+                try:
+                    value = node.evaluate()
+                except Exception:  # pylint: disable=broad-except
+                    # the error will be raised at evaluation time
+                    pass
+                else:
+                    if self.is_immutable(value):
+                        return value
+            self._nodes[key] = node
+        return node
@@ -49,3 +49,9 @@ try:
     __all__.append(PickleSerializer.__name__)
 except ImportError:  # pragma: no cover
     pass
+
+try:
+    from .zbin_serializer import ZBinSerializer
+    __all__.append(ZBinSerializer.__name__)
+except ImportError:  # pragma: no cover
+    pass
@@ -94,11 +94,11 @@ class ConfigObjSerializer(TextSerializer):
         for key, value in submapping_items:
             yield key, value
 
-    def impl_from_string(self, dct_class, serialization, *, filename=None):
+    def impl_from_lines(self, dct_class, lines, *, filename=None):
         dct = dct_class()
         mapping_stack = [dct]
         current_mapping, current_level = mapping_stack[-1], len(mapping_stack) - 1
-        for line_number, source_line in enumerate(serialization.split('\n')):
+        for line_number, source_line in enumerate(lines):
             line = source_line.strip()
             if not line or line[0] == '#':
                 # empty line or comment
@@ -17,6 +17,18 @@
 
 """\
 Implementation of the 'json' Serializer.
+
+By default the JSON serialization is indented, and objects are loaded as
+OrderedDicts. The serializer can be configured for compact serialization
+(no indentation and no spaces after separators) and for loading objects as
+plain dicts:
+
+>>> serializer = JSONSerializer(compact=True, ordered=False)
+>>> print(serializer.to_string({'a': 1, 'b': [1, 2]}), end='')
+{"a":1,"b":[1,2]}
+>>> type(serializer.from_string('{"a": {"b": 2}}')['a']).__name__
+'dict'
+>>>
 """
 
 __author__ = "Simone Campagna"
@@ -27,6 +39,7 @@ __all__ = [
 ]
 
 import collections
+import itertools
 import json
 
 from .serializer import Serializer
@@ -67,7 +80,22 @@ def _object_pairs_hook(pairs):
            encoded dictionary
     """
 
-    dct = collections.OrderedDict(pairs)
+    return _object_hook(collections.OrderedDict(pairs))
+
+
+def _object_hook(dct):
+    """Hook to manage a dict serialization.
+
+       Parameters
+       ----------
+       dct: dict
+           the dict
+
+       Returns
+       -------
+       dict
+           encoded dictionary
+    """
     if _CLASS_NAME_KEY in dct:
         class_tag = dct[_CLASS_NAME_KEY]
         codec = _CODEC_CATALOG.get_by_name(class_tag)
@@ -79,18 +107,94 @@ def _object_pairs_hook(pairs):
 
 class JSONSerializer(Serializer):
     """Implementation of JSON serializer.
+
+       Parameters
+       ----------
+       compact: bool, optional
+           if True, use compact serialization (no indentation, no spaces
+           after separators); defaults to False
+       ordered: bool, optional
+           if False, load objects as plain dicts instead of OrderedDicts;
+           defaults to True
     """
     CODEC_CATALOG = _CODEC_CATALOG
+    INDENT = 4
+    COMPACT_SEPARATORS = (',', ':')
+    WRITE_BUFFER_SIZE = 65536
+
+    def __init__(self, *, compact=False, ordered=True):
+        super().__init__()
+        self._compact = compact
+        self._ordered = ordered
+        if compact:
+            self._encoder_args = {'indent': None, 'separators': self.COMPACT_SEPARATORS}
+        else:
+            self._encoder_args = {'indent': self.INDENT}
 
     @classmethod
     def class_tag(cls):
         return "json"
 
+    @property
+    def compact(self):
+        """Returns the compact attribute
+
+           Returns
+           -------
+           bool
+               True if serialization is compact
+        """
+        return self._compact
+
+    @property
+    def ordered(self):
+        """Returns the ordered attribute
+
+           Returns
+           -------
+           bool
+               True if objects are loaded as OrderedDicts
+        """
+        return self._ordered
+
+    def load_options(self):
+        if self._ordered:
+            return ()
+        else:
+            return (('ordered', self._ordered),)
+
     def to_string(self, obj):
-        return json.dumps(obj, cls=JSONPluggableEncoder, indent=4) + '\n'
+        return json.dumps(obj, cls=JSONPluggableEncoder, **self._encoder_args) + '\n'
+
+    def to_stream(self, obj, stream):
+        encoder = JSONPluggableEncoder(**self._encoder_args)
+        buffer_size = self.WRITE_BUFFER_SIZE
+        chunk = []
+        chunk_size = 0
+        count = 0
+        for item in itertools.chain(encoder.iterencode(obj), ['\n']):
+            chunk.append(item)
+            chunk_size += len(item)
+            if chunk_size >= buffer_size:
+                stream.write(''.join(chunk))
+                count += chunk_size
+                chunk.clear()
+                chunk_size = 0
+        stream.write(''.join(chunk))
+        count += chunk_size
+        return count
 
     def from_string(self, serialization, *, filename=None):
         dummy = filename
-        decoder = json.JSONDecoder(object_pairs_hook=_object_pairs_hook)
+        if _CLASS_NAME_KEY not in serialization:
+            # no tagged objects: no codec hook is needed
+            if self._ordered:
+                decoder = json.JSONDecoder(object_pairs_hook=collections.OrderedDict)
+            else:
+                decoder = json.JSONDecoder()
+        elif self._ordered:
+            decoder = json.JSONDecoder(object_pairs_hook=_object_pairs_hook)
+        else:
+            decoder = json.JSONDecoder(object_hook=_object_hook)
         return decoder.decode(serialization)
 
@@ -27,6 +27,8 @@ __all__ = [
 ]
 
 import abc
+import contextlib
+import mmap
 
 from ..files import createdir
 from ..registry import Registry
@@ -62,6 +64,31 @@ class Serializer(Registry, metaclass=abc.ABCMeta):
         """
         return False
 
+    @classmethod
+    def is_streaming(cls):
+        """Returns True if the serializer dumps any Mapping while iterating over
+           it, so that it can be passed lazy mapping views instead of dict copies.
+
+           Returns
+           -------
+           bool
+               True if serialization is streaming
+        """
+        return False
+
+    def load_options(self):  # pylint: disable=no-self-use
+        """Returns the non-default options of this serializer instance that
+           change the loaded objects. Parse caches store images decoded with
+           the default options, so files loaded with such options are not
+           cached.
+
+           Returns
+           -------
+           tuple
+               a tuple of (name, value) pairs
+        """
+        return ()
+
     @abc.abstractmethod
     def to_string(self, obj):
         """Returns the string serialization for 'obj'.
@@ -111,10 +138,11 @@ class Serializer(Registry, metaclass=abc.ABCMeta):
                the number of written bytes
         """
         createdir(filename)
-        mode = 'w'
         if self.is_binary():
-            mode += 'b'
-        with open(filename, mode) as f_stream:
+            f_stream = open(filename, 'wb')
+        else:
+            f_stream = open(filename, 'w', encoding='utf-8')
+        with f_stream:
             return self.to_stream(obj, f_stream)
 
     @abc.abstractmethod
@@ -135,31 +163,112 @@ class Serializer(Registry, metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
-    def from_stream(self, stream, *, filename=None):
-        """Loads an object from open file 'stream'.
+    @classmethod
+    def stream_filename(cls, stream, filename=None):
+        """Returns the file name to be used for error traceback.
 
            Parameters
            ----------
            stream: file
                an open file
            filename: str, optional
-               the file name (only for error traceback)
+               the file name
 
            Returns
            -------
-           |any|
-               the deserialized object
+           str
+               the file name
         """
         if filename is None:
             if hasattr(stream, 'name'):
                 filename = stream.name
             else:
                 filename = repr(stream)
+        return filename
+
+    def from_stream(self, stream, *, filename=None):
+        """Loads an object from open file 'stream'.
+
+           Parameters
+           ----------
+           stream: file
+               an open file
+           filename: str, optional
+               the file name (only for error traceback)
+
+           Returns
+           -------
+           |any|
+               the deserialized object
+        """
         return self.from_string(serialization=stream.read(),
-                                filename=filename)
+                                filename=self.stream_filename(stream, filename))
+
+    @classmethod
+    def map_file(cls, filename):
+        """Memory-maps file 'filename' for reading.
+
+           Parameters
+           ----------
+           filename: str
+               the file name
+
+           Returns
+           -------
+           mmap.mmap
+               the read-only memory map (an empty bytes object for empty files,
+               which cannot be mapped)
+        """
+        with open(filename, 'rb') as f_stream:
+            try:
+                return mmap.mmap(f_stream.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty file
+                return f_stream.read()
+
+    @classmethod
+    @contextlib.contextmanager
+    def mapped_file(cls, filename):
+        """Context manager for a memory-mapped file; the map is closed on exit.
+
+           Parameters
+           ----------
+           filename: str
+               the file name
+
+           Yields
+           ------
+           mmap.mmap
+               the read-only memory map (see 'map_file')
+        """
+        buffer = cls.map_file(filename)
+        try:
+            yield buffer
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+
+    def from_buffer(self, buffer, *, filename=None):
+        """Loads an object from a binary buffer (bytes or mmap). The returned
+           object must not refer to the buffer, which can be closed.
+
+           Parameters
+           ----------
+           buffer: bytes
+               the serialization buffer
+           filename: str, optional
+               the file name (only for error traceback)
+
+           Returns
+           -------
+           |any|
+               the deserialized object
+        """
+        return self.from_string(buffer, filename=filename)
 
     def from_file(self, filename):
-        """Loads an object from file 'filename'.
+        """Loads an object from file 'filename'. Binary files are memory-mapped
+           and loaded with 'from_buffer'; text files are read as utf-8.
 
            Parameters
            ----------
@@ -172,9 +281,27 @@ class Serializer(Registry, metaclass=abc.ABCMeta):
                the deserialized object
         """
         createdir(filename)
-        mode = 'r'
         if self.is_binary():
-            mode += 'b'
-        with open(filename, mode) as f_stream:
-            return self.from_stream(stream=f_stream,
-                                    filename=filename)
+            with self.mapped_file(filename) as buffer:
+                return self.from_buffer(buffer, filename=filename)
+        else:
+            with open(filename, 'r', encoding='utf-8') as f_stream:
+                return self.from_stream(stream=f_stream,
+                                        filename=filename)
+
+    def lazy_from_file(self, filename):
+        """Loads a mapping from file 'filename'; nested mappings can be
+           parsed only when they are first accessed. The default implementation
+           is not lazy: it simply calls 'from_file'.
+
+           Parameters
+           ----------
+           file: str
+               the file name
+
+           Returns
+           -------
+           |Mapping|
+               the deserialized mapping
+        """
+        return self.from_file(filename)
@@ -17,6 +17,9 @@
 
 """\
 Implementation of the TextSerializer base class for text serializers.
+Text serializers parse and dump line by line: streams and files are parsed
+while they are read, and written while the lines are generated. Files are
+memory-mapped, and each line is decoded from utf-8 only when it is parsed.
 """
 
 __author__ = "Simone Campagna"
@@ -28,11 +31,13 @@ __all__ = [
 
 import abc
 import collections
+import io
+import mmap
 import re
 
 from .codec_catalog import CodecCatalog
 from .serializer import Serializer
-from ..unrepr import unrepr
+from ..unrepr import UNREPR_CACHE
 
 
 class TextSerializer(Serializer):
@@ -41,6 +46,11 @@ class TextSerializer(Serializer):
     CODEC_CATALOG = CodecCatalog()
     RE_FUNC = re.compile(r'\s*(?P<func_name>\w+)\(.*')
     INDENTATION = "    "
+    WRITE_BUFFER_SIZE = 65536
+
+    @classmethod
+    def is_streaming(cls):
+        return True
 
     def indentation(self, level):
         """Returns the indentation for a given level
@@ -116,7 +126,7 @@ class TextSerializer(Serializer):
                 ', '.join(value_type_names)))
         else:
             try:
-                return unrepr(value)
+                return UNREPR_CACHE.unrepr(value)
             except Exception as err:
                 raise ValueError("line {}@{}: invalid value {!r}: {}: {}".format(
                     line_number, filename, value, type(err).__name__, err))
@@ -162,23 +172,6 @@ class TextSerializer(Serializer):
         """
         raise NotImplementedError
 
-    def impl_dump_mapping(self, level, lines, mapping_name, mapping):
-        """Generates and appends lines for a mapping.
-
-           Parameters
-           ----------
-           level: int
-               the nesting level
-           lines: list
-               the list of lines
-           mapping_name: str
-               the mapping name
-           mapping: str
-               the mapping
-        """
-        lines.append(self.impl_dump_mapping_name(level=level, mapping_name=mapping_name))
-        self.impl_dump_mapping_lines(level=level + 1, lines=lines, mapping=mapping)
-
     @abc.abstractmethod
     def impl_iter_mapping_items(self, mapping):
         """Iterates over mapping items
@@ -195,35 +188,70 @@ class TextSerializer(Serializer):
         """
         raise NotImplementedError
 
-    def impl_dump_mapping_lines(self, level, lines, mapping):
-        """Generates and appends lines for a mapping serialization
+    def impl_iter_mapping_lines(self, level, mapping):
+        """Generates the lines for a mapping serialization
 
            Parameters
            ----------
            level: int
                the nesting level
-           lines: list
-               the list of lines
            mapping: str
                the mapping
+
+           Yields
+           ------
+           str
+               the lines (without line terminator)
         """
         for key, value in self.impl_iter_mapping_items(mapping):
             if isinstance(value, collections.Mapping):
-                self.impl_dump_mapping(level=level, lines=lines, mapping_name=key, mapping=value)
+                yield self.impl_dump_mapping_name(level=level, mapping_name=key)
+                yield from self.impl_iter_mapping_lines(level=level + 1, mapping=value)
             else:
                 encoded_value = self.encode_value(value)
-                lines.append(self.impl_dump_key_value(level=level, key=key, value=encoded_value))
+                yield self.impl_dump_key_value(level=level, key=key, value=encoded_value)
 
-    def to_string(self, obj):
+    def _check_mapping(self, obj):
+        """Checks that obj is a Mapping.
+
+           Parameters
+           ----------
+           obj: |any|
+               the object to be serialized
+
+           Raises
+           ------
+           TypeError
+               obj is not a Mapping
+        """
         if not isinstance(obj, collections.Mapping):
             raise TypeError("{}: cannot serializer object of type {}: not a Mapping".format(
                 type(self).__name__, type(obj).__name__))
-        lines = []
-        self.impl_dump_mapping_lines(level=0, lines=lines, mapping=obj)
-        if lines:
-            return '\n'.join(lines) + '\n'
-        else:
-            return ''
+
+    def to_string(self, obj):
+        self._check_mapping(obj)
+        return ''.join(line + '\n' for line in self.impl_iter_mapping_lines(level=0, mapping=obj))
+
+    def to_stream(self, obj, stream):
+        self._check_mapping(obj)
+        buffer_size = self.WRITE_BUFFER_SIZE
+        chunk = []
+        chunk_size = 0
+        count = 0
+        for line in self.impl_iter_mapping_lines(level=0, mapping=obj):
+            chunk.append(line)
+            chunk_size += len(line) + 1
+            if chunk_size >= buffer_size:
+                chunk.append('')
+                stream.write('\n'.join(chunk))
+                count += chunk_size
+                chunk.clear()
+                chunk_size = 0
+        if chunk:
+            chunk.append('')
+            stream.write('\n'.join(chunk))
+            count += chunk_size
+        return count
 
     def impl_parse_key_value(self, line, line_number, filename):
         """Parses a key/value line
@@ -263,12 +291,60 @@ class TextSerializer(Serializer):
         value = self.decode_value(line_number, filename, key, value, *value_type_names)
         return key.strip(), value
 
+    @classmethod
+    def iter_lines(cls, stream):
+        """Iterates over the lines of a text stream, without line terminator.
+
+           Parameters
+           ----------
+           stream: file
+               an open text file
+
+           Returns
+           -------
+           iterator
+               iterator over lines
+        """
+        for line in stream:
+            if line.endswith('\n'):
+                yield line[:-1]
+            else:
+                yield line
+
+    @classmethod
+    def iter_buffer_lines(cls, buffer):
+        """Iterates over the lines of a utf-8 encoded buffer, without line
+           terminator; each line is decoded when it is reached.
+
+           Parameters
+           ----------
+           buffer: bytes
+               the buffer (bytes, or mmap at position 0)
+
+           Returns
+           -------
+           iterator
+               iterator over lines
+        """
+        if not isinstance(buffer, mmap.mmap):
+            buffer = io.BytesIO(buffer)
+        for line in iter(buffer.readline, b''):
+            yield line.rstrip(b'\r\n').decode('utf-8')
+
     def from_string(self, serialization, *, filename=None):
         if filename is None:
             filename = '<string>'
         return self.impl_from_string(collections.OrderedDict, serialization, filename=filename)
 
-    @abc.abstractmethod
+    def from_stream(self, stream, *, filename=None):
+        return self.impl_from_lines(collections.OrderedDict, self.iter_lines(stream),
+                                    filename=self.stream_filename(stream, filename))
+
+    def from_file(self, filename):
+        with self.mapped_file(filename) as buffer:
+            return self.impl_from_lines(collections.OrderedDict, self.iter_buffer_lines(buffer),
+                                        filename=filename)
+
     def impl_from_string(self, dct_class, serialization, *, filename=None):
         """Implementation of the from_string method.
 
@@ -286,4 +362,25 @@ class TextSerializer(Serializer):
            |any|
                the deserialized object
         """
+        return self.impl_from_lines(dct_class, self.iter_lines(io.StringIO(serialization, newline='\n')),
+                                    filename=filename)
+
+    @abc.abstractmethod
+    def impl_from_lines(self, dct_class, lines, *, filename=None):
+        """Parses the serialization lines.
+
+           Parameters
+           ----------
+           dct_class: type
+               the dict class to be used
+           lines: iterable
+               the serialization lines (without line terminator)
+           filename: str
+               the file name
+
+           Returns
+           -------
+           |any|
+               the deserialized object
+        """
         raise NotImplementedError
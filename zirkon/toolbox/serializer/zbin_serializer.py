@@ -0,0 +1,750 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2013 Simone Campagna
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""\
+Implementation of the 'zbin' Serializer, a compact binary serialization.
+
+The serialization is made of:
+
+* a header: the magic bytes b'ZBIN', the format version (1 byte) and the
+  offset of the string table (8 bytes, little endian);
+* the root mapping;
+* the string table: the number of strings (varint), the width W of the
+  string index (1 byte), the index (the start offset of each string and
+  the total size, W bytes each, little endian), then the utf-8 strings.
+  Strings can be decoded one at a time, by index.
+
+Each value starts with a 1-byte type tag. ints are zigzag varints, floats
+are 8-byte doubles, strs (keys and values) are varint indices into the
+string table. Mappings, lists, tuples and codec-encoded objects store
+the size in bytes of their body (a varint), so that they can be skipped
+without decoding: this allows random access to a section.
+
+Unlike pickle, loading a zbin serialization never executes arbitrary code:
+only the objects with a codec in the ZBinSerializer codec catalog
+(for instance macros and validators) are created.
+
+>>> serializer = ZBinSerializer()
+>>> data = serializer.to_string({'a': 1, 'sub': {'x': [1.5, 'a'], 'y': None}})
+>>> serializer.from_string(data)
+OrderedDict([('a', 1), ('sub', OrderedDict([('x', [1.5, 'a']), ('y', None)]))])
+>>> serializer.section_from_string(data, ['sub'])
+OrderedDict([('x', [1.5, 'a']), ('y', None)])
+>>>
+"""
+
+__author__ = "Simone Campagna"
+__copyright__ = 'Copyright (c) 2015 Simone Campagna'
+__license__ = 'Apache License Version 2.0'
+__all__ = [
+    'ZBinSerializer',
+]
+
+import collections
+import struct
+
+from .serializer import Serializer
+from .codec_catalog import CodecCatalog
+
+
+_MAGIC = b'ZBIN'
+_VERSION = 2
+_OFFSET = struct.Struct('<Q')
+_FLOAT = struct.Struct('<d')
+_HEADER_SIZE = len(_MAGIC) + 1 + _OFFSET.size
+
+_TAG_NONE = 0
+_TAG_TRUE = 1
+_TAG_FALSE = 2
+_TAG_INT = 3
+_TAG_FLOAT = 4
+_TAG_STR = 5
+_TAG_BYTES = 6
+_TAG_LIST = 7
+_TAG_TUPLE = 8
+_TAG_MAPPING = 9
+_TAG_OBJECT = 10
+
+_INDEX_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+
+def _encode_varint(number):
+    """Encodes an unsigned varint.
+
+       Parameters
+       ----------
+       number: int
+           the non-negative number
+
+       Returns
+       -------
+       bytearray
+           the encoded varint
+    """
+    encoded = bytearray()
+    while number >= 0x80:
+        encoded.append((number & 0x7f) | 0x80)
+        number >>= 7
+    encoded.append(number)
+    return encoded
+
+
+def _get_index_width(size):
+    """Returns the smallest string table index width (in bytes) for strings
+       of total size 'size'.
+
+       Parameters
+       ----------
+       size: int
+           the total size of the strings
+
+       Returns
+       -------
+       int
+           the index width
+    """
+    for width in sorted(_INDEX_FORMATS):
+        if size < 256 ** width:
+            return width
+
+
+class _ZBinWriter(object):
+    """Encodes values to a zbin serialization.
+
+       Parameters
+       ----------
+       codec_catalog: |CodecCatalog|
+           the codec catalog
+    """
+    def __init__(self, codec_catalog):
+        self._codec_catalog = codec_catalog
+        self._buffer = bytearray()
+        self._strings = {}
+
+    def _write_varint(self, number):
+        """Writes an unsigned varint.
+
+           Parameters
+           ----------
+           number: int
+               the non-negative number
+        """
+        buffer = self._buffer
+        while number >= 0x80:
+            buffer.append((number & 0x7f) | 0x80)
+            number >>= 7
+        buffer.append(number)
+
+    def _write_str(self, string):
+        """Writes the string table index of a string.
+
+           Parameters
+           ----------
+           string: str
+               the string
+        """
+        index = self._strings.get(string, None)
+        if index is None:
+            index = self._strings[string] = len(self._strings)
+        self._write_varint(index)
+
+    def _begin_container(self, tag):
+        """Starts a sized container.
+
+           Parameters
+           ----------
+           tag: int
+               the container tag
+
+           Returns
+           -------
+           int
+               the offset of the container body
+        """
+        buffer = self._buffer
+        buffer.append(tag)
+        return len(buffer)
+
+    def _end_container(self, body_offset):
+        """Inserts the size of a container body (a varint) before the body.
+
+           Parameters
+           ----------
+           body_offset: int
+               the offset of the container body
+        """
+        buffer = self._buffer
+        buffer[body_offset:body_offset] = _encode_varint(len(buffer) - body_offset)
+
+    def write_value(self, value):
+        """Writes a value.
+
+           Parameters
+           ----------
+           value: |any|
+               the value
+
+           Raises
+           ------
+           TypeError
+               unsupported type
+        """
+        buffer = self._buffer
+        value_type = type(value)
+        if value is None:
+            buffer.append(_TAG_NONE)
+        elif value_type is bool:
+            buffer.append(_TAG_TRUE if value else _TAG_FALSE)
+        elif value_type is int:
+            buffer.append(_TAG_INT)
+            self._write_varint(value << 1 if value >= 0 else ((-value) << 1) - 1)
+        elif value_type is float:
+            buffer.append(_TAG_FLOAT)
+            buffer.extend(_FLOAT.pack(value))
+        elif value_type is str:
+            buffer.append(_TAG_STR)
+            self._write_str(value)
+        elif value_type is bytes:
+            buffer.append(_TAG_BYTES)
+            self._write_varint(len(value))
+            buffer.extend(value)
+        elif isinstance(value, collections.Mapping):
+            self.write_mapping(value)
+        elif isinstance(value, (list, tuple)):
+            body_offset = self._begin_container(_TAG_TUPLE if isinstance(value, tuple) else _TAG_LIST)
+            for item in value:
+                self.write_value(item)
+            self._end_container(body_offset)
+        else:
+            codec = self._codec_catalog.get_by_class(value_type)
+            if codec is None:
+                raise TypeError("cannot serialize object of type {}".format(value_type.__name__))
+            body_offset = self._begin_container(_TAG_OBJECT)
+            self._write_str(value_type.__name__)
+            self.write_value(codec.encode(value))
+            self._end_container(body_offset)
+
+    def write_mapping(self, mapping):
+        """Writes a mapping.
+
+           Parameters
+           ----------
+           mapping: Mapping
+               the mapping
+
+           Raises
+           ------
+           TypeError
+               non-str key
+        """
+        body_offset = self._begin_container(_TAG_MAPPING)
+        for key, value in mapping.items():
+            if type(key) is not str:  # pylint: disable=unidiomatic-typecheck
+                raise TypeError("cannot serialize key {!r} of non-string type {}".format(
+                    key, type(key).__name__))
+            self._write_str(key)
+            self.write_value(value)
+        self._end_container(body_offset)
+
+    def serialize(self, obj):
+        """Returns the serialization of a mapping.
+
+           Parameters
+           ----------
+           obj: Mapping
+               the mapping
+
+           Returns
+           -------
+           bytes
+               the serialization
+        """
+        buffer = self._buffer
+        buffer.extend(_MAGIC)
+        buffer.append(_VERSION)
+        buffer.extend(bytes(_OFFSET.size))
+        self.write_mapping(obj)
+        _OFFSET.pack_into(buffer, len(_MAGIC) + 1, len(buffer))
+        encoded_strings = [string.encode('utf-8') for string in self._strings]
+        string_offsets = [0]
+        for encoded in encoded_strings:
+            string_offsets.append(string_offsets[-1] + len(encoded))
+        width = _get_index_width(string_offsets[-1])
+        self._write_varint(len(encoded_strings))
+        buffer.append(width)
+        buffer.extend(struct.pack('<{}{}'.format(len(string_offsets), _INDEX_FORMATS[width]), *string_offsets))
+        for encoded in encoded_strings:
+            buffer.extend(encoded)
+        return bytes(buffer)
+
+
+class _ZBinReader(object):
+    """Decodes values from a zbin serialization. Strings are decoded
+       lazily, on first access, so that reading a section does not
+       decode the whole string table.
+
+       Parameters
+       ----------
+       data: bytes
+           the serialization (bytes, memoryview or mmap)
+       codec_catalog: |CodecCatalog|
+           the codec catalog
+       filename: str
+           the file name (only for error traceback)
+
+       Raises
+       ------
+       ValueError
+           invalid, truncated or corrupted serialization
+    """
+    def __init__(self, data, codec_catalog, filename):
+        self._data = data
+        self._codec_catalog = codec_catalog
+        self._filename = filename
+        if len(data) < _HEADER_SIZE or data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("{}: not a zbin serialization".format(filename))
+        version = data[len(_MAGIC)]
+        if version != _VERSION:
+            raise ValueError("{}: unsupported zbin version {}".format(filename, version))
+        offset = _OFFSET.unpack_from(data, len(_MAGIC) + 1)[0]
+        if not _HEADER_SIZE < offset < len(data):
+            raise self._corrupt()
+        # the values end where the string table starts:
+        self._end = offset
+        try:
+            num_strings, offset = self._read_varint(offset)
+            width = data[offset]
+        except IndexError:
+            raise self._corrupt()
+        index_format = _INDEX_FORMATS.get(width, None)
+        if index_format is None:
+            raise self._corrupt()
+        self._num_strings = num_strings
+        self._index = struct.Struct('<' + index_format)
+        self._index_offset = offset + 1
+        self._strings_offset = self._index_offset + (num_strings + 1) * width
+        if self._strings_offset > len(data) or \
+                self._strings_offset + self._index.unpack_from(data, self._strings_offset - width)[0] != len(data):
+            raise self._corrupt()
+        self._string_cache = {}
+        self._get_string = self._lazy_string
+
+    def _corrupt(self):
+        """Returns the error for truncated or corrupted data.
+
+           Returns
+           -------
+           ValueError
+               the error
+        """
+        return ValueError("{}: truncated/corrupt zbin data".format(self._filename))
+
+    def _string_bounds(self, index):
+        """Returns the bounds of a string in the string table.
+
+           Parameters
+           ----------
+           index: int
+               the string index
+
+           Raises
+           ------
+           ValueError
+               invalid index or corrupted string table
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (start offset, end offset)
+        """
+        if index >= self._num_strings:
+            raise self._corrupt()
+        data = self._data
+        index_struct = self._index
+        index_offset = self._index_offset + index * index_struct.size
+        start = self._strings_offset + index_struct.unpack_from(data, index_offset)[0]
+        end = self._strings_offset + index_struct.unpack_from(data, index_offset + index_struct.size)[0]
+        if not start <= end <= len(data):
+            raise self._corrupt()
+        return start, end
+
+    def _decode_string(self, index):
+        """Decodes a string of the string table.
+
+           Parameters
+           ----------
+           index: int
+               the string index
+
+           Returns
+           -------
+           str
+               the string
+        """
+        start, end = self._string_bounds(index)
+        try:
+            return bytes(self._data[start:end]).decode('utf-8')
+        except UnicodeDecodeError:
+            raise self._corrupt()
+
+    def _lazy_string(self, index):
+        """Returns a string of the string table, decoding it on first access.
+
+           Parameters
+           ----------
+           index: int
+               the string index
+
+           Returns
+           -------
+           str
+               the string
+        """
+        string = self._string_cache.get(index, None)
+        if string is None:
+            string = self._string_cache[index] = self._decode_string(index)
+        return string
+
+    def _read_varint(self, offset):
+        """Reads an unsigned varint.
+
+           Parameters
+           ----------
+           offset: int
+               the offset
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (number, next offset)
+        """
+        data = self._data
+        byte = data[offset]
+        offset += 1
+        if byte < 0x80:
+            return byte, offset
+        number = byte & 0x7f
+        shift = 7
+        while True:
+            byte = data[offset]
+            offset += 1
+            number |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return number, offset
+            shift += 7
+
+    def _read_size(self, offset):
+        """Reads the body size of a container.
+
+           Parameters
+           ----------
+           offset: int
+               the offset of the size field
+
+           Raises
+           ------
+           ValueError
+               the body exceeds the values
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (body end offset, body offset)
+        """
+        size, offset = self._read_varint(offset)
+        end = offset + size
+        if end > self._end:
+            raise self._corrupt()
+        return end, offset
+
+    def read_value(self, offset):
+        """Reads a value.
+
+           Parameters
+           ----------
+           offset: int
+               the value offset
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (value, next offset)
+        """
+        data = self._data
+        tag = data[offset]
+        offset += 1
+        if tag == _TAG_STR:
+            index, offset = self._read_varint(offset)
+            return self._get_string(index), offset
+        elif tag == _TAG_INT:
+            number, offset = self._read_varint(offset)
+            return (number >> 1) if not number & 1 else -((number + 1) >> 1), offset
+        elif tag == _TAG_FLOAT:
+            return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+        elif tag == _TAG_MAPPING:
+            return self._read_mapping(offset)
+        elif tag == _TAG_NONE:
+            return None, offset
+        elif tag == _TAG_TRUE:
+            return True, offset
+        elif tag == _TAG_FALSE:
+            return False, offset
+        elif tag == _TAG_LIST or tag == _TAG_TUPLE:
+            end, offset = self._read_size(offset)
+            items = []
+            while offset < end:
+                item, offset = self.read_value(offset)
+                items.append(item)
+            if offset != end:
+                raise self._corrupt()
+            if tag == _TAG_TUPLE:
+                items = tuple(items)
+            return items, offset
+        elif tag == _TAG_BYTES:
+            size, offset = self._read_varint(offset)
+            if offset + size > self._end:
+                raise self._corrupt()
+            return bytes(data[offset:offset + size]), offset + size
+        elif tag == _TAG_OBJECT:
+            end, offset = self._read_size(offset)
+            index, offset = self._read_varint(offset)
+            type_name = self._get_string(index)
+            encoded, offset = self.read_value(offset)
+            if offset != end:
+                raise self._corrupt()
+            codec = self._codec_catalog.get_by_name(type_name)
+            if codec is None:
+                raise NameError("cannot decode object of type {}: no codec found".format(type_name))
+            return codec.decode(type_name, encoded), offset
+        else:
+            raise ValueError("invalid zbin tag {} at offset {}".format(tag, offset - 1))
+
+    def _read_mapping(self, offset):
+        """Reads a mapping body.
+
+           Parameters
+           ----------
+           offset: int
+               the offset of the size field
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (mapping, next offset)
+        """
+        read_varint = self._read_varint
+        size, offset = read_varint(offset)
+        end = offset + size
+        if end > self._end:
+            raise self._corrupt()
+        get_string = self._get_string
+        read_value = self.read_value
+        mapping = collections.OrderedDict()
+        while offset < end:
+            index, offset = read_varint(offset)
+            mapping[get_string(index)], offset = read_value(offset)
+        if offset != end:
+            raise self._corrupt()
+        return mapping, offset
+
+    def _skip_value(self, offset):
+        """Skips a value without decoding it.
+
+           Parameters
+           ----------
+           offset: int
+               the value offset
+
+           Returns
+           -------
+           int
+               the next offset
+        """
+        tag = self._data[offset]
+        offset += 1
+        if tag in (_TAG_NONE, _TAG_TRUE, _TAG_FALSE):
+            return offset
+        elif tag in (_TAG_INT, _TAG_STR):
+            return self._read_varint(offset)[1]
+        elif tag == _TAG_FLOAT:
+            return offset + _FLOAT.size
+        else:
+            size, offset = self._read_varint(offset)
+            return offset + size
+
+    def read_root(self):
+        """Reads the root mapping. All the strings are needed, so the string
+           table is decoded at once.
+
+           Raises
+           ------
+           ValueError
+               truncated or corrupted data
+
+           Returns
+           -------
+           OrderedDict
+               the root mapping
+        """
+        try:
+            self._get_string = [self._decode_string(index) for index in range(self._num_strings)].__getitem__
+            root, offset = self.read_value(_HEADER_SIZE)
+        except (IndexError, struct.error):
+            raise self._corrupt()
+        if offset != self._end or not isinstance(root, collections.Mapping):
+            raise self._corrupt()
+        return root
+
+    def read_section(self, keys):
+        """Reads a section, skipping all the other values.
+
+           Parameters
+           ----------
+           keys: tuple
+               the section path
+
+           Raises
+           ------
+           KeyError
+               section not found
+           ValueError
+               truncated or corrupted data
+
+           Returns
+           -------
+           OrderedDict
+               the section
+        """
+        try:
+            return self._read_section(keys)
+        except (IndexError, struct.error):
+            raise self._corrupt()
+
+    def _read_section(self, keys):
+        """Reads a section (see 'read_section'). Keys are compared as
+           utf-8 bytes, without decoding the strings.
+
+           Parameters
+           ----------
+           keys: tuple
+               the section path
+
+           Returns
+           -------
+           OrderedDict
+               the section
+        """
+        data = self._data
+        offset = _HEADER_SIZE
+        if data[offset] != _TAG_MAPPING:
+            raise self._corrupt()
+        for depth, key in enumerate(keys):
+            encoded_key = key.encode('utf-8')
+            end, offset = self._read_size(offset + 1)
+            while offset < end:
+                index, offset = self._read_varint(offset)
+                start, stop = self._string_bounds(index)
+                if data[offset] == _TAG_MAPPING and stop - start == len(encoded_key) and \
+                        data[start:stop] == encoded_key:
+                    break
+                offset = self._skip_value(offset)
+            else:
+                if offset != end:
+                    raise self._corrupt()
+                raise KeyError("section {} not found".format('.'.join(keys[:depth + 1])))
+        return self.read_value(offset)[0]
+
+
+class ZBinSerializer(Serializer):
+    """Implementation of the zbin serializer. Mappings are deserialized
+       as OrderedDicts.
+    """
+    CODEC_CATALOG = CodecCatalog()
+
+    @classmethod
+    def class_tag(cls):
+        return "zbin"
+
+    @classmethod
+    def is_binary(cls):
+        return True
+
+    @classmethod
+    def is_streaming(cls):
+        return True
+
+    def to_string(self, obj):
+        if not isinstance(obj, collections.Mapping):
+            raise TypeError("{}: cannot serializer object of type {}: not a Mapping".format(
+                type(self).__name__, type(obj).__name__))
+        return _ZBinWriter(self.CODEC_CATALOG).serialize(obj)
+
+    def from_string(self, serialization, *, filename=None):
+        if filename is None:
+            filename = '<string>'
+        return _ZBinReader(serialization, self.CODEC_CATALOG, filename).read_root()
+
+    def section_from_string(self, serialization, keys, *, filename=None):
+        """Loads a section from string 'serialization'; the other sections
+           are skipped without being decoded.
+
+           Parameters
+           ----------
+           serialization: bytes
+               the serialization (bytes, memoryview or mmap)
+           keys: tuple
+               the section path, for instance ('sub', 'subsub')
+           filename: str, optional
+               the file name (only for error traceback)
+
+           Raises
+           ------
+           KeyError
+               section not found
+
+           Returns
+           -------
+           OrderedDict
+               the deserialized section
+        """
+        if filename is None:
+            filename = '<string>'
+        return _ZBinReader(serialization, self.CODEC_CATALOG, filename).read_section(tuple(keys))
+
+    def section_from_file(self, filename, keys):
+        """Loads a section from file 'filename'. The file is memory-mapped,
+           so only the string table and the section itself are read.
+
+           Parameters
+           ----------
+           filename: str
+               the file name
+           keys: tuple
+               the section path, for instance ('sub', 'subsub')
+
+           Raises
+           ------
+           KeyError
+               section not found
+
+           Returns
+           -------
+           OrderedDict
+               the deserialized section
+        """
+        with self.mapped_file(filename) as buffer:
+            return self.section_from_string(buffer, keys, filename=filename)
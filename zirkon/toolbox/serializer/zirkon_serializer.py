@@ -17,6 +17,12 @@
 
 """\
 Implementation of the 'zirkon' Serializer.
+
+The 'zirkon' format can also be loaded lazily ('lazy_from_string',
+'lazy_from_file'): the result is a LazyMapping, whose content is parsed
+only when it is first accessed. Each mapping scans only the lines at its own
+indentation level, recording the byte offsets of its nested sections; the
+body of a nested section is parsed only when the section itself is accessed.
 """
 
 __author__ = "Simone Campagna"
@@ -24,6 +30,7 @@ __copyright__ = 'Copyright (c) 2015 Simone Campagna'
 __license__ = 'Apache License Version 2.0'
 __all__ = [
     'ZirkonSerializer',
+    'LazyMapping',
 ]
 
 import collections
@@ -62,6 +69,203 @@ def _parse_mapping(line, line_number, filename):
     return line.strip()
 
 
+_RE_CONTENT_LINE = re.compile(br'^([ \t]*)[^ \t\r\n#]', re.MULTILINE)
+
+
+def _count_lines(data, start, end):
+    """Returns the number of line terminators in a region.
+
+       Parameters
+       ----------
+       data: bytes
+           the serialization (bytes or mmap)
+       start: int
+           the region start offset
+       end: int
+           the region end offset
+
+       Returns
+       -------
+       int
+           the number of line terminators
+    """
+    # mmap has no count():
+    return data[start:end].count(b'\n')
+
+
+def _iter_level_lines(data, start, end, indentation):
+    """Iterates over the content lines with the given indentation in a region
+       (the region start must be at the beginning of a line).
+
+       Parameters
+       ----------
+       data: bytes
+           the serialization
+       start: int
+           the region start offset
+       end: int
+           the region end offset
+       indentation: bytes
+           the indentation
+
+       Yields
+       ------
+       tuple
+           a 3-tuple (line start offset, line end offset, line content)
+    """
+    content = br'([^ \t\r\n#][^\r\n]*)'
+    # the '\n' prefix is much faster to search than '^':
+    first_regex = re.compile(re.escape(indentation) + content)
+    regex = re.compile(br'\n' + re.escape(indentation) + content)
+    match = first_regex.match(data, start, end)
+    if match is not None:
+        yield start, match.end(), match.group(1)
+    for match in regex.finditer(data, start, end):
+        yield match.start() + 1, match.end(), match.group(1)
+
+
+class LazyMapping(collections.MutableMapping):
+    """Mapping lazily parsed from a region of a 'zirkon' serialization.
+       Only the lines at the mapping's own indentation level are parsed on
+       first access; nested mappings are LazyMappings too.
+
+       Parameters
+       ----------
+       serializer: ZirkonSerializer
+           the serializer used to parse key/value lines
+       data: bytes
+           the utf-8 encoded serialization (bytes or mmap)
+       start: int
+           the region start offset (at the beginning of a line)
+       end: int
+           the region end offset
+       line_number: int, optional
+           the line number at offset 'start' (defaults to 0)
+       filename: str, optional
+           the file name (only for error traceback)
+       parent_indentation: bytes, optional
+           the parent mapping indentation (None for the root mapping)
+    """
+
+    def __init__(self, serializer, data, start, end, *,
+                 line_number=0, filename=None, parent_indentation=None):
+        self._source = (serializer, data, start, end, line_number, filename, parent_indentation)
+        self._items = None
+
+    def is_loaded(self):
+        """Returns True if the mapping content has been parsed.
+
+           Returns
+           -------
+           bool
+               True if the content has been parsed
+        """
+        return self._items is not None
+
+    def _load(self):
+        """Parses the mapping content.
+
+           Raises
+           ------
+           IndentationError
+               invalid indentation
+           ValueError
+               unparsable line
+
+           Returns
+           -------
+           OrderedDict
+               the mapping items
+        """
+        serializer, data, start, end, line_number, filename, parent_indentation = self._source
+        items = collections.OrderedDict()
+        match = _RE_CONTENT_LINE.search(data, start, end)
+        if match is None:
+            return items
+        line_number += _count_lines(data, start, match.start())
+        indentation = match.group(1)
+        if parent_indentation is not None and \
+                (len(indentation) <= len(parent_indentation) or not indentation.startswith(parent_indentation)):
+            raise IndentationError("line {}@{}: unmatching indentation".format(line_number, filename))
+        level_lines = list(_iter_level_lines(data, start, end, indentation))
+        offset = match.start()
+        for index, (line_start, line_end, line) in enumerate(level_lines):
+            line_number += _count_lines(data, offset, line_start)
+            offset = line_start
+            if index + 1 < len(level_lines):
+                next_start = level_lines[index + 1][0]
+            else:
+                next_start = end
+            line = line.decode('utf-8')
+            if line[0] == '[':
+                # mapping
+                mapping_name = _parse_mapping(line, line_number, filename)
+                items[mapping_name] = LazyMapping(
+                    serializer, data, line_end, next_start,
+                    line_number=line_number, filename=filename, parent_indentation=indentation)
+            else:
+                # key:
+                key, value = serializer.impl_parse_key_value(line=line, line_number=line_number, filename=filename)
+                items[key] = value
+                bad_line = _RE_CONTENT_LINE.search(data, line_end, next_start)
+                if bad_line is not None:
+                    bad_line_number = line_number + _count_lines(data, offset, bad_line.start())
+                    if bad_line.group(1).startswith(indentation):
+                        raise IndentationError("line {}@{}: unexpected indentation".format(
+                            bad_line_number, filename))
+                    else:
+                        raise IndentationError("line {}@{}: unmatching indentation".format(
+                            bad_line_number, filename))
+        return items
+
+    @property
+    def _mapping(self):
+        """Returns the mapping items, parsing them if needed.
+
+           Returns
+           -------
+           OrderedDict
+               the mapping items
+        """
+        if self._items is None:
+            self._items = self._load()
+            self._source = None
+        return self._items
+
+    def __getitem__(self, key):
+        return self._mapping[key]
+
+    def __setitem__(self, key, value):
+        self._mapping[key] = value
+
+    def __delitem__(self, key):
+        del self._mapping[key]
+
+    def __contains__(self, key):
+        return key in self._mapping
+
+    def __iter__(self):
+        return iter(self._mapping)
+
+    def __len__(self):
+        return len(self._mapping)
+
+    def copy(self):
+        """Returns a shallow copy of the mapping.
+
+           Returns
+           -------
+           OrderedDict
+               the copy
+        """
+        return self._mapping.copy()
+
+    def __repr__(self):
+        if self._items is None:
+            return "{}(<not loaded>)".format(self.__class__.__name__)
+        return "{}({!r})".format(self.__class__.__name__, list(self._items.items()))
+
+
 _FrameInfo = collections.namedtuple("_FrameInfo", ("indentation", "mapping"))
 
 
@@ -131,11 +335,48 @@ class ZirkonSerializer(TextSerializer):
         # interspersed keys and mappings
         yield from mapping.items()
 
-    def impl_from_string(self, dct_class, serialization, *, filename=None):
+    def lazy_from_string(self, serialization, *, filename=None):
+        """Loads a LazyMapping from string 'serialization'.
+
+           Parameters
+           ----------
+           serialization: str
+               the serialization
+           filename: str, optional
+               the file name (only for error traceback)
+
+           Returns
+           -------
+           LazyMapping
+               the lazy mapping
+        """
+        if filename is None:
+            filename = '<string>'
+        data = serialization.encode('utf-8')
+        return LazyMapping(self, data, 0, len(data), filename=filename)
+
+    def lazy_from_file(self, filename):
+        """Loads a LazyMapping from file 'filename' (utf-8 encoded). The file
+           is memory-mapped, and the map is kept open by the LazyMapping.
+
+           Parameters
+           ----------
+           file: str
+               the file name
+
+           Returns
+           -------
+           LazyMapping
+               the lazy mapping
+        """
+        data = self.map_file(filename)
+        return LazyMapping(self, data, 0, len(data), filename=filename)
+
+    def impl_from_lines(self, dct_class, lines, *, filename=None):
         dct = dct_class()
         stack = _Stack()
         current_indentation, current_mapping, current_level = stack.push(dct)
-        for line_number, source_line in enumerate(serialization.split('\n')):
+        for line_number, source_line in enumerate(lines):
             indentation, line = self.RE_INDENTATION_LINE.match(source_line).groups()
             if not line or line[0] == '#':
                 # empty line or comment
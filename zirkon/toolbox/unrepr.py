@@ -18,6 +18,13 @@
 """\
 Implementation of the 'unrepr' function, which does unrepr of
 python builtin types (int, str, float, bool, list, tuple).
+
+Simple literals (decimal ints, floats, bools, None, quoted strings without
+escapes, and flat lists/tuples of them) are parsed by a regular expression
+scanner; all other expressions are parsed with the 'ast' module.
+
+The UnreprCache class is a bounded LRU cache of unrepr results; the
+UNREPR_CACHE instance is used by the text serializers.
 """
 
 __author__ = "Simone Campagna"
@@ -25,9 +32,105 @@ __copyright__ = 'Copyright (c) 2015 Simone Campagna'
 __license__ = 'Apache License Version 2.0'
 __all__ = [
     'unrepr',
+    'UnreprCache',
+    'UNREPR_CACHE',
 ]
 
 import ast
+import collections
+import copy
+import re
+import threading
+
+_LITERAL_SCALAR = r"""
+    (?:
+        (?P<float>[-+]?(?:(?:\d+\.\d*|\.\d+)(?:[eE][-+]?\d+)?|\d+[eE][-+]?\d+))
+      | (?P<int>[-+]?(?:0+|[1-9]\d*))
+      | (?P<str>'[^'\\\r\n]*'|"[^"\\\r\n]*")
+      | (?P<const>True|False|None)
+    )
+"""
+
+_LITERAL_SCALAR_RE = re.compile(_LITERAL_SCALAR + r"[ \t]*\Z", re.VERBOSE)
+_LITERAL_ITEM_RE = re.compile(r"[ \t]*" + _LITERAL_SCALAR + r"[ \t]*(?:(?P<comma>,)|\Z)", re.VERBOSE)
+_LITERAL_CONTAINERS = {
+    ('[', ']'): list,
+    ('(', ')'): tuple,
+}
+_LITERAL_CONSTANTS = {
+    'True': True,
+    'False': False,
+    'None': None,
+}
+
+
+def _literal_value(match):
+    """Returns the value of a scalar literal match.
+
+       Parameters
+       ----------
+       match: re.Match
+           the match object
+
+       Returns
+       -------
+       |any|
+           the literal value
+    """
+    for kind in 'int', 'float', 'str', 'const':
+        text = match.group(kind)
+        if text is not None:
+            break
+    if kind == 'int':
+        return int(text)
+    elif kind == 'float':
+        return float(text)
+    elif kind == 'str':
+        return text[1:-1]
+    else:
+        return _LITERAL_CONSTANTS[text]
+
+
+def _unrepr_literal(string):
+    """Parses simple literals without compiling the string.
+
+       Parameters
+       ----------
+       string: str
+           the string to be parsed
+
+       Returns
+       -------
+       tuple
+           a 2-tuple (found, value); found is False if the string is not
+           a simple literal
+    """
+    match = _LITERAL_SCALAR_RE.match(string)
+    if match is not None:
+        return True, _literal_value(match)
+    stripped = string.rstrip(' \t')
+    container_class = _LITERAL_CONTAINERS.get((stripped[:1], stripped[-1:]), None)
+    if container_class is None or len(stripped) < 2:
+        return False, None
+    body = stripped[1:-1]
+    items = []
+    comma = False
+    pos = 0
+    end = len(body)
+    if body.strip(' \t'):
+        while pos < end:
+            match = _LITERAL_ITEM_RE.match(body, pos)
+            if match is None:
+                return False, None
+            items.append(_literal_value(match))
+            comma = match.group('comma') is not None
+            pos = match.end()
+            if comma and not body[pos:].strip(' \t'):
+                break
+    if container_class is tuple and len(items) == 1 and not comma:
+        # '(1)' is not a tuple
+        return False, None
+    return True, container_class(items)
 
 
 def unrepr(string, globals_d=None):
@@ -59,6 +162,9 @@ def unrepr(string, globals_d=None):
        |any|
            the expression's value
     """
+    found, value = _unrepr_literal(string)
+    if found:
+        return value
 
     def py_ast_str(ast_body):
         """Parses ast.Str objects"""
@@ -226,3 +332,159 @@ def unrepr(string, globals_d=None):
 
     expr = compile(string, "<string>", "eval", ast.PyCF_ONLY_AST)
     return py_ast_unrepr(expr.body)
+
+
+_IMMUTABLE_TYPES = (int, float, complex, bool, str, bytes, type(None))
+_CONTAINER_TYPES = (list, tuple, dict, set, frozenset)
+
+_CacheEntry = collections.namedtuple('_CacheEntry', ('globals_d', 'value', 'copy'))
+
+
+def _is_immutable(value):
+    """Returns True if value is immutable (a scalar, or a tuple/frozenset of
+       immutable values).
+
+       Parameters
+       ----------
+       value: |any|
+           the value
+
+       Returns
+       -------
+       bool
+           True if value is immutable
+    """
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES:
+        return True
+    elif value_type in (tuple, frozenset):
+        return all(_is_immutable(item) for item in value)
+    return False
+
+
+class UnreprCache(object):
+    """Bounded LRU cache for 'unrepr' results, keyed on the string and
+       on the identity of the globals dictionary (so callers should reuse
+       the same globals dictionary). It is thread-safe.
+
+       * immutable results (scalars, tuples of scalars) are shared;
+       * containers (lists, dicts, sets...) are deep-copied on return;
+       * other objects are shared only if 'share_objects' is True (for
+         instance validators, which are never changed after construction);
+         otherwise they are not cached.
+
+       Errors are never cached.
+
+       >>> cache = UnreprCache(maxsize=2)
+       >>> cache.unrepr("[1, 2]")
+       [1, 2]
+       >>> cache.unrepr("[1, 2]")
+       [1, 2]
+       >>> cache.hits, cache.misses
+       (1, 1)
+       >>>
+
+       Parameters
+       ----------
+       maxsize: int, optional
+           the maximum number of cached entries (defaults to 4096)
+    """
+
+    def __init__(self, maxsize=4096):
+        self._maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        """Returns the maximum number of cached entries.
+
+           Returns
+           -------
+           int
+               the maximum size
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        """Sets the maximum number of cached entries.
+
+           Parameters
+           ----------
+           value: int
+               the maximum size
+        """
+        with self._lock:
+            self._maxsize = value
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Drops all the entries and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def unrepr(self, string, globals_d=None, *, share_objects=False):
+        """Returns unrepr(string, globals_d), using the cache.
+
+           Parameters
+           ----------
+           string: str
+               the string to be parsed
+           globals_d: dict, optional
+               the globals dictionary for name lookup
+           share_objects: bool, optional
+               if True, non-container results are shared (defaults to False)
+
+           Raises
+           ------
+           SyntaxError
+               invalid expression
+
+           Returns
+           -------
+           |any|
+               the expression's value
+        """
+        key = (string, id(globals_d))
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None and entry.globals_d is globals_d:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+        if entry is not None:
+            if entry.copy:
+                return copy.deepcopy(entry.value)
+            return entry.value
+
+        value = unrepr(string, globals_d)
+        if _is_immutable(value):
+            entry = _CacheEntry(globals_d=globals_d, value=value, copy=False)
+        elif isinstance(value, _CONTAINER_TYPES):
+            entry = _CacheEntry(globals_d=globals_d, value=copy.deepcopy(value), copy=True)
+        elif share_objects:
+            entry = _CacheEntry(globals_d=globals_d, value=value, copy=False)
+        else:
+            return value
+        if self._maxsize > 0:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+
+UNREPR_CACHE = UnreprCache()
@@ -35,6 +35,7 @@ import collections
 from .config import Config
 from .config_section import ConfigSection
 from .schema_section import SchemaSection
+from .toolbox.macro import Macro
 
 
 def _get_validator_default(validator):
@@ -101,22 +102,47 @@ def create_template_from_schema(schema, *, config=None):
     return config
 
 
-def replace_macros(config):
-    """Replaces all macros with their current value.
+def _collect_macro_values(config, replacements):
+    """Evaluates all the macro options in config and in its defaults, and
+       appends (section, key, value) items to 'replacements'.
+
        Parameters
        ----------
-       config: |Config|, optional
+       config: |Config|
            the config object
+       replacements: list
+           the list of replacements
     """
     for key, value in config.items():
         if isinstance(value, collections.Mapping):
-            replace_macros(value)
-        else:
-            value = config[key]
-            config[key] = value
+            _collect_macro_values(value, replacements)
+        elif isinstance(value, Macro):
+            replacements.append((config, key, config[key]))
     if isinstance(config, ConfigSection) and config.defaults is not None:
         with config.defaults.referencing(config):
-            replace_macros(config.defaults)
+            _collect_macro_values(config.defaults, replacements)
+
+
+def replace_macros(config):
+    """Replaces all macros with their current value.
+       All the macro values are computed before replacing them; each macro
+       is evaluated only once, after the macros it depends on.
+
+       Parameters
+       ----------
+       config: |Config|, optional
+           the config object
+
+       Raises
+       ------
+       MacroCycleError
+           cyclic macro references
+    """
+    replacements = []
+    with config.caching_macros():
+        _collect_macro_values(config, replacements)
+    for section, key, value in replacements:
+        section[key] = value
 
 
 def _get_key_tuple(key):
@@ -75,7 +75,7 @@ from .complain import Complain
 from .ignore import Ignore
 from .remove import Remove
 
-from ..toolbox.unrepr import unrepr
+from ..toolbox.unrepr import unrepr, UNREPR_CACHE
 from ..toolbox.subclass import find_subclass
 
 from .error import \
@@ -101,6 +101,8 @@ def _setup_codecs():
     """
     _text_serializer_module = getattr(serializer, 'text_serializer', None)
     if _text_serializer_module is not None:
+        validator_globals = {}
+
         def _validator_text_encode(validator):
             """Encodes validator for configobj/zirkon serializers.
 
@@ -118,7 +120,9 @@ def _setup_codecs():
 
         def _validator_text_decode(type_name, repr_data):  # pylint: disable=unused-argument
             """Decodes validator from configobj/zirkon serializers.
-               configobj/zirkon decoder for Validator instances
+               configobj/zirkon decoder for Validator instances.
+               Validators are never changed after construction, so equal
+               representations are decoded to the same (shared) validator.
 
                Parameters
                ----------
@@ -132,11 +136,15 @@ def _setup_codecs():
                Validator
                    the validator
             """
-            globals_d = {}
-            globals_d['ROOT'] = ROOT
-            globals_d['SECTION'] = SECTION
-            globals_d[type_name] = Validator.class_dict()[type_name]
-            return unrepr(repr_data, globals_d)
+            validator_class = Validator.class_dict()[type_name]
+            globals_d = validator_globals.get(type_name, None)
+            if globals_d is None or globals_d[type_name] is not validator_class:
+                globals_d = {}
+                globals_d['ROOT'] = ROOT
+                globals_d['SECTION'] = SECTION
+                globals_d[type_name] = validator_class
+                validator_globals[type_name] = globals_d
+            return UNREPR_CACHE.unrepr(repr_data, globals_d, share_objects=True)
 
         _text_serializer_module.TextSerializer.codec_catalog().add_codec(
             class_type=Validator,
@@ -196,89 +204,102 @@ def _setup_codecs():
             decode=_ov_error_text_decode,
         )
 
+    def _validator_json_encode(validator):
+        """Encodes validators for json/zbin serializers.
+
+           Parameters
+           ----------
+           validator: Validator
+               the validator to be encoded
+
+           Returns
+           -------
+           str
+               the validators's representation
+        """
+        return validator.actual_arguments.copy()
+
+    def _validator_json_decode(validator_name, arguments):
+        """Decodes OptionValidationError from configobj/zirkon serializers.
+
+           Parameters
+           ----------
+           validator_name: str
+               the validator's name
+           arguments: str
+               the validator's arguments
+
+           Returns
+           -------
+           Validator
+               the error
+        """
+        validator_class = Validator.get_class(validator_name)
+        return validator_class(**arguments)
+
+    def _ov_error_json_encode(option_validation_error):
+        """Encodes OptionValidationErrors for json/zbin serializers.
+
+           Parameters
+           ----------
+           option_validation_error: OptionValidationError
+               the error to be encoded
+
+           Returns
+           -------
+           str
+               the errors's representation
+        """
+        return {'exception_args': option_validation_error.args}
+
+    def _ov_error_json_decode(type_name, args):
+        """Decodes OptionValidationError from configobj/zirkon serializers.
+
+           Parameters
+           ----------
+           type_name: str
+               the type name
+           args: tuple
+               the errors's args
+
+           Raises
+           ------
+           NameError
+               class not found
+
+           Returns
+           -------
+           OptionValidationError
+               the error
+        """
+        ov_error_subclass = find_subclass(OptionValidationError, type_name)
+        if ov_error_subclass is None:  # pragma: no cover
+            raise NameError("undefined OptionValidationError subclass {}".format(type_name))
+        return ov_error_subclass(*args['exception_args'])
+
     _json_serializer_module = getattr(serializer, 'json_serializer', None)
     if _json_serializer_module is not None:
-        def _validator_json_encode(validator):
-            """Encodes validators for json serializer.
-
-               Parameters
-               ----------
-               validator: Validator
-                   the validator to be encoded
-
-               Returns
-               -------
-               str
-                   the validators's representation
-            """
-            return validator.actual_arguments.copy()
-
-        def _validator_json_decode(validator_name, arguments):
-            """Decodes OptionValidationError from configobj/zirkon serializers.
-
-               Parameters
-               ----------
-               validator_name: str
-                   the validator's name
-               arguments: str
-                   the validator's arguments
-
-               Returns
-               -------
-               Validator
-                   the error
-            """
-            validator_class = Validator.get_class(validator_name)
-            return validator_class(**arguments)
-
         _json_serializer_module.JSONSerializer.codec_catalog().add_codec(
             class_type=Validator,
             encode=_validator_json_encode,
             decode=_validator_json_decode,
         )
 
-        def _ov_error_json_encode(option_validation_error):
-            """Encodes OptionValidationErrors for json serializer.
-
-               Parameters
-               ----------
-               option_validation_error: OptionValidationError
-                   the error to be encoded
-
-               Returns
-               -------
-               str
-                   the errors's representation
-            """
-            return {'exception_args': option_validation_error.args}
-
-        def _ov_error_json_decode(type_name, args):
-            """Decodes OptionValidationError from configobj/zirkon serializers.
-
-               Parameters
-               ----------
-               type_name: str
-                   the type name
-               args: tuple
-                   the errors's args
-
-               Raises
-               ------
-               NameError
-                   class not found
-
+        _json_serializer_module.JSONSerializer.codec_catalog().add_codec(
+            class_type=OptionValidationError,
+            encode=_ov_error_json_encode,
+            decode=_ov_error_json_decode,
+        )
 
-               Returns
-               -------
-               OptionValidationError
-                   the error
-            """
-            ov_error_subclass = find_subclass(OptionValidationError, type_name)
-            if ov_error_subclass is None:  # pragma: no cover
-                raise NameError("undefined OptionValidationError subclass {}".format(type_name))
-            return ov_error_subclass(*args['exception_args'])
+    _zbin_serializer_module = getattr(serializer, 'zbin_serializer', None)
+    if _zbin_serializer_module is not None:
+        _zbin_serializer_module.ZBinSerializer.codec_catalog().add_codec(
+            class_type=Validator,
+            encode=_validator_json_encode,
+            decode=_validator_json_decode,
+        )
 
-        _json_serializer_module.JSONSerializer.codec_catalog().add_codec(
+        _zbin_serializer_module.ZBinSerializer.codec_catalog().add_codec(
             class_type=OptionValidationError,
             encode=_ov_error_json_encode,
             decode=_ov_error_json_decode,
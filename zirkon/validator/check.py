@@ -27,8 +27,11 @@ __all__ = [
 ]
 
 import abc
+import itertools
 
 from ..toolbox.macro import Macro
+from .error import OptionValidationError
+from .option import Option
 
 
 class Check(metaclass=abc.ABCMeta):
@@ -58,6 +61,46 @@ class Check(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    def scan_items(self, values, limit, section):
+        """Checks the items of a sequence option, in order, and stops at the
+           first item which does not pass the check. It is the bulk version of
+           'check(...)' used by sequence validators: errors are not built
+           here, since the item validator is run again on the failing item.
+           Subclasses can override it with a faster implementation.
+
+           Parameters
+           ----------
+           values: list|tuple
+               the item values
+           limit: int
+               the number of leading items to be checked
+           section: |Section|
+               the containing section
+
+           Returns
+           -------
+           tuple
+               a 2-tuple (values, count): the item values (a new list if some
+               items have been changed by the check), and the number of leading
+               items passing the check
+        """
+        new_values = None
+        for index, value in enumerate(itertools.islice(values, limit)):
+            option = Option(name=None, value=value, defined=True)
+            try:
+                self.check(option, section)
+            except OptionValidationError:
+                limit = index
+                break
+            if option.value is not value:
+                if new_values is None:
+                    new_values = list(values)
+                new_values[index] = option.value
+        if new_values is None:
+            return values, limit
+        else:
+            return new_values, limit
+
     def has_actual_value(self, value):  # pylint: disable=no-self-use
         """Returns True if value is not a Macro instance.
 
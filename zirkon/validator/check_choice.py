@@ -31,6 +31,14 @@ from .option import Option
 from .error import InvalidChoiceError
 
 
+class _Choices(list):
+    """List of choices; it is rendered in error messages as the comma-separated
+       list of the choice representations.
+    """
+    def __str__(self):
+        return ', '.join(repr(choice) for choice in self)
+
+
 class CheckChoice(CheckType):
     """Check if option.value is in 'choices'.
 
@@ -49,8 +57,15 @@ class CheckChoice(CheckType):
             if option.value not in choices:
                 raise InvalidChoiceError.build(
                     option,
-                    "{!r} is not a valid choice; valid choices are: ({})".format(
-                        option.value, ', '.join(repr(v) for v in choices)))
+                    "{value!r} is not a valid choice; valid choices are: ({choices})",
+                    check=self, value=option.value, choices=_Choices(choices))
+
+    def scan_items(self, values, limit, section):
+        choices = [self.get_value(choice, section) for choice in self.choices]
+        for index in range(limit):
+            if values[index] not in choices:
+                return values, index
+        return values, limit
 
     def self_validate(self, validator):
         for choice in self.choices:
@@ -35,4 +35,4 @@ class CheckComplain(Check):
     """
 
     def check(self, option, section):
-        raise UnexpectedOptionError.build(option, "unexpected option")
+        raise UnexpectedOptionError.build(option, "unexpected option", check=self)
@@ -72,7 +72,16 @@ class CheckMin(CheckRange):
             if value < min_value:
                 raise MinValueError.build(
                     option,
-                    "value is lower than min {!r}".format(min_value))
+                    "value is lower than min {min!r}",
+                    check=self, min=min_value)
+
+    def scan_items(self, values, limit, section):
+        min_value = self.get_value(self.min, section)
+        if min_value is not None:
+            for index in range(limit):
+                if values[index] < min_value:
+                    return values, index
+        return values, limit
 
 
 class CheckMax(CheckRange):
@@ -101,7 +110,16 @@ class CheckMax(CheckRange):
             if value > max_value:
                 raise MaxValueError.build(
                     option,
-                    "value is greater than max {!r}".format(max_value))
+                    "value is greater than max {max!r}",
+                    check=self, max=max_value)
+
+    def scan_items(self, values, limit, section):
+        max_value = self.get_value(self.max, section)
+        if max_value is not None:
+            for index in range(limit):
+                if values[index] > max_value:
+                    return values, index
+        return values, limit
 
 
 class CheckMinLen(Check):
@@ -129,9 +147,16 @@ class CheckMinLen(Check):
             if len(value) < min_len_value:
                 raise MinLengthError.build(
                     option,
-                    "length {} is lower than min_len {!r}".format(
-                        len(value),
-                        min_len_value))
+                    "length {length} is lower than min_len {min_len!r}",
+                    check=self, length=len(value), min_len=min_len_value)
+
+    def scan_items(self, values, limit, section):
+        min_len_value = self.get_value(self.min_len, section)
+        if min_len_value is not None:
+            for index in range(limit):
+                if len(values[index]) < min_len_value:
+                    return values, index
+        return values, limit
 
 
 class CheckMaxLen(Check):
@@ -159,6 +184,13 @@ class CheckMaxLen(Check):
             if len(value) > max_len_value:
                 raise MaxLengthError.build(
                     option,
-                    "length {} is greater than max_len {!r}".format(
-                        len(value),
-                        max_len_value))
+                    "length {length} is greater than max_len {max_len!r}",
+                    check=self, length=len(value), max_len=max_len_value)
+
+    def scan_items(self, values, limit, section):
+        max_len_value = self.get_value(self.max_len, section)
+        if max_len_value is not None:
+            for index in range(limit):
+                if len(values[index]) > max_len_value:
+                    return values, index
+        return values, limit
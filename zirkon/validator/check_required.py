@@ -36,4 +36,8 @@ class CheckRequired(Check):
 
     def check(self, option, section):
         if not option.defined:
-            raise MissingRequiredOptionError.build(option, "required value is missing")
+            raise MissingRequiredOptionError.build(option, "required value is missing", check=self)
+
+    def scan_items(self, values, limit, section):
+        # items are always defined:
+        return values, limit
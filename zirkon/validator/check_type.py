@@ -43,7 +43,29 @@ class CheckType(Check):
             if self.SECONDARY_TYPES and isinstance(value, self.SECONDARY_TYPES):
                 option.value = self.TYPE(value)
             else:
-                raise InvalidTypeError.build(option, "invalid type {} - expected type is {}".format(
-                    type(value).__name__,
-                    self.TYPE.__name__,
-                ))
+                raise InvalidTypeError.build(
+                    option,
+                    "invalid type {value_type.__name__} - expected type is {expected_type.__name__}",
+                    check=self, value_type=type(value), expected_type=self.TYPE)
+
+    def scan_items(self, values, limit, section):
+        item_type = self.TYPE
+        if limit == len(values) and all(issubclass(value_type, item_type) for value_type in set(map(type, values))):
+            # fast path: no conversion needed
+            return values, limit
+        secondary_types = self.SECONDARY_TYPES
+        new_values = None
+        for index in range(limit):
+            value = values[index]
+            if not isinstance(value, item_type):
+                if secondary_types and isinstance(value, secondary_types):
+                    if new_values is None:
+                        new_values = list(values)
+                    new_values[index] = item_type(value)
+                else:
+                    limit = index
+                    break
+        if new_values is None:
+            return values, limit
+        else:
+            return new_values, limit
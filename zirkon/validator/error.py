@@ -40,25 +40,89 @@ __all__ = [
 
 
 class OptionValidationError(Exception):
-    """OptionValidationError"""
+    """OptionValidationError. Errors created by 'build(...)' keep the offending
+       option, the check and the message parameters, and the message is rendered
+       only when it is needed (for instance by str() or repr()): errors which are
+       discarded or only counted do not pay for the representation of large
+       option values.
+
+       Attributes
+       ----------
+       option: Option
+           the offending option (None if not available)
+       check: Check
+           the failed check (None if not available)
+       parameters: dict
+           the message parameters
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.option = None
+        self.check = None
+        self.parameters = {}
+        self._message_format = None
 
     @classmethod
-    def build(cls, option, message):
-        """Builds an exception based on the option value.
+    def build(cls, option, message, *, check=None, **parameters):
+        r"""Builds an exception based on the option value.
 
            Parameters
            ----------
            option: Option
                the offending option
            message: str
-               the error message
+               the error message; if some parameters are passed, it is a
+               format string for them
+           check: Check, optional
+               the failed check
+           \*\*parameters
+               the message parameters
 
            Returns
            -------
            cls
                the exception
         """
-        return cls("{}: {}".format(option, message))
+        error = cls()
+        error.option = option.copy()
+        error.check = check
+        error.parameters = parameters
+        error._message_format = message  # pylint: disable=protected-access
+        return error
+
+    def _render(self):
+        """Renders the message (only once)."""
+        message = self._message_format
+        if message is not None:
+            self._message_format = None
+            if self.parameters:
+                message = message.format(**self.parameters)
+            Exception.args.__set__(self, ("{}: {}".format(self.option, message),))
+
+    @property
+    def args(self):
+        """The exception arguments (the rendered message)"""
+        self._render()
+        return Exception.args.__get__(self)
+
+    @args.setter
+    def args(self, value):
+        """Sets the exception arguments"""
+        self._message_format = None
+        Exception.args.__set__(self, value)
+
+    def __str__(self):
+        self._render()
+        return super().__str__()
+
+    def __repr__(self):
+        self._render()
+        return super().__repr__()
+
+    def __reduce__(self):
+        self._render()
+        return super().__reduce__()
 
 
 class InvalidContentError(OptionValidationError):
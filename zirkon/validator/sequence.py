@@ -31,7 +31,13 @@ from .validator import Validator
 
 
 class Sequence(Validator):
-    """Base class for sequence (list, tuple) validators."""
+    """Base class for sequence (list, tuple) validators.
+
+       Items are validated in bulk: each check of the item validator scans
+       all the items at once (see 'Check.scan_items'), and no per-item
+       Option is created. Only if an item is not valid, the item validator
+       is run on it to raise the error.
+    """
     ITEM_VALIDATOR_CLASS = type(None)
 
     def bind_arguments(self, argument_store, prefix=''):
@@ -47,16 +53,61 @@ class Sequence(Validator):
     def validate_option(self, option, section=None):
         super().validate_option(option, section)
         if option.defined and option.value:
-            validated_item_values = []
-            changed = False
-            for item_idx, item_value in enumerate(option.value):
-                item_name = "{}[{}]".format(option.name, item_idx)
-                item_option = Option(name=item_name, value=item_value, defined=True)
-                validated_item_value = self.item_validator.validate_option(item_option)
-                validated_item_values.append(validated_item_value)
-                if item_value is not validated_item_value:
-                    changed = True
-            if changed:
-                sequence_type = type(option.value)
-                option.value = sequence_type(validated_item_values)
+            if type(self.item_validator).validate_option is Validator.validate_option:
+                self._scan_items(option)
+            else:
+                self._validate_items(option)
         return option.value
+
+    def _scan_items(self, option):
+        """Validates the option items with the bulk checks.
+
+           Parameters
+           ----------
+           option: |Option|
+               the sequence option
+
+           Raises
+           ------
+           |OptionValidationError|
+               item validation error
+        """
+        values = option.value
+        count = len(values)
+        for check in self.item_validator.checks:
+            values, count = check.scan_items(values, count, None)
+        if count < len(values):
+            item_name = "{}[{}]".format(option.name, count)
+            item_option = Option(name=item_name, value=option.value[count], defined=True)
+            self.item_validator.validate_option(item_option)
+            # not reached for consistent checks:
+            self._validate_items(option)
+        elif values is not option.value:
+            sequence_type = type(option.value)
+            option.value = sequence_type(values)
+
+    def _validate_items(self, option):
+        """Validates the option items one by one with the item validator.
+
+           Parameters
+           ----------
+           option: |Option|
+               the sequence option
+
+           Raises
+           ------
+           |OptionValidationError|
+               item validation error
+        """
+        validated_item_values = []
+        changed = False
+        for item_idx, item_value in enumerate(option.value):
+            item_name = "{}[{}]".format(option.name, item_idx)
+            item_option = Option(name=item_name, value=item_value, defined=True)
+            validated_item_value = self.item_validator.validate_option(item_option)
+            validated_item_values.append(validated_item_value)
+            if item_value is not validated_item_value:
+                changed = True
+        if changed:
+            sequence_type = type(option.value)
+            option.value = sequence_type(validated_item_values)